@@ -1,6 +1,8 @@
+import logging
 import os
 
 from celery import Celery
+from celery.signals import worker_process_init
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
 
@@ -10,3 +12,23 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 # 🔥 C'EST ÇA QUI MANQUE
 app.autodiscover_tasks()
 # app.conf.worker_hijack_root_logger = False
+
+
+@worker_process_init.connect
+def warm_pdf_converters(**kwargs):
+    """
+    Process enfant démarré : convertisseur Docling chargé tout de suite
+    (PDF_CONVERTER_WARMUP) plutôt qu'au premier PDF traité.
+    """
+    from django.conf import settings
+
+    if not getattr(settings, "PDF_CONVERTER_WARMUP", False):
+        return
+
+    try:
+        from processing.application.parsers.pdf.converter_pool import converter_pool
+
+        converter_pool().warm()
+    except Exception:
+        # un échec ici ne doit pas empêcher le worker de démarrer
+        logging.getLogger("celery").exception("Préchargement Docling impossible")
@@ -215,7 +215,7 @@ CELERY_BEAT_SCHEDULE = {
     },
     "reindex-svu-indicators-every-15-min": {
         "task": "processing.tasks.indexing.reindex_indicators_task",
-        "schedule": crontab(minute="*/1"),
+        "schedule": crontab(minute="*/15"),
     },
 }
 
@@ -414,3 +414,59 @@ else:
 
 DATA_UPLOAD_MAX_MEMORY_SIZE = 104857600  # 100MB
 FILE_UPLOAD_MAX_MEMORY_SIZE = 104857600  # 100MB
+
+# Parsing Excel : nombre de process pour analyser les feuilles en parallèle
+# (0 ou 1 = séquentiel)
+EXCEL_PARSER_WORKERS = config("EXCEL_PARSER_WORKERS", cast=int, default=0)
+
+# Parsing Excel en flux : mémoire bornée par une feuille brute, types de
+# colonnes inférés sur les 1000 premières lignes de chaque table (sinon
+# sur toute la table, matérialisée)
+EXCEL_PARSER_STREAMING = config("EXCEL_PARSER_STREAMING", default=False, cast=bool)
+
+# Moteur de lecture Excel : "openpyxl", "calamine" (python-calamine) ou
+# "auto" (calamine pour les .xls et les gros fichiers s'il est installé)
+EXCEL_READER_ENGINE = config("EXCEL_READER_ENGINE", default="auto")
+
+# Hash d'identité des faits : "sha256" (ids historiques, déduplication)
+# ou "xxh3_128" (rapide, non cryptographique ; change tous les ids)
+FACT_ID_HASH = config("FACT_ID_HASH", default="sha256")
+
+# Rapport par étage du parsing (temps, lignes, tables écartées, pic
+# mémoire), journalisé et rattaché à l'extraction ; False = aucun coût
+PARSER_METRICS = config("PARSER_METRICS", default=True, cast=bool)
+
+# Feuilles géantes : au-delà de ce nombre de cellules déclarées (lignes ×
+# colonnes, introspection), matrice brute déversée sur disque (memmap)
+# au lieu d'être gardée en mémoire ; 0 = désactivé. Répertoire : EXCEL_SPILL_DIR
+# (vide = répertoire temporaire du système).
+EXCEL_SPILL_MIN_CELLS = config("EXCEL_SPILL_MIN_CELLS", default=20_000_000, cast=int)
+EXCEL_SPILL_DIR = config("EXCEL_SPILL_DIR", default="") or None
+
+# Convertisseurs Docling (PDF) gardés chauds par process worker : chargés
+# au démarrage de chaque enfant Celery si PDF_CONVERTER_WARMUP, libérés
+# quand le RSS du process dépasse PDF_CONVERTER_MAX_RSS_MB (0 = jamais)
+PDF_CONVERTER_WARMUP = config("PDF_CONVERTER_WARMUP", default=False, cast=bool)
+PDF_CONVERTER_MAX_RSS_MB = config("PDF_CONVERTER_MAX_RSS_MB", cast=int, default=6_144)
+
+# Parser PDF : plages de PDF_PAGES_PER_RANGE pages converties en parallèle
+# si PDF_PARSER_WORKERS > 1 ; pré-scan de la couche texte (OCR et structure
+# des tables limités aux pages qui en ont besoin). Coût mémoire du pré-scan :
+# jusqu'à 3 convertisseurs par process (OCR + tables, tables seules, ni
+# l'un ni l'autre), chacun avec ses modèles, bornés par
+# PDF_CONVERTER_MAX_RSS_MB ; False = un seul convertisseur (tout activé)
+PDF_PARSER_WORKERS = config("PDF_PARSER_WORKERS", cast=int, default=0)
+PDF_PAGES_PER_RANGE = config("PDF_PAGES_PER_RANGE", cast=int, default=20)
+PDF_TEXT_LAYER_PRESCAN = config("PDF_TEXT_LAYER_PRESCAN", default=True, cast=bool)
+
+# Aperçu de structure (POST indicateurs-olf/preview/) : lignes de tête lues
+# par feuille (défaut, plafond accepté) et budget de latence en secondes
+PREVIEW_HEAD_ROWS = config("PREVIEW_HEAD_ROWS", cast=int, default=200)
+PREVIEW_MAX_ROWS = config("PREVIEW_MAX_ROWS", cast=int, default=2_000)
+PREVIEW_BUDGET_SECONDS = config("PREVIEW_BUDGET_SECONDS", cast=float, default=2.0)
+
+# Cache des artefacts de parsing (checksum, version du parser) :
+# "disk", "redis" ou vide (désactivé), éviction LRU au-delà de MAX_BYTES
+PARSE_CACHE_BACKEND = config("PARSE_CACHE_BACKEND", default="disk")
+PARSE_CACHE_DIR = config("PARSE_CACHE_DIR", default=str(BASE_DIR / "cache" / "parse"))
+PARSE_CACHE_MAX_BYTES = config("PARSE_CACHE_MAX_BYTES", cast=int, default=2 * 1024**3)
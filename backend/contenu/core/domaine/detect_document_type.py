@@ -11,7 +11,7 @@ def detect_document_type(filename: str) -> DocumentType:
         return DocumentType.EXCEL
     if ext == ".pdf":
         return DocumentType.PDF
-    if ext == ".csv":
+    if ext in [".csv", ".tsv"]:
         return DocumentType.CSV
     if ext in [".doc", ".docx"]:
         return DocumentType.WORD
@@ -61,13 +61,15 @@ class ExtractionPipeline:
             logger.info(f"⚙️ Extraction exécutée | id={extraction.id}")
 
             logger.info("⚙️ Lancement du service ETL")
-            self.etl_service.process(
+            metrics = self.etl_service.process(
                 document_id=str(document.id),
                 document_url=document.storage_uri,
                 filename=document.filename,
+                checksum=document.checksum,
             )
 
             # ---------- COMPLETE ----------
+            extraction.attach_metrics(metrics)
             extraction.complete()
             self.repository.save(extraction)
             logger.info(f"✅ Extraction complétée | id={extraction.id}")
@@ -1,48 +1,183 @@
-from langchain_openai import OpenAIEmbeddings
+import hashlib
+import json
+import logging
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
 from langchain_qdrant import QdrantVectorStore
 from processing.application.indexing.embeder_model import load_embedding_model
-from processing.application.indexing.load_svu import load_svu
 from processing.application.indexing.splitt_svu import split_svu_to_documents
-from processing.application.indexing.vectore_store import (
-    build_collection_name,
-    create_vector_store_from_factchunks,
-)
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams
+from qdrant_client.models import Distance, PointIdsList, VectorParams
+
+logger = logging.getLogger("etl.service")
 
 QDRANT_COLLECTION = "mapping_indicateurs_categories"
+SVU_PATH = "./processing/application/indexing/svu.json"
 
+# Espace des ids de points : uuid5(indicator_id), stable d'un run à l'autre
+SVU_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "svu/mapping_indicateurs_categories")
 
-def index_svu():
-    # 1. Charger la SVU
-    svu = load_svu("./processing/application/indexing/svu.json")
+# Dernière synchro du process : (empreinte de svu.json, indicateurs, instant)
+_synced: Optional[Tuple[str, int, float]] = None
+# Au-delà, la collection est re-comparée même si svu.json n'a pas changé
+# (points supprimés ou collection recréée par un autre process)
+SYNC_MEMO_SECONDS = 600
+
+
+def svu_point_id(indicator_id: str) -> str:
+    return str(uuid.uuid5(SVU_NAMESPACE, indicator_id))
 
-    # 2. Split métier
-    documents = split_svu_to_documents(svu)
 
-    # 3. Embeddings
-    embeddings = load_embedding_model()
-    # 4. Qdrant client
-    client = QdrantClient(host="qdrant", port=6333)
+def content_hash(text: str, model: str) -> str:
+    """
+    Empreinte du texte embarqué ET du modèle : un changement de modèle
+    ré-embarque tout.
+    """
+    return hashlib.sha256(f"{model}\n{text}".encode("utf-8")).hexdigest()
 
-    # 5. Création / overwrite de la collection
 
-    vector_size = len(embeddings.embed_query("sample text"))
+def forget_svu_sync() -> None:
+    """
+    Oublie la dernière synchro du process : la suivante re-compare la
+    collection.
+    """
+    global _synced
+    _synced = None
+
+
+def _memo_is_valid(client: QdrantClient, svu_hash: str) -> bool:
+    """
+    svu.json inchangé, synchro récente ET collection toujours complète
+    (un comptage, sans payload ni vecteurs).
+    """
+    if _synced is None:
+        return False
+
+    synced_hash, count, synced_at = _synced
+    if synced_hash != svu_hash or time.monotonic() - synced_at > SYNC_MEMO_SECONDS:
+        return False
 
     if not client.collection_exists(QDRANT_COLLECTION):
+        return False
+    return client.count(QDRANT_COLLECTION, exact=True).count == count
+
+
+def _existing_points(client: QdrantClient) -> Dict[str, Optional[str]]:
+    """
+    {id du point: empreinte stockée} de toute la collection (payload
+    réduit à l'empreinte, sans vecteurs).
+    """
+    points = {}
+    offset = None
+
+    while True:
+        batch, offset = client.scroll(
+            collection_name=QDRANT_COLLECTION,
+            with_payload=["metadata.content_hash"],
+            with_vectors=False,
+            limit=1_000,
+            offset=offset,
+        )
+        for point in batch:
+            metadata = (point.payload or {}).get("metadata") or {}
+            points[str(point.id)] = metadata.get("content_hash")
+
+        if offset is None:
+            return points
+
+
+def index_svu(
+    path: str = SVU_PATH,
+    force: bool = False,
+    client: Optional[QdrantClient] = None,
+    embeddings=None,
+) -> Dict[str, int]:
+    """
+    Synchronisation idempotente de la SVU dans Qdrant :
+    - svu.json inchangé depuis une synchro récente du process, collection
+      complète : rien (voir _memo_is_valid)
+    - sinon, seuls les indicateurs dont le texte (ou le modèle) a changé
+      sont ré-embarqués ; ids de points déterministes (uuid5), donc
+      upsert sans doublon
+    - points orphelins (indicateurs retirés, anciens ids aléatoires)
+      supprimés
+    """
+    global _synced
+
+    # 1. Charger la SVU (empreinte du fichier brut)
+    with open(path, "rb") as f:
+        raw = f.read()
+    svu_hash = hashlib.sha256(raw).hexdigest()
+
+    # Qdrant client (aucune connexion avant la première requête)
+    client = client or QdrantClient(host="qdrant", port=6333)
+
+    if not force and _memo_is_valid(client, svu_hash):
+        return {"indexed": 0, "deleted": 0, "unchanged": _synced[1]}
+
+    # 2. Split métier
+    documents = split_svu_to_documents(json.loads(raw))
+
+    # 3. Embeddings (client seulement : aucun appel tant que rien ne change)
+    embeddings = embeddings or load_embedding_model()
+    model = getattr(embeddings, "model", "")
+
+    ids: List[str] = []
+    for document in documents:
+        document.metadata["content_hash"] = content_hash(document.page_content, model)
+        ids.append(svu_point_id(document.metadata["indicator_id"]))
+
+    # 4. Collection
+    if client.collection_exists(QDRANT_COLLECTION):
+        existing = _existing_points(client)
+    else:
+        vector_size = len(embeddings.embed_query("sample text"))
         client.create_collection(
             collection_name=QDRANT_COLLECTION,
             vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
         )
-    vectorstore = QdrantVectorStore(
-        client=client,
-        collection_name=QDRANT_COLLECTION,
-        embedding=embeddings,
-    )
+        existing = {}
 
-    docs_ids = vectorstore.add_documents(documents=documents)
+    # 5. Différences
+    changed: List[Document] = []
+    changed_ids: List[str] = []
+    for point_id, document in zip(ids, documents, strict=True):
+        if force or existing.get(point_id) != document.metadata["content_hash"]:
+            changed.append(document)
+            changed_ids.append(point_id)
 
-    print(f"✅ {len(docs_ids)} indicateurs indexés dans Qdrant")
+    orphans = sorted(set(existing) - set(ids))
+
+    if changed:
+        vectorstore = QdrantVectorStore(
+            client=client,
+            collection_name=QDRANT_COLLECTION,
+            embedding=embeddings,
+            # pas d'embedding "dummy_text" de contrôle à chaque synchro
+            validate_collection_config=False,
+        )
+        vectorstore.add_documents(documents=changed, ids=changed_ids)
+
+    if orphans:
+        client.delete(
+            collection_name=QDRANT_COLLECTION,
+            points_selector=PointIdsList(points=orphans),
+        )
+
+    _synced = (svu_hash, len(documents), time.monotonic())
+    report = {
+        "indexed": len(changed),
+        "deleted": len(orphans),
+        "unchanged": len(documents) - len(changed),
+    }
+    logger.info(
+        f"✅ SVU synchronisée : {report['indexed']} indicateurs embarqués, "
+        f"{report['deleted']} supprimés, {report['unchanged']} inchangés"
+    )
+    return report
 
 
 if __name__ == "__main__":
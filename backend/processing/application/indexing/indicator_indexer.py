@@ -1,5 +1,10 @@
 import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set
 
+from django.utils import timezone
+from django_redis import get_redis_connection
 from langchain_openai import OpenAIEmbeddings
 from langchain_qdrant import QdrantVectorStore
 from processing.core.infrastructure.model_category_indicator import Indicator
@@ -8,10 +13,26 @@ from qdrant_client.models import (
     Distance,
     HnswConfigDiff,
     OptimizersConfigDiff,
+    PointIdsList,
     VectorParams,
 )
+from redis.exceptions import LockError
+
+logger = logging.getLogger("etl.service")
 
 QDRANT_COLLECTION = "svu_indicators_beat"
+EMBEDDING_MODEL = "text-embedding-3-large"
+
+# Dimensions connues : pas d'appel d'embedding pour les découvrir
+EMBEDDING_DIMENSIONS = {
+    "text-embedding-3-large": 3072,
+    "text-embedding-3-small": 1536,
+    "text-embedding-ada-002": 1536,
+}
+
+# Clés Redis : dernier updated_at synchronisé, verrou des runs
+WATERMARK_KEY = f"indexing:{QDRANT_COLLECTION}:watermark"
+LOCK_KEY = f"indexing:{QDRANT_COLLECTION}:lock"
 
 
 def indicator_point_id(indicator_id: str) -> int:
@@ -44,16 +65,40 @@ def build_indicator_document(indicator) -> str:
     return " | ".join(parts)
 
 
+def text_hash(text: str) -> str:
+    return hashlib.sha256(f"{EMBEDDING_MODEL}\n{text}".encode("utf-8")).hexdigest()
+
+
 class IndicatorIndexer:
-    def __init__(self):
-        self.embeddings = OpenAIEmbeddings(model="text-embedding-3-large")
+    """
+    Synchronisation incrémentale des indicateurs SVU dans Qdrant.
+
+    Chaque point garde l'empreinte de son texte et l'updated_at de
+    l'indicateur. Un run ne lit que les indicateurs modifiés depuis le
+    watermark (Redis) et ré-embarque ceux dont le texte a changé. Sans
+    watermark (premier run, Redis vidé) ou en mode complet : tous les
+    indicateurs.
+    Suppressions : à chaque run, points sans indicateur actif (ids seuls)
+    supprimés ; un update(is_active=False) en masse ou une suppression ne
+    touche pas updated_at et échapperait au delta.
+    Un verrou Redis empêche deux runs de se chevaucher.
+    """
 
-        self.vector_size = len(self.embeddings.embed_query("dimension_check"))
+    # Recouvrement du watermark : transactions validées après un run
+    # mais datées d'avant (doublons filtrés par l'empreinte du texte)
+    WATERMARK_OVERLAP = timedelta(minutes=5)
+    # Durée max d'un run (verrou libéré au-delà si le process meurt)
+    LOCK_TIMEOUT = 30 * 60
+    BATCH_SIZE = 256
 
-        self.client = QdrantClient(
+    def __init__(self, client=None, embeddings=None, redis=None):
+        self.embeddings = embeddings or OpenAIEmbeddings(model=EMBEDDING_MODEL)
+
+        self.client = client or QdrantClient(
             host="qdrant",
             port=6333,
         )
+        self.redis = redis or get_redis_connection("default")
 
         self.disable_indexing = False
 
@@ -61,7 +106,7 @@ class IndicatorIndexer:
             self.client.create_collection(
                 collection_name=QDRANT_COLLECTION,
                 vectors_config=VectorParams(
-                    size=self.vector_size,
+                    size=self._vector_size(),
                     distance=Distance.COSINE,
                     hnsw_config=HnswConfigDiff(m=0 if self.disable_indexing else 16),
                     on_disk=True,
@@ -76,17 +121,97 @@ class IndicatorIndexer:
             client=self.client,
             collection_name=QDRANT_COLLECTION,
             embedding=self.embeddings,
+            # pas d'embedding "dummy_text" de contrôle à chaque run
+            validate_collection_config=False,
         )
 
-    def index_all(self):
-        indicators = Indicator.objects.select_related("category").filter(is_active=True)
+    def _vector_size(self) -> int:
+        size = EMBEDDING_DIMENSIONS.get(getattr(self.embeddings, "model", None))
+        if size is None:
+            size = len(self.embeddings.embed_query("dimension_check"))
+        return size
 
-        texts = []
-        metadatas = []
-        ids = []
+    # =========================
+    # WATERMARK
+    # =========================
+
+    def _load_watermark(self) -> Optional[datetime]:
+        value = self.redis.get(WATERMARK_KEY)
+        if value is None:
+            return None
+        return datetime.fromisoformat(value.decode())
+
+    def _store_watermark(self, value: datetime) -> None:
+        self.redis.set(WATERMARK_KEY, value.isoformat())
+
+    # =========================
+    # LECTURE BASE
+    # =========================
+
+    def _changed_indicators(self, since: Optional[datetime]) -> List[Indicator]:
+        """
+        Indicateurs actifs modifiés depuis `since` (tous si None), par
+        updated_at croissant.
+        """
+        indicators = Indicator.objects.select_related("category").filter(
+            is_active=True
+        )
+        if since is not None:
+            indicators = indicators.filter(updated_at__gte=since)
+        return list(indicators.order_by("updated_at"))
+
+    def _active_indicator_ids(self) -> Set[str]:
+        return set(
+            Indicator.objects.filter(is_active=True).values_list(
+                "indicator_id", flat=True
+            )
+        )
+
+    # =========================
+    # SYNCHRONISATION
+    # =========================
+
+    def index_all(self) -> Dict[str, int]:
+        """
+        Synchronisation complète (commande de reconstruction) : seuls
+        les textes modifiés sont tout de même ré-embarqués.
+        """
+        return self.sync(full=True)
+
+    def sync(self, full: bool = False) -> Dict[str, int]:
+        lock = self.redis.lock(LOCK_KEY, timeout=self.LOCK_TIMEOUT)
+        if not lock.acquire(blocking=False):
+            logger.info("Indexation des indicateurs déjà en cours, run ignoré")
+            return {"skipped": 1}
+
+        try:
+            return self._sync(full)
+        finally:
+            try:
+                lock.release()
+            except LockError:
+                # verrou expiré pendant un run trop long
+                logger.warning("Verrou d'indexation expiré avant la fin du run")
+
+    def _sync(self, full: bool) -> Dict[str, int]:
+        watermark = None if full else self._load_watermark()
+        since = None if watermark is None else watermark - self.WATERMARK_OVERLAP
 
+        indicators = self._changed_indicators(since)
+        stored = self._stored_hashes(
+            [indicator_point_id(i.indicator_id) for i in indicators]
+        )
+
+        texts, metadatas, ids = [], [], []
         for indicator in indicators:
-            texts.append(build_indicator_document(indicator))
+            point_id = indicator_point_id(indicator.indicator_id)
+            text = build_indicator_document(indicator)
+            digest = text_hash(text)
+
+            if stored.get(point_id) == digest:
+                continue
+
+            texts.append(text)
             metadatas.append(
                 {
                     "indicator_id": indicator.indicator_id,
@@ -99,12 +224,77 @@ class IndicatorIndexer:
                     "aliases": indicator.aliases,
                     "keywords": indicator.keywords,
                     "source": "SVU",
+                    "content_hash": digest,
+                    "updated_at": indicator.updated_at.isoformat(),
                 }
             )
-            ids.append(indicator_point_id(indicator.indicator_id))
+            ids.append(point_id)
+
+        if texts:
+            self.vectorstore.add_texts(
+                texts=texts,
+                metadatas=metadatas,
+                ids=ids,
+                batch_size=self.BATCH_SIZE,
+            )
+
+        # suppressions explicites : désactivés (même en masse) et supprimés
+        active = {indicator_point_id(i) for i in self._active_indicator_ids()}
+        removed = sorted(set(self._stored_ids()) - active)
+
+        if removed:
+            self.client.delete(
+                collection_name=QDRANT_COLLECTION,
+                points_selector=PointIdsList(points=removed),
+            )
+
+        if indicators:
+            self._store_watermark(indicators[-1].updated_at)
+        elif watermark is None:
+            self._store_watermark(timezone.now())
 
-        self.vectorstore.add_texts(
-            texts=texts,
-            metadatas=metadatas,
-            ids=ids,
+        report = {
+            "scanned": len(indicators),
+            "indexed": len(texts),
+            "deleted": len(removed),
+        }
+        logger.info(
+            f"✅ Indicateurs synchronisés : {report['indexed']} embarqués, "
+            f"{report['deleted']} supprimés ({report['scanned']} examinés)"
         )
+        return report
+
+    # =========================
+    # LECTURE QDRANT (sans vecteurs)
+    # =========================
+
+    def _stored_hashes(self, point_ids: List[int]) -> Dict[int, Optional[str]]:
+        hashes = {}
+        for start in range(0, len(point_ids), self.BATCH_SIZE):
+            points = self.client.retrieve(
+                collection_name=QDRANT_COLLECTION,
+                ids=point_ids[start : start + self.BATCH_SIZE],
+                with_payload=["metadata.content_hash"],
+                with_vectors=False,
+            )
+            for point in points:
+                metadata = (point.payload or {}).get("metadata") or {}
+                hashes[point.id] = metadata.get("content_hash")
+        return hashes
+
+    def _stored_ids(self) -> List[int]:
+        ids = []
+        offset = None
+
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=QDRANT_COLLECTION,
+                with_payload=False,
+                with_vectors=False,
+                limit=1_000,
+                offset=offset,
+            )
+            ids.extend(point.id for point in points)
+
+            if offset is None:
+                return ids
@@ -0,0 +1,29 @@
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from qdrant_client import QdrantClient
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+    """
+    Embeddings déterministes (sans appel OpenAI) qui comptent les textes
+    embarqués.
+    """
+
+    embedded: list = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def embeddings():
+    return CountingEmbeddings(size=8, embedded=[])
+
+
+@pytest.fixture
+def qdrant():
+    # client Qdrant réel, stockage en mémoire
+    client = QdrantClient(":memory:")
+    yield client
+    client.close()
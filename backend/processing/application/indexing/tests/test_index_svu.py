@@ -0,0 +1,89 @@
+import json
+
+import pytest
+from processing.application.indexing import index_svu as module
+from processing.application.indexing.index_svu import (
+    QDRANT_COLLECTION,
+    index_svu,
+    svu_point_id,
+)
+from qdrant_client.models import PointIdsList
+
+
+def _indicator(indicator_id, label):
+    return {
+        "indicator_id": indicator_id,
+        "indicator_code": indicator_id.upper(),
+        "label": label,
+        "category": "Economie",
+    }
+
+
+@pytest.fixture(autouse=True)
+def _fresh_memo():
+    module.forget_svu_sync()
+    yield
+    module.forget_svu_sync()
+
+
+@pytest.fixture
+def write_svu(tmp_path):
+    path = tmp_path / "svu.json"
+
+    def _write(*indicators):
+        path.write_text(json.dumps({"metadata": {}, "indicators": list(indicators)}))
+        return str(path)
+
+    return _write
+
+
+def test_only_changed_indicators_are_embedded(write_svu, qdrant, embeddings):
+    gdp, pop = _indicator("gdp", "PIB"), _indicator("pop", "Population")
+    path = write_svu(gdp, pop)
+
+    first = index_svu(path, client=qdrant, embeddings=embeddings)
+    module.forget_svu_sync()
+    again = index_svu(path, client=qdrant, embeddings=embeddings)
+
+    path = write_svu(gdp, _indicator("pop", "Population totale"))
+    changed = index_svu(path, client=qdrant, embeddings=embeddings)
+
+    assert first == {"indexed": 2, "deleted": 0, "unchanged": 0}
+    assert again == {"indexed": 0, "deleted": 0, "unchanged": 2}
+    assert changed == {"indexed": 1, "deleted": 0, "unchanged": 1}
+    assert len(embeddings.embedded) == 3
+    assert qdrant.count(QDRANT_COLLECTION).count == 2
+
+
+def test_removed_indicators_are_deleted(write_svu, qdrant, embeddings):
+    index_svu(
+        write_svu(_indicator("gdp", "PIB"), _indicator("pop", "Population")),
+        client=qdrant,
+        embeddings=embeddings,
+    )
+
+    report = index_svu(
+        write_svu(_indicator("gdp", "PIB")), client=qdrant, embeddings=embeddings
+    )
+
+    assert report == {"indexed": 0, "deleted": 1, "unchanged": 1}
+    (point,) = qdrant.scroll(QDRANT_COLLECTION)[0]
+    assert point.id == svu_point_id("gdp")
+
+
+def test_memo_skips_work_until_collection_changes(write_svu, qdrant, embeddings):
+    path = write_svu(_indicator("gdp", "PIB"), _indicator("pop", "Population"))
+    index_svu(path, client=qdrant, embeddings=embeddings)
+
+    # svu.json inchangé, collection complète : aucun diff
+    assert index_svu(path, client=qdrant, embeddings=embeddings)["unchanged"] == 2
+    assert len(embeddings.embedded) == 2
+
+    # point supprimé par un autre process : mémo invalidé, point restauré
+    qdrant.delete(
+        QDRANT_COLLECTION, points_selector=PointIdsList(points=[svu_point_id("pop")])
+    )
+    report = index_svu(path, client=qdrant, embeddings=embeddings)
+
+    assert report == {"indexed": 1, "deleted": 0, "unchanged": 1}
+    assert qdrant.count(QDRANT_COLLECTION).count == 2
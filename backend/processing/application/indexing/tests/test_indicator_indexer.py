@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from processing.application.indexing.indicator_indexer import (
+    QDRANT_COLLECTION,
+    WATERMARK_KEY,
+    IndicatorIndexer,
+)
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeLock:
+    def __init__(self, redis):
+        self.redis = redis
+
+    def acquire(self, blocking=True):
+        if self.redis.locked:
+            return False
+        self.redis.locked = True
+        return True
+
+    def release(self):
+        self.redis.locked = False
+
+
+class FakeRedis:
+    """
+    get/set et verrou non bloquant, comme django_redis.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.locked = False
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value):
+        self.values[key] = str(value).encode()
+
+    def lock(self, key, timeout=None):
+        return FakeLock(self)
+
+
+def indicator(indicator_id, label, updated_at):
+    return SimpleNamespace(
+        indicator_id=indicator_id,
+        indicator_code=indicator_id.upper(),
+        label=label,
+        description="",
+        value_type="number",
+        unit="",
+        aliases=[],
+        keywords=[],
+        category=SimpleNamespace(code="C1", label="Catégorie"),
+        is_active=True,
+        updated_at=updated_at,
+    )
+
+
+class FakeIndicators:
+    """
+    Table Indicator en mémoire ; `since` reçus par la requête delta.
+    """
+
+    def __init__(self, *rows):
+        self.rows = {row.indicator_id: row for row in rows}
+        self.since = []
+
+    def changed(self, since):
+        self.since.append(since)
+        rows = [
+            row
+            for row in self.rows.values()
+            if row.is_active and (since is None or row.updated_at >= since)
+        ]
+        return sorted(rows, key=lambda row: row.updated_at)
+
+    def active_ids(self):
+        return {row.indicator_id for row in self.rows.values() if row.is_active}
+
+
+@pytest.fixture
+def table():
+    return FakeIndicators(
+        indicator("ind_a", "Effectif", T0),
+        indicator("ind_b", "Chiffre d'affaires", T0 + timedelta(hours=1)),
+    )
+
+
+@pytest.fixture
+def redis():
+    return FakeRedis()
+
+
+@pytest.fixture
+def indexer(qdrant, embeddings, redis, table, monkeypatch):
+    indexer = IndicatorIndexer(client=qdrant, embeddings=embeddings, redis=redis)
+    monkeypatch.setattr(indexer, "_changed_indicators", table.changed)
+    monkeypatch.setattr(indexer, "_active_indicator_ids", table.active_ids)
+    return indexer
+
+
+def stored_count(qdrant):
+    return qdrant.count(QDRANT_COLLECTION, exact=True).count
+
+
+def test_delta_run_reads_from_watermark_minus_overlap(
+    indexer, table, redis, embeddings, qdrant
+):
+    first = indexer.sync()
+    assert first == {"scanned": 2, "indexed": 2, "deleted": 0}
+    assert table.since == [None]
+    assert redis.get(WATERMARK_KEY) == (T0 + timedelta(hours=1)).isoformat().encode()
+
+    table.rows["ind_a"].label = "Effectif total"
+    table.rows["ind_a"].updated_at = T0 + timedelta(hours=2)
+    embeddings.embedded.clear()
+
+    second = indexer.sync()
+    assert table.since[-1] == T0 + timedelta(hours=1) - indexer.WATERMARK_OVERLAP
+    # ind_b relu (recouvrement) mais texte inchangé : seul ind_a ré-embarqué
+    assert second == {"scanned": 2, "indexed": 1, "deleted": 0}
+    assert len(embeddings.embedded) == 1
+    assert "Effectif total" in embeddings.embedded[0]
+    assert stored_count(qdrant) == 2
+
+
+def test_held_lock_skips_the_run(indexer, table, redis, embeddings):
+    redis.locked = True
+
+    assert indexer.sync() == {"skipped": 1}
+    assert table.since == []
+    assert embeddings.embedded == []
+    assert redis.get(WATERMARK_KEY) is None
+
+
+def test_lock_is_released_after_a_run(indexer, redis):
+    indexer.sync()
+    assert not redis.locked
+    assert "skipped" not in indexer.sync()
+
+
+def test_bulk_deactivation_is_deleted_on_a_delta_run(indexer, table, qdrant):
+    indexer.sync()
+
+    # queryset.update(is_active=False) : updated_at inchangé
+    table.rows["ind_a"].is_active = False
+
+    report = indexer.sync()
+    assert report["indexed"] == 0
+    assert report["deleted"] == 1
+    assert stored_count(qdrant) == 1
+
+
+def test_deleted_indicator_is_removed(indexer, table, qdrant, embeddings):
+    indexer.sync()
+
+    del table.rows["ind_b"]
+    embeddings.embedded.clear()
+
+    assert indexer.sync()["deleted"] == 1
+    assert stored_count(qdrant) == 1
+    assert embeddings.embedded == []
@@ -1,12 +1,25 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+from processing.application.parsers.excel.fact_builder import DEFAULT_FACT_HASH
+
 
 class BaseDocumentParser(ABC):
-    def __init__(self, document_id: str, content: bytes, filename: str):
+    # À incrémenter dès que la sortie du parser change (invalide le cache)
+    VERSION = "1"
+
+    def __init__(
+        self,
+        document_id: str,
+        content: bytes,
+        filename: str,
+        fact_hash: str = DEFAULT_FACT_HASH,
+    ):
         self.document_id = document_id
         self.content = content
         self.filename = filename
+        # hash d'identité des faits (voir FACT_HASHES)
+        self.fact_hash = fact_hash
 
     @abstractmethod
     def parse(self) -> Any:
@@ -0,0 +1,44 @@
+import io
+
+import pytest
+from openpyxl import Workbook
+
+
+@pytest.fixture
+def make_workbook():
+    """
+    Construit un classeur xlsx en mémoire : {nom_feuille: [lignes]}
+    """
+
+    def _make(sheets: dict) -> bytes:
+        wb = Workbook()
+        wb.remove(wb.active)
+
+        for name, rows in sheets.items():
+            ws = wb.create_sheet(name)
+            for row in rows:
+                ws.append(row)
+
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        return buffer.getvalue()
+
+    return _make
+
+
+@pytest.fixture
+def wdi_sheet():
+    """
+    Feuille type WDI : titre, header, colonnes années, marqueurs vides.
+    """
+    rows = [
+        ["World Development Indicators"],
+        [],
+        ["Country Name", "Country Code", "Series Name", "2019", "2020", "2021"],
+    ]
+    countries = ["France", "Benin", "Senegal", "Mali", "Togo", "Niger"]
+
+    for i, country in enumerate(countries):
+        rows.append([country, country[:3].upper(), "GDP", 1.0 + i, "..", 0])
+
+    return rows
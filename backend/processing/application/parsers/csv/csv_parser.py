@@ -0,0 +1,301 @@
+import codecs
+import csv
+import io
+import os
+from collections import Counter
+from itertools import chain, islice
+from typing import Any, Iterator, List, Optional, Tuple
+
+import numpy as np
+from processing.application.parsers.base import BaseDocumentParser
+from processing.application.parsers.excel.contracts import (
+    ColumnarRawSheet,
+    RawWorkbook,
+    map_distinct,
+)
+from processing.application.parsers.excel.excel_parser import ExcelParser
+from processing.application.parsers.excel.fact_builder import (
+    DEFAULT_FACT_HASH,
+    BlindFactBuilder,
+    RawFact,
+)
+from processing.application.parsers.excel.instrumentation import PipelineMetrics
+from processing.application.parsers.excel.normalizer import ExcelNormalizer
+from processing.application.parsers.excel.raw_loader import ExcelRawLoader
+from processing.application.parsers.excel.semantic_contracts import SemanticTable
+from processing.application.parsers.excel.structure_analyzer import (
+    ExcelStructureAnalyzer,
+)
+
+# Séparateurs candidats (ordre = priorité à égalité)
+DELIMITERS = [",", ";", "\t", "|"]
+
+BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+# tests de type élément par élément sur un bloc numpy (boucle C)
+_is_str = np.frompyfunc(lambda v: isinstance(v, str), 1, 1)
+
+
+def parse_number(value: str) -> Any:
+    """
+    Chaîne numérique → int / float (comme une cellule Excel saisie),
+    sinon la chaîne telle quelle. Les codes à zéros de tête ("001")
+    restent des chaînes.
+    """
+    digits = value.lstrip("+-")
+    if len(digits) > 1 and digits[0] == "0" and digits[1].isdigit():
+        return value
+
+    try:
+        return int(value)
+    except ValueError:
+        pass
+
+    try:
+        number = float(value)
+    except ValueError:
+        return value
+
+    # "nan", "inf" : laissés en chaîne (marqueurs textuels)
+    if not np.isfinite(number):
+        return value
+
+    # float entier → int (iso lecture Excel)
+    return int(number) if number.is_integer() else number
+
+
+def restore_year_labels(head: np.ndarray, scan_rows: int) -> np.ndarray:
+    """
+    Sans typage de cellule, un header "Pays;2019;2020" ressemble à une
+    ligne de données une fois les nombres convertis : les années
+    croissantes de la première ligne mêlant libellés et années (header
+    candidat) redeviennent du texte (comme dans un classeur Excel) avant
+    la détection du header. Les lignes suivantes, même de même forme
+    ("France;2001;2005"), sont des données : types conservés.
+    """
+    for r in range(min(len(head), scan_rows)):
+        row = head[r]
+        numbers = [(j, v) for j, v in enumerate(row) if isinstance(v, (int, float))]
+        years = [v for _, v in numbers if isinstance(v, int) and 1900 <= v <= 2100]
+
+        if (
+            len(years) >= 2
+            and len(years) == len(numbers)
+            and any(isinstance(v, str) for v in row)
+            and all(a < b for a, b in zip(years, years[1:]))
+        ):
+            for j, v in numbers:
+                row[j] = str(v)
+            break
+
+    return head
+
+
+def typed_block(rows: List[List[str]]) -> Optional[np.ndarray]:
+    """
+    Lignes de texte (CSV, cellules d'un tableau PDF) → bloc normalisé
+    comme une feuille Excel columnaire (trim, marqueurs vides → None,
+    nombres typés), lignes vides écartées ; None si tout est vide.
+    """
+    block = ExcelRawLoader.normalize_rows(rows)
+
+    is_str = _is_str(block).astype(bool)
+    if is_str.any():
+        block[is_str] = map_distinct(block[is_str], parse_number)
+
+    keep = (block != None).any(axis=1)  # noqa: E711
+    if not keep.any():
+        return None
+    return block if keep.all() else block[keep]
+
+
+class CsvParser(BaseDocumentParser):
+    """
+    CSV / TSV volumineux, lus en flux :
+    - encodage (BOM, UTF-8, sinon cp1252) et séparateur détectés sur
+      un échantillon de tête
+    - header détecté sur les HEAD_ROWS premières lignes
+      (ExcelStructureAnalyzer : préambules type export WDI gérés)
+    - lignes suivantes lues par blocs de CHUNK_ROWS et passées aux
+      mêmes étages que le parser Excel (unpivot, sanitize, nettoyage)
+
+    Mémoire bornée par un bloc, quelle que soit la taille du fichier.
+    """
+
+    SAMPLE_BYTES = 64 * 1024
+    HEAD_ROWS = 1_000
+    CHUNK_ROWS = 2_000
+
+    def __init__(
+        self,
+        document_id: str,
+        content: bytes,
+        filename: str,
+        streaming: bool = False,
+        fact_hash: str = DEFAULT_FACT_HASH,
+        metrics: bool = True,
+    ):
+        super().__init__(document_id, content, filename, fact_hash=fact_hash)
+        self.streaming = streaming
+        self.metrics = PipelineMetrics(enabled=metrics)
+
+    def parse(self):
+        """
+        streaming=True : générateur de RawFact, sinon liste complète.
+        """
+        raw_facts = self.iter_facts()
+
+        if self.streaming:
+            return raw_facts
+
+        return list(raw_facts)
+
+    def iter_facts(self) -> Iterator[RawFact]:
+        builder = BlindFactBuilder(self.fact_hash)
+        metrics = self.metrics
+        table = self._semantic_table()
+
+        if table is not None:
+            source = {
+                "document_id": self.document_id,
+                "sheet": table.name,
+                "parser": "csv",
+            }
+
+            batches = builder.iter_batches(table.rows, source)
+            for batch in metrics.timed("facts", batches):
+                yield from batch
+
+        metrics.log(self.filename)
+
+    # =========================
+    # DÉTECTION (échantillon)
+    # =========================
+
+    @staticmethod
+    def sniff_encoding(sample: bytes) -> str:
+        for bom, encoding in BOMS:
+            if sample.startswith(bom):
+                return encoding
+
+        try:
+            # final=False : un caractère coupé en fin d'échantillon est toléré
+            codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        except UnicodeDecodeError:
+            return "cp1252"
+
+        return "utf-8"
+
+    @staticmethod
+    def sniff_delimiter(lines: List[str]) -> str:
+        """
+        Séparateur donnant le nombre de champs (> 1) le plus régulier
+        sur les lignes de l'échantillon ; "," par défaut.
+        """
+        best, best_score = ",", (0, 0)
+
+        for delimiter in DELIMITERS:
+            widths = Counter(
+                len(fields)
+                for fields in csv.reader(lines, delimiter=delimiter)
+                if len(fields) > 1
+            )
+            if not widths:
+                continue
+
+            width, frequency = widths.most_common(1)[0]
+            score = (frequency, width)
+            if score > best_score:
+                best, best_score = delimiter, score
+
+        return best
+
+    def _dialect(self) -> Tuple[str, str]:
+        sample = self.content[: self.SAMPLE_BYTES]
+        encoding = self.sniff_encoding(sample)
+
+        if os.path.splitext(self.filename.lower())[1] == ".tsv":
+            return encoding, "\t"
+
+        text = sample.decode(encoding, errors="replace")
+        # dernière ligne possiblement tronquée
+        lines = text.splitlines()[:-1] or text.splitlines()
+
+        return encoding, self.sniff_delimiter(lines)
+
+    # =========================
+    # LECTURE PAR BLOCS
+    # =========================
+
+    def _iter_blocks(self) -> Iterator[np.ndarray]:
+        """
+        Blocs normalisés comme une feuille Excel columnaire (trim,
+        marqueurs vides → None, nombres typés, lignes vides écartées).
+        """
+        encoding, delimiter = self._dialect()
+        stream = io.TextIOWrapper(
+            io.BytesIO(self.content), encoding=encoding, errors="replace", newline=""
+        )
+        rows = csv.reader(stream, delimiter=delimiter)
+        size = self.HEAD_ROWS
+
+        while True:
+            chunk = list(islice(rows, size))
+            if not chunk:
+                break
+
+            block = typed_block(chunk)
+            if block is not None:
+                yield block
+
+            size = self.CHUNK_ROWS
+
+    def head_block(self, rows: int) -> Optional[np.ndarray]:
+        """
+        `rows` premières lignes normalisées, libellés d'années restaurés
+        (aperçu de structure).
+        """
+        head = next(self._iter_blocks(), None)
+        if head is None:
+            return None
+        return restore_year_labels(head[:rows], ExcelStructureAnalyzer.MAX_SCAN_ROWS)
+
+    def _semantic_table(self) -> Optional[SemanticTable]:
+        name = os.path.splitext(os.path.basename(self.filename))[0] or "csv"
+        metrics = self.metrics
+        blocks = iter(metrics.timed("load", self._iter_blocks()))
+
+        head = next(blocks, None)
+        if head is None:
+            return None
+
+        head = restore_year_labels(head, ExcelStructureAnalyzer.MAX_SCAN_ROWS)
+
+        raw = RawWorkbook(sheets={name: ColumnarRawSheet(name=name, values=head)})
+        with metrics.measure("detect") as stats:
+            detected = ExcelStructureAnalyzer.analyze(raw, layouts=ExcelParser.LAYOUTS)
+            if stats is not None:
+                stats.tables_in += 1
+                stats.tables_out += len(detected.tables)
+
+        if not detected.tables:
+            return None
+
+        # un CSV = une table : toutes les lignes après le header
+        table = detected.tables[0]
+        data = chain([head[table.data_start_row :]], blocks)
+
+        normalized = ExcelNormalizer.normalize_stream(table, data)
+        normalized.rows = metrics.timed_rows("normalize", normalized.rows)
+
+        # types sur la tête de fichier : mémoire bornée par un bloc
+        return ExcelParser.refine_table(
+            normalized,
+            layout=table.layout,
+            metrics=metrics,
+            prescan_rows=ExcelParser.TYPE_PRESCAN_ROWS,
+        )
@@ -0,0 +1,80 @@
+import csv
+import io
+import types
+
+from processing.application.parsers.csv.csv_parser import (
+    CsvParser,
+    parse_number,
+    restore_year_labels,
+    typed_block,
+)
+from processing.application.parsers.excel.excel_parser import ExcelParser
+
+
+def _to_csv(rows, delimiter=",", encoding="utf-8") -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=delimiter, lineterminator="\r\n")
+    writer.writerows(rows)
+    return buffer.getvalue().encode(encoding)
+
+
+def test_csv_yields_same_payloads_as_excel(make_workbook, wdi_sheet):
+    rows = wdi_sheet + [["Côte d'Ivoire", "CIV", "GDP", 7.5, "n/a", 3]]
+    content = _to_csv(rows, delimiter=";", encoding="cp1252")
+
+    facts = CsvParser("doc-1", content, "wdi.csv").parse()
+    expected = ExcelParser("doc-1", make_workbook({"wdi": rows}), "wdi.xlsx").parse()
+
+    assert [f.payload for f in facts] == [f.payload for f in expected]
+    assert facts[-1].payload["country_name"] == "Côte D'Ivoire"
+    assert {f.source["parser"] for f in facts} == {"csv"}
+
+
+def test_csv_is_read_in_chunks(monkeypatch, wdi_sheet):
+    rows = wdi_sheet + [["Chad", "TCD", "GDP", i, i + 1, None] for i in range(50)]
+    content = _to_csv(rows, delimiter="\t")
+
+    whole = CsvParser("doc-1", content, "wdi.tsv").parse()
+
+    monkeypatch.setattr(CsvParser, "HEAD_ROWS", 5)
+    monkeypatch.setattr(CsvParser, "CHUNK_ROWS", 7)
+    streamed = CsvParser("doc-1", content, "wdi.tsv", streaming=True).parse()
+
+    assert isinstance(streamed, types.GeneratorType)
+    assert list(streamed) == whole
+    assert len(whole) == 12 + 100
+
+
+def test_dialect_sniffing():
+    lines = ["Data Source;WDI", "", "a;b,c;d", "1;2,5;3", "4;5,5;6"]
+
+    assert CsvParser.sniff_delimiter(lines) == ";"
+    assert CsvParser.sniff_encoding("été".encode("cp1252")) == "cp1252"
+    assert CsvParser.sniff_encoding("é".encode("utf-8")[:1]) == "utf-8"
+    assert CsvParser.sniff_encoding("﻿a".encode("utf-8")) == "utf-8-sig"
+
+
+def test_parse_number_keeps_codes_as_strings():
+    assert parse_number("12") == 12
+    assert parse_number("-1.0") == -1
+    assert parse_number("2.5") == 2.5
+    assert parse_number("001") == "001"
+    assert parse_number("nan") == "nan"
+    assert parse_number("1 234,5") == "1 234,5"
+
+
+def test_only_header_row_gets_year_labels_back():
+    block = typed_block(
+        [
+            ["Country", "2019", "2020"],
+            ["France", "2001", "2005"],
+            ["Benin", "1.5", "2010"],
+        ]
+    )
+
+    restored = restore_year_labels(block, scan_rows=100)
+
+    assert restored[0].tolist() == ["Country", "2019", "2020"]
+    # lignes de données de même forme : nombres conservés, colonne homogène
+    assert restored[1].tolist() == ["France", 2001, 2005]
+    assert restored[2].tolist() == ["Benin", 1.5, 2010]
@@ -1,5 +1,22 @@
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from itertools import chain, islice
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
 
 # =========================
 # NIVEAU 0 — INTROSPECTION
@@ -34,9 +51,29 @@ class RawSheet:
     matrix: List[List[Any]]
 
 
+@dataclass
+class ColumnarRawSheet:
+    """
+    Variante columnaire de RawSheet : matrice 2D numpy (dtype=object).
+    Indexable comme une liste de lignes (matrix[i][j]) pour les étages
+    aval, et par colonne (values[:, j]) pour les traitements vectorisés.
+    """
+
+    name: str
+    # ou SpilledMatrix (feuille déversée sur disque, spill.py)
+    values: np.ndarray
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self.values
+
+    def column(self, index: int) -> np.ndarray:
+        return self.values[:, index]
+
+
 @dataclass
 class RawWorkbook:
-    sheets: Dict[str, RawSheet]
+    sheets: Dict[str, Union[RawSheet, ColumnarRawSheet]]
 
 
 # =========================
@@ -53,6 +90,8 @@ class DetectedTable:
     columns: List[str]
     orientation: str  # "horizontal" | "vertical"
     confidence: float
+    # empreinte de mise en page (LayoutCache), None si non mémorisée
+    layout: Optional[str] = None
 
 
 @dataclass
@@ -65,11 +104,198 @@ class StructuredWorkbook:
 # =========================
 
 
+class TableRow(Mapping):
+    """
+    Vue dict-like (lecture seule) d'une ligne compacte : le schéma
+    {colonne: position} est partagé par toutes les lignes de la table,
+    seules les valeurs (tuple) sont propres à la ligne.
+    """
+
+    __slots__ = ("_index", "_values")
+
+    def __init__(self, index: Dict[str, int], values: tuple):
+        self._index = index
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[self._index[key]]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        pos = self._index.get(key)
+        return default if pos is None else self._values[pos]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def keys(self):
+        return self._index.keys()
+
+    def values(self) -> tuple:
+        return self._values
+
+    def items(self):
+        return zip(self._index, self._values)
+
+    def copy(self) -> Dict[str, Any]:
+        """
+        dict autonome (payload des faits).
+        """
+        return dict(zip(self._index, self._values))
+
+    def __repr__(self) -> str:
+        return f"TableRow({self.copy()!r})"
+
+
+def collapse_keys(keys: Sequence[str]) -> Tuple[List[str], List[int]]:
+    """
+    Clés uniques (ordre de première apparition) et position de leur
+    dernière occurrence : la sémantique d'un dict rempli clé par clé.
+    """
+    positions = {}
+    for i, key in enumerate(keys):
+        positions[key] = i
+    return list(positions), list(positions.values())
+
+
+class TableRows:
+    """
+    Lignes d'une table au format compact : UN schéma de colonnes (noms
+    uniques) et, au choix :
+    - un tuple de valeurs par ligne (data) ;
+    - des blocs columnaires numpy 2D (dtype=object), une colonne par
+      entrée du schéma (chunks), pour les étages vectorisés.
+
+    Liste (mode document) ou générateur à consommer une fois (mode
+    streaming). L'itération produit des TableRow dict-like ; les étages
+    du pipeline travaillent directement sur tuples() ou chunks().
+    """
+
+    __slots__ = ("columns", "index", "_data", "_chunks")
+
+    def __init__(self, columns: Sequence[str], data: Iterable[tuple] = ()):
+        self.columns = list(columns)
+        self.index = {c: i for i, c in enumerate(self.columns)}
+        if len(self.index) != len(self.columns):
+            raise ValueError(f"Colonnes dupliquées dans le schéma : {self.columns}")
+        self._data = data
+        self._chunks = None
+
+    @classmethod
+    def from_chunks(
+        cls, columns: Sequence[str], chunks: Iterable[np.ndarray]
+    ) -> "TableRows":
+        rows = cls(columns)
+        rows._chunks = chunks
+        return rows
+
+    def tuples(self) -> Iterable[tuple]:
+        if self._chunks is None:
+            return self._data
+        return chain.from_iterable(
+            map(tuple, chunk.tolist()) for chunk in self._chunks
+        )
+
+    def chunks(self, size: int) -> Iterable[np.ndarray]:
+        """
+        Blocs columnaires ; les lignes tuples sont regroupées par `size`.
+        """
+        if self._chunks is not None:
+            return self._chunks
+        return self._iter_chunks(size)
+
+    def _iter_chunks(self, size: int) -> Iterator[np.ndarray]:
+        width = len(self.columns)
+        source = iter(self._data)
+        while True:
+            group = list(islice(source, size))
+            if not group:
+                return
+            block = np.empty((len(group), width), dtype=object)
+            block[:] = group
+            yield block
+
+    def positions(self, keys: Sequence[str]) -> List[Optional[int]]:
+        return [self.index.get(k) for k in keys]
+
+    def picker(self, keys: Sequence[str]) -> Callable[[tuple], tuple]:
+        """
+        Projection tuple -> tuple sur `keys` (clé absente -> None),
+        équivalent de (row.get(k) for k in keys) sans dict intermédiaire.
+        """
+        positions = self.positions(keys)
+
+        if positions == list(range(len(self.columns))):
+            return tuple
+        if None not in positions and len(positions) > 1:
+            return itemgetter(*positions)
+        return lambda values: tuple(
+            None if p is None else values[p] for p in positions
+        )
+
+    def materialize(self) -> "TableRows":
+        if self._chunks is not None or not isinstance(self._data, list):
+            self._data = list(self.tuples())
+            self._chunks = None
+        return self
+
+    def __iter__(self) -> Iterator[TableRow]:
+        index = self.index
+        return (TableRow(index, values) for values in self.tuples())
+
+    # Accès direct (len, indice) : lignes en liste uniquement. Un flux
+    # (blocs, générateur) n'est pas chargé implicitement : matérialiser
+    # en le consommant sous un itérateur déjà ouvert (list(rows) appelle
+    # len() après iter()) perdrait les lignes de cet itérateur.
+
+    def _listed(self) -> list:
+        if self._chunks is not None or not isinstance(self._data, list):
+            raise TypeError(
+                "Lignes en flux (blocs ou générateur) : appeler materialize() "
+                "avant len() ou un accès par indice"
+            )
+        return self._data
+
+    def __len__(self) -> int:
+        return len(self._listed())
+
+    def __getitem__(self, i: int) -> TableRow:
+        return TableRow(self.index, self._listed()[i])
+
+
+def take_columns(block: np.ndarray, positions: Sequence[Optional[int]]) -> np.ndarray:
+    """
+    Colonnes `positions` d'un bloc 2D (position None -> colonne de None).
+    """
+    out = np.full((len(block), len(positions)), None, dtype=object)
+    for j, pos in enumerate(positions):
+        if pos is not None:
+            out[:, j] = block[:, pos]
+    return out
+
+
+def map_distinct(strings: np.ndarray, fn: Callable[[str], Any]) -> np.ndarray:
+    """
+    fn appliquée une fois par chaîne DISTINCTE (pays, codes, libellés
+    se répètent sur des milliers de lignes), résultat redistribué.
+    """
+    codes, uniques = pd.factorize(strings)
+    mapped = np.empty(len(uniques), dtype=object)
+    mapped[:] = [fn(u) for u in uniques]
+    return mapped[codes]
+
+
 @dataclass
 class NormalizedTable:
     name: str
+    # noms tels que détectés (doublons possibles) ; rows.columns = clés uniques
     columns: List[str]
-    rows: List[Dict[str, Any]]
+    rows: TableRows
     confidence: float
 
 
@@ -1,55 +1,312 @@
+import os
+import pickle
+import tempfile
+from collections import deque
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
 from processing.application.parsers.base import BaseDocumentParser
-from processing.application.parsers.excel.fact_builder import BlindFactBuilder
+from processing.application.parsers.excel.contracts import (
+    NormalizedTable,
+    RawWorkbook,
+    TableRows,
+)
+from processing.application.parsers.excel.fact_builder import (
+    DEFAULT_FACT_HASH,
+    BlindFactBuilder,
+    RawFact,
+)
 from processing.application.parsers.excel.header_repair import ExcelSanitizer
-from processing.application.parsers.excel.introspector import ExcelIntrospector
+from processing.application.parsers.excel.instrumentation import PipelineMetrics
+from processing.application.parsers.excel.layout_cache import LayoutCache
 from processing.application.parsers.excel.normalizer import (
     ExcelNormalizer,
     TemporalUnpivotNormalizer,
 )
-from processing.application.parsers.excel.raw_loader import ExcelRawLoader
-from processing.application.parsers.excel.semantic_analyzer import SemanticTableAnalyzer
-from processing.application.parsers.excel.semantic_contracts import (
-    SemanticColumn,
-    SemanticDocument,
-    SemanticTable,
+from processing.application.parsers.excel.raw_loader import (
+    ExcelRawLoader,
+    RawSheetLike,
 )
+from processing.application.parsers.excel.semantic_analyzer import SemanticTableAnalyzer
+from processing.application.parsers.excel.semantic_contracts import SemanticTable
 from processing.application.parsers.excel.semantic_data_cleaner import (
     SemanticDataCleaner,
 )
+from processing.application.parsers.excel.spill import (
+    SpilledMatrix,
+    SpillPolicy,
+    SpillWriter,
+)
 from processing.application.parsers.excel.structure_analyzer import (
     ExcelStructureAnalyzer,
 )
+from processing.application.parsers.worker_pool import worker_pool
 
 
 class ExcelParser(BaseDocumentParser):
+    # 2 : booléens / entiers d'une colonne à nouveau iso pd.read_excel
+    #     (entrées de cache écrites avec des True à la place de 1 invalidées)
+    VERSION = "2"
+    # Au-delà, les stats d'introspection sont échantillonnées
+    STATS_SAMPLE_ROWS = 10_000
+    # Matrices numpy + normalisation vectorisée (ColumnarRawSheet)
+    COLUMNAR = True
+    # Pré-scan borné pour l'inférence des types de colonnes (streaming ;
+    # sinon types inférés sur toute la table)
+    TYPE_PRESCAN_ROWS = 1_000
+    # Mises en page connues (header + rôles), partagées dans le process
+    LAYOUTS = LayoutCache()
+
+    def __init__(
+        self,
+        document_id: str,
+        content: bytes,
+        filename: str,
+        streaming: bool = False,
+        workers: Optional[int] = None,
+        reader_engine: Optional[str] = None,
+        fact_hash: str = DEFAULT_FACT_HASH,
+        metrics: bool = True,
+        spill_min_cells: int = 0,
+        spill_dir: Optional[str] = None,
+    ):
+        super().__init__(document_id, content, filename, fact_hash=fact_hash)
+        self.streaming = streaming
+        # > 1 : feuilles analysées en parallèle (opt-in), sinon séquentiel
+        self.workers = workers
+        # "openpyxl", "calamine" ou "auto" (taille / format, ReaderEngines)
+        self.reader_engine = reader_engine
+        # chronométrage par étage (rapport complet une fois les faits consommés)
+        self.metrics = PipelineMetrics(enabled=metrics)
+        # feuilles géantes (lignes × colonnes déclarées >= seuil, 0 = jamais)
+        # déversées sur disque en memmap au lieu d'une matrice en mémoire
+        self.spill = SpillPolicy(spill_min_cells, spill_dir)
+
     def parse(self):
-        introspection = ExcelIntrospector.inspect(self.content)
+        """
+        streaming=True : générateur de RawFact (mémoire bornée par une
+        feuille brute), sinon liste complète.
+        """
+        raw_facts = self.iter_facts()
+
+        if self.streaming:
+            return raw_facts
+
+        return list(raw_facts)
+
+    def iter_facts(self) -> Iterator[RawFact]:
+        builder = BlindFactBuilder(self.fact_hash)
+        metrics = self.metrics
+
+        if self.workers and self.workers > 1:
+            tables = self._iter_parallel_tables()
+        else:
+            tables = self._iter_sequential_tables()
+
+        try:
+            for name, rows in tables:
+                source = {
+                    "document_id": self.document_id,
+                    "sheet": name,
+                    "parser": "excel",
+                }
+
+                batches = builder.iter_batches(rows, source)
+                for batch in metrics.timed("facts", batches):
+                    yield from batch
+        finally:
+            self.spill.cleanup()
+
+        metrics.log(self.filename)
+
+    def _iter_sheets(self) -> Iterator[RawSheetLike]:
+        # Lecture unique et paresseuse : UNE feuille retenue à la fois
+        sheets = (
+            sheet
+            for _, sheet in ExcelRawLoader.iter_sheets(
+                self.content,
+                stats_sample_rows=self.STATS_SAMPLE_ROWS,
+                columnar=self.COLUMNAR,
+                engine=self.reader_engine,
+                spill=self.spill,
+            )
+            if sheet is not None
+        )
+        return self.metrics.timed("load", sheets, count=lambda s: len(s.matrix))
+
+    def _iter_sequential_tables(self) -> Iterator[Tuple[str, TableRows]]:
+        for sheet in self._iter_sheets():
+            for table in self._iter_tables(
+                sheet, self.metrics, prescan_rows=self._prescan_rows()
+            ):
+                yield table.name, table.rows
+
+    def _iter_parallel_tables(self) -> Iterator[Tuple[str, TableRows]]:
+        """
+        Feuilles lues ici (moteur de lecture, séquentiel), étages d'analyse dans un
+        pool billiard (utilisable depuis un enfant prefork Celery), gardé
+        d'un document à l'autre (worker_pool).
+        Au plus 2 × workers feuilles en vol ; résultats consommés dans
+        l'ordre de soumission => ordre des faits déterministe.
+        """
+        pending = deque()
+        pool = worker_pool("excel", self.workers)
+
+        for sheet in self._iter_sheets():
+            pending.append(
+                pool.apply_async(_process_sheet, (sheet, self._prescan_rows()))
+            )
+
+            if len(pending) >= 2 * self.workers:
+                yield from _unpack_tables(self._wait(pending.popleft()))
+
+        while pending:
+            yield from _unpack_tables(self._wait(pending.popleft()))
+
+    def _prescan_rows(self) -> Optional[int]:
+        # mémoire bornée (streaming) : types inférés sur la tête de table
+        return self.TYPE_PRESCAN_ROWS if self.streaming else None
+
+    def _wait(self, result) -> bytes:
+        # étages d'analyse exécutés dans le pool : seule l'attente est mesurée
+        with self.metrics.measure("pool"):
+            return result.get()
+
+    @classmethod
+    def _iter_tables(
+        cls,
+        sheet: RawSheetLike,
+        metrics: Optional[PipelineMetrics] = None,
+        prescan_rows: Optional[int] = None,
+    ) -> Iterator[SemanticTable]:
+        """
+        Étages chaînés table par table : chaque étage ligne-à-ligne est un
+        générateur. Seule l'inférence des types sur toute la table
+        (prescan_rows = None) retient la table assainie : sur disque pour
+        une feuille déversée, en mémoire sinon.
+        """
+        metrics = metrics or PipelineMetrics(enabled=False)
+        raw = RawWorkbook(sheets={sheet.name: sheet})
+
+        with metrics.measure("detect") as stats:
+            detected_tables = ExcelStructureAnalyzer.analyze(
+                raw, layouts=cls.LAYOUTS
+            ).tables
+            if stats is not None:
+                stats.tables_in += 1
+                stats.tables_out += len(detected_tables)
+
+        for detected in detected_tables:
+            with metrics.measure("normalize"):
+                table = ExcelNormalizer.normalize_table(sheet, detected)
+            table.rows = metrics.timed_rows("normalize", table.rows)
+
+            table = cls.refine_table(
+                table,
+                layout=detected.layout,
+                metrics=metrics,
+                prescan_rows=prescan_rows,
+                spill_dir=_spill_dir(sheet),
+            )
+
+            if table is not None:
+                yield table
+
+    @classmethod
+    def refine_table(
+        cls,
+        table: NormalizedTable,
+        layout: Optional[str] = None,
+        metrics: Optional[PipelineMetrics] = None,
+        prescan_rows: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+    ) -> Optional[SemanticTable]:
+        """
+        Étages communs après normalisation (unpivot, sanitize, rôles,
+        nettoyage), réutilisés par les parsers tabulaires (CSV, PDF).
+        prescan_rows : types de colonnes inférés sur les N premières
+        lignes (mémoire bornée) ; None = sur toute la table.
+        spill_dir : table assainie déversée sous ce répertoire pendant
+        l'inférence sur toute la table (feuille déversée).
+        """
+        metrics = metrics or PipelineMetrics(enabled=False)
+        layouts = cls.LAYOUTS
+
+        with metrics.measure("unpivot"):
+            table = TemporalUnpivotNormalizer.normalize_table(table)
+        table.rows = metrics.timed_rows("unpivot", table.rows)
+
+        with metrics.measure("sanitize"):
+            table = ExcelSanitizer.sanitize_table(
+                table, prescan_rows=prescan_rows, spill_dir=spill_dir
+            )
+        table.rows = metrics.timed_rows("sanitize", table.rows)
+
+        with metrics.measure("analyze"):
+            table = SemanticTableAnalyzer.analyze_table(
+                table, roles=layouts.roles_for(layout, table.columns)
+            )
+            layouts.remember_roles(layout, table.columns)
+
+        with metrics.measure("clean") as stats:
+            cleaned = SemanticDataCleaner.clean_table(table)
+            if stats is not None:
+                stats.tables_in += 1
+                stats.tables_out += cleaned is not None
+
+        if cleaned is not None:
+            cleaned.rows = metrics.timed_rows("clean", cleaned.rows)
+
+        return cleaned
+
+
+# =========================
+# MODE PARALLÈLE (process pool)
+# =========================
+
+
+def _spill_dir(sheet: RawSheetLike) -> Optional[str]:
+    """
+    Feuille déversée : répertoire du parsing (SpillPolicy.root), qui
+    reçoit aussi les tables intermédiaires ; sinon None.
+    """
+    values = getattr(sheet, "values", None)
+    if isinstance(values, SpilledMatrix):
+        return os.path.dirname(values.directory)
+    return None
+
 
-        raw = ExcelRawLoader.load(self.content)
-        structured = ExcelStructureAnalyzer.analyze(raw)
-        normalized = ExcelNormalizer.normalize(raw, structured)
-        temp_normalize = TemporalUnpivotNormalizer.normalize(normalized)
-        sanitized = ExcelSanitizer.sanitize(temp_normalize)
+def _process_sheet(sheet: RawSheetLike, prescan_rows: Optional[int] = None) -> bytes:
+    """
+    Exécuté dans un process du pool : tables d'une feuille sérialisées
+    sous forme compacte (schéma + UN bloc numpy par table, pas de dicts).
+    Les chaînes répétées (pays, codes) sont partagées par le mémo pickle.
+    Feuille déversée : tables nettoyées déversées à leur tour, seul leur
+    descripteur (SpilledMatrix) remonte au process parent.
+    """
+    tables: List[Tuple[str, List[str], np.ndarray]] = []
+    spill_dir = _spill_dir(sheet)
 
-        semantic = SemanticTableAnalyzer.analyze(sanitized)
+    for table in ExcelParser._iter_tables(sheet, prescan_rows=prescan_rows):
+        columns = table.rows.columns
+        blocks = table.rows.chunks(SemanticDataCleaner.CHUNK_ROWS)
 
-        cleaned_data = SemanticDataCleaner.clean_semantic_document(semantic)
+        if spill_dir is None:
+            tables.append((table.name, columns, np.concatenate(list(blocks))))
+            continue
 
-        raw_facts = []
+        writer = SpillWriter(tempfile.mkdtemp(dir=spill_dir))
+        for block in blocks:
+            writer.append(block)
+        tables.append((table.name, columns, writer.close(len(columns))))
 
-        builder = BlindFactBuilder()
+    return pickle.dumps(tables, protocol=pickle.HIGHEST_PROTOCOL)
 
-        for table in cleaned_data.tables:
-            for row_index, row in enumerate(table.rows):
-                raw_fact = builder.build(
-                    row=row,
-                    source={
-                        "document_id": self.document_id,
-                        "sheet": table.name,
-                        "parser": "excel",
-                    },
-                    row_index=row_index,
-                )
-                raw_facts.append(raw_fact)
 
-        return raw_facts
+def _unpack_tables(payload: bytes) -> Iterator[Tuple[str, TableRows]]:
+    for name, columns, block in pickle.loads(payload):
+        if isinstance(block, SpilledMatrix):
+            chunks = block.iter_blocks(SemanticDataCleaner.CHUNK_ROWS)
+        else:
+            chunks = [block]
+        yield name, TableRows.from_chunks(columns, chunks)
@@ -1,7 +1,11 @@
 import hashlib
 import json
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence
+
+import numpy as np
+import xxhash
+from processing.application.parsers.excel.contracts import TableRows
 
 
 @dataclass(frozen=True)
@@ -13,16 +17,70 @@ class RawFact:
     provenance: Dict[str, Any]
 
 
+# Identité d'un fait : hash du JSON canonique (clés triées) de la ligne.
+# sha256 = ids historiques (déduplication) ; xxh3_128 = identité rapide,
+# non cryptographique.
+FACT_HASHES: Dict[str, Callable[[bytes], str]] = {
+    "sha256": lambda data: hashlib.sha256(data).hexdigest(),
+    "xxh3_128": xxhash.xxh3_128_hexdigest,
+}
+DEFAULT_FACT_HASH = "sha256"
+
+# Mêmes options que json.dumps(sort_keys=True, default=str)
+_encode = json.JSONEncoder(sort_keys=True, default=str).encode
+
+_SCALAR_TYPES = {int, float, bool, type(None)}
+_TEXT_TYPES = {str, type(None)}
+
+
+def canonical_template(columns: Sequence[str]) -> str:
+    """
+    Gabarit "%s" du JSON canonique d'une ligne, clés triées : calculé
+    une fois par table au lieu d'un tri par ligne.
+    Valeurs attendues dans l'ordre de sorted(columns).
+    """
+    fields = (_encode(key).replace("%", "%%") + ": %s" for key in sorted(columns))
+    return "{" + ", ".join(fields) + "}"
+
+
+def encode_column(values: List[Any]) -> List[str]:
+    """
+    Encodage JSON d'une colonne entière, identique valeur par valeur à
+    json.dumps :
+    - colonne numérique : UN appel à l'encodeur C (aucune virgule ne
+      peut apparaître dans un nombre, le découpage est sûr)
+    - colonne texte : une fois par chaîne distincte (pays, codes)
+    - sinon valeur par valeur
+    """
+    types = set(map(type, values))
+
+    if types <= _SCALAR_TYPES:
+        return _encode(values)[1:-1].split(", ") if values else []
+
+    if types <= _TEXT_TYPES:
+        encoded = {v: _encode(v) for v in set(values)}
+        return list(map(encoded.__getitem__, values))
+
+    return list(map(_encode, values))
+
+
 class BlindFactBuilder:
     ENTITY_TYPE = "raw_row"
+    # Lignes hachées par appel en mode table (build_rows)
+    BATCH_ROWS = 2_000
+
+    def __init__(self, hash_name: str = DEFAULT_FACT_HASH):
+        try:
+            self._hash = FACT_HASHES[hash_name]
+        except KeyError:
+            raise ValueError(f"Hash de fait inconnu : {hash_name}") from None
 
-    def build(self, row: dict, source: dict, row_index: int) -> RawFact:
+    def build(self, row: Mapping[str, Any], source: dict, row_index: int) -> RawFact:
+        # dict ou TableRow : copy() rend un dict autonome
         payload = row.copy()
 
         # hash stable = identité du chunk
-        raw_id = hashlib.sha256(
-            json.dumps(payload, sort_keys=True, default=str).encode()
-        ).hexdigest()
+        raw_id = self._hash(json.dumps(payload, sort_keys=True, default=str).encode())
 
         return RawFact(
             entity_type=self.ENTITY_TYPE,
@@ -31,3 +89,60 @@ class BlindFactBuilder:
             payload=payload,
             provenance={"pipeline": "raw_ingestion", "version": "v1"},
         )
+
+    def build_rows(
+        self, rows: TableRows, source: dict, start_index: int = 0
+    ) -> Iterator[RawFact]:
+        """
+        Faits d'une table entière, hachés par blocs de BATCH_ROWS lignes.
+        Mêmes faits (et mêmes ids) que build() ligne par ligne.
+        """
+        for batch in self.iter_batches(rows, source, start_index):
+            yield from batch
+
+    def iter_batches(
+        self, rows: TableRows, source: dict, start_index: int = 0
+    ) -> Iterator[List[RawFact]]:
+        columns = rows.columns
+        template = canonical_template(columns)
+        row_index = start_index
+
+        for block in rows.chunks(self.BATCH_ROWS):
+            yield self.build_batch(columns, block, source, row_index, template)
+            row_index += len(block)
+
+    def build_batch(
+        self,
+        columns: Sequence[str],
+        block: np.ndarray,
+        source: dict,
+        start_index: int = 0,
+        template: Optional[str] = None,
+    ) -> List[RawFact]:
+        """
+        Un bloc de lignes (2D, une colonne par entrée de `columns`) :
+        JSON canonique construit colonne par colonne puis haché.
+        """
+        if template is None:
+            template = canonical_template(columns)
+
+        order = sorted(range(len(columns)), key=columns.__getitem__)
+        encoded = [encode_column(block[:, j].tolist()) for j in order]
+
+        # table sans colonne : "{}" pour chaque ligne
+        encoded_rows = zip(*encoded) if encoded else [()] * len(block)
+        digest = self._hash
+        ids = [digest((template % values).encode()) for values in encoded_rows]
+
+        return [
+            RawFact(
+                entity_type=self.ENTITY_TYPE,
+                entity_id=raw_id,
+                source={**source, "row": row_index},
+                payload=dict(zip(columns, values)),
+                provenance={"pipeline": "raw_ingestion", "version": "v1"},
+            )
+            for row_index, raw_id, values in zip(
+                range(start_index, start_index + len(block)), ids, block.tolist()
+            )
+        ]
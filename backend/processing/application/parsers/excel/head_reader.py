@@ -0,0 +1,322 @@
+import io
+import posixpath
+import time
+import zipfile
+from itertools import islice
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+from xml.etree.ElementTree import ParseError, iterparse, parse
+
+from openpyxl.styles.numbers import (
+    BUILTIN_FORMATS,
+    is_date_format,
+    is_timedelta_format,
+)
+from openpyxl.utils.cell import column_index_from_string, range_boundaries
+from openpyxl.utils.datetime import MAC_EPOCH, WINDOWS_EPOCH, from_excel, from_ISO8601
+from processing.application.parsers.excel.reader_engines import (
+    EngineSheet,
+    ReaderEngines,
+)
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+DOC_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+Source = Union[bytes, IO[bytes]]
+
+
+class XlsxHeadReader:
+    """
+    Lecture des SEULES premières lignes de chaque feuille d'un .xlsx,
+    directement dans le flux XML de l'archive : ni dimensions calculées
+    sur toute la feuille (openpyxl read-only, en l'absence de
+    <dimension>), ni feuille décodée en entier (calamine).
+    Valeurs converties comme openpyxl (nombres, dates selon le style,
+    booléens, chaînes partagées lues à la demande).
+
+    deadline (time.perf_counter) : lecture interrompue une fois dépassée,
+    `truncated` passe alors à True.
+    """
+
+    # Contrôle du budget toutes les N lignes
+    CHECK_EVERY = 50
+
+    def __init__(
+        self, source: Source, head_rows: int, deadline: Optional[float] = None
+    ):
+        if isinstance(source, bytes):
+            source = io.BytesIO(source)
+        self.head_rows = head_rows
+        self.deadline = deadline
+        self.truncated = False
+        self._shared: List[str] = []
+        self._shared_iter: Optional[Iterator[str]] = None
+        self._epoch = WINDOWS_EPOCH
+
+        try:
+            self.archive = zipfile.ZipFile(source)
+            self._workbook_path = self._office_document()
+            self._sheets = self._read_workbook()
+            self._date_styles, self._timedelta_styles = self._read_styles()
+        except (KeyError, ParseError, zipfile.BadZipFile) as exc:
+            raise RuntimeError(f"xlsx head reader failed to load Excel: {exc}") from exc
+
+    # =========================
+    # CLASSEUR
+    # =========================
+
+    def _office_document(self) -> str:
+        for rel in self._parse("_rels/.rels").iter(f"{PKG_REL_NS}Relationship"):
+            if rel.get("Type", "").endswith("/officeDocument"):
+                return rel.get("Target").lstrip("/")
+        return "xl/workbook.xml"
+
+    def _parse(self, path: str):
+        with self.archive.open(path) as stream:
+            return parse(stream).getroot()
+
+    def _part(self, target: str) -> str:
+        if target.startswith("/"):
+            return target.lstrip("/")
+        return posixpath.normpath(
+            posixpath.join(posixpath.dirname(self._workbook_path), target)
+        )
+
+    def _rels(self) -> Dict[str, str]:
+        base, name = posixpath.split(self._workbook_path)
+        rels = self._parse(posixpath.join(base, "_rels", f"{name}.rels"))
+        return {
+            rel.get("Id"): self._part(rel.get("Target"))
+            for rel in rels.iter(f"{PKG_REL_NS}Relationship")
+        }
+
+    def _read_workbook(self) -> List[Tuple[str, str]]:
+        """
+        (nom, chemin dans l'archive) des feuilles, dans l'ordre du classeur.
+        """
+        workbook = self._parse(self._workbook_path)
+        properties = workbook.find(f"{MAIN_NS}workbookPr")
+        if properties is not None and properties.get("date1904") in ("1", "true"):
+            self._epoch = MAC_EPOCH
+
+        rels = self._rels()
+        names = set(self.archive.namelist())
+        sheets = []
+        for sheet in workbook.iter(f"{MAIN_NS}sheet"):
+            path = rels.get(sheet.get(f"{DOC_REL_NS}id"))
+            if path in names:
+                sheets.append((sheet.get("name"), path))
+        return sheets
+
+    def iter_sheets(self) -> Iterator[EngineSheet]:
+        for name, path in self._sheets:
+            if self._expired():
+                self.truncated = True
+                return
+
+            yield self._sheet(name, path)
+
+    def _sheet(self, name: str, path: str) -> EngineSheet:
+        stream = self.archive.open(path)
+        events = iterparse(stream, events=("start", "end"))
+        rows = columns = 0
+
+        # <dimension> précède <sheetData> : lue sans parcourir la feuille
+        for event, element in events:
+            if event == "start" and element.tag == f"{MAIN_NS}dimension":
+                ref = element.get("ref", "")
+                try:
+                    _, _, max_col, max_row = range_boundaries(ref)
+                    rows, columns = max_row or 0, max_col or 0
+                except (TypeError, ValueError):
+                    pass
+            if event == "start" and element.tag == f"{MAIN_NS}sheetData":
+                break
+
+        return EngineSheet(
+            name=name,
+            rows=rows,
+            columns=columns,
+            iter_rows=lambda: self._iter_rows(stream, events),
+        )
+
+    def _expired(self) -> bool:
+        return self.deadline is not None and time.perf_counter() > self.deadline
+
+    # =========================
+    # LIGNES
+    # =========================
+
+    def _iter_rows(self, stream, events) -> Iterator[List[Any]]:
+        try:
+            count = 0
+            for event, element in events:
+                if event != "end" or element.tag != f"{MAIN_NS}row":
+                    continue
+
+                yield self._row(element)
+                element.clear()
+                count += 1
+
+                if count >= self.head_rows:
+                    return
+                if count % self.CHECK_EVERY == 0 and self._expired():
+                    self.truncated = True
+                    return
+        finally:
+            stream.close()
+
+    def _row(self, element) -> List[Any]:
+        row: List[Any] = []
+
+        for cell in element.iter(f"{MAIN_NS}c"):
+            ref = cell.get("r")
+            if ref:
+                column = column_index_from_string(ref.rstrip("0123456789")) - 1
+            else:
+                column = len(row)
+
+            if column >= len(row):
+                row.extend([None] * (column - len(row) + 1))
+            row[column] = self._value(cell)
+
+        return row
+
+    def _value(self, cell) -> Any:
+        data_type = cell.get("t", "n")
+
+        if data_type == "inlineStr":
+            inline = cell.find(f"{MAIN_NS}is")
+            return self._text(inline) if inline is not None else None
+
+        value = cell.findtext(f"{MAIN_NS}v", None) or None
+        if value is None:
+            return None
+
+        if data_type == "n":
+            number = (
+                float(value) if "." in value or "E" in value or "e" in value
+                else int(value)
+            )
+            style = int(cell.get("s", 0))
+            if style in self._date_styles:
+                try:
+                    return from_excel(
+                        number, self._epoch, timedelta=style in self._timedelta_styles
+                    )
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+            return number
+
+        if data_type == "s":
+            return self._shared_string(int(value))
+        if data_type == "b":
+            return bool(int(value))
+        if data_type == "d":
+            return from_ISO8601(value)
+
+        # "str" (résultat de formule), "e" (erreur) : texte tel quel
+        return value
+
+    # =========================
+    # CHAÎNES PARTAGÉES / STYLES
+    # =========================
+
+    @staticmethod
+    def _text(element) -> str:
+        # texte simple ou runs riches, sans les annotations phonétiques
+        parts = [element.findtext(f"{MAIN_NS}t") or ""]
+        runs = element.iter(f"{MAIN_NS}r")
+        parts += [run.findtext(f"{MAIN_NS}t") or "" for run in runs]
+        return "".join(parts)
+
+    def _iter_shared(self) -> Iterator[str]:
+        path = self._part("sharedStrings.xml")
+        if path not in self.archive.namelist():
+            return
+
+        with self.archive.open(path) as stream:
+            for _, element in iterparse(stream):
+                if element.tag == f"{MAIN_NS}si":
+                    yield self._text(element)
+                    element.clear()
+
+    def _shared_string(self, index: int) -> Optional[str]:
+        """
+        Table des chaînes lue jusqu'à l'index demandé seulement : la
+        tête d'une feuille référence les premières chaînes.
+        """
+        if self._shared_iter is None:
+            self._shared_iter = self._iter_shared()
+        if index >= len(self._shared):
+            missing = index + 1 - len(self._shared)
+            self._shared.extend(islice(self._shared_iter, missing))
+        return self._shared[index] if index < len(self._shared) else None
+
+    def _read_styles(self):
+        path = self._part("styles.xml")
+        if path not in self.archive.namelist():
+            return set(), set()
+
+        styles = self._parse(path)
+        formats = dict(BUILTIN_FORMATS)
+        for fmt in styles.iter(f"{MAIN_NS}numFmt"):
+            formats[int(fmt.get("numFmtId"))] = fmt.get("formatCode", "")
+
+        dates: Set[int] = set()
+        timedeltas: Set[int] = set()
+        cell_xfs = styles.find(f"{MAIN_NS}cellXfs")
+        for index, xf in enumerate(cell_xfs if cell_xfs is not None else []):
+            code = formats.get(int(xf.get("numFmtId", 0)), "")
+            if is_date_format(code):
+                dates.add(index)
+            if is_timedelta_format(code):
+                timedeltas.add(index)
+
+        return dates, timedeltas
+
+
+class EngineHeadReader:
+    """
+    Formats sans flux XML exploitable (.xls) : moteur de lecture
+    habituel, lignes tronquées à `head_rows` (classeurs anciens, petits).
+    """
+
+    def __init__(self, content: bytes, head_rows: int):
+        self.content = content
+        self.head_rows = head_rows
+        self.truncated = False
+
+    def iter_sheets(self) -> Iterator[EngineSheet]:
+        engine = ReaderEngines.select(self.content)
+        for sheet in engine.iter_sheets(self.content):
+            yield EngineSheet(
+                name=sheet.name,
+                rows=sheet.rows,
+                columns=sheet.columns,
+                iter_rows=lambda sheet=sheet: self._head(sheet),
+            )
+
+    def _head(self, sheet: EngineSheet) -> Iterator[Any]:
+        return islice(sheet.iter_rows(), self.head_rows)
+
+
+def open_head_reader(
+    source: Source, head_rows: int, deadline: Optional[float] = None
+) -> Union[XlsxHeadReader, EngineHeadReader]:
+    """
+    Lecteur des `head_rows` premières lignes de chaque feuille :
+    XlsxHeadReader pour une archive .xlsx, EngineHeadReader sinon.
+    """
+    if not isinstance(source, bytes):
+        source.seek(0)
+        if zipfile.is_zipfile(source):
+            source.seek(0)
+            return XlsxHeadReader(source, head_rows, deadline)
+        source.seek(0)
+        source = source.read()
+
+    if zipfile.is_zipfile(io.BytesIO(source)):
+        return XlsxHeadReader(source, head_rows, deadline)
+
+    return EngineHeadReader(source, head_rows)
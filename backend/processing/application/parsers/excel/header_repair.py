@@ -1,5 +1,16 @@
+import tempfile
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from processing.application.parsers.excel.contracts import (
+    TableRows,
+    collapse_keys,
+    map_distinct,
+    take_columns,
+)
+from processing.application.parsers.excel.spill import SpillWriter
 
 
 class HeaderRepair:
@@ -53,13 +64,26 @@ def clean_value(v):
 
 
 def is_metadata_row(row: dict) -> bool:
-    str_ratio = sum(isinstance(v, str) for v in row.values()) / max(len(row), 1)
+    return _is_metadata_values(tuple(row.values()))
+
+
+def _is_metadata_values(values: tuple) -> bool:
+    str_ratio = sum(isinstance(v, str) for v in values) / max(len(values), 1)
     return str_ratio > 0.8
 
 
 def infer_type(values):
     nums = sum(isinstance(v, (int, float)) for v in values if v is not None)
-    return "numeric" if nums / max(len(values), 1) > 0.8 else "string"
+    return infer_type_from_counts(nums, len(values))
+
+
+def infer_type_from_counts(numeric: int, non_null: int) -> str:
+    return "numeric" if numeric / max(non_null, 1) > 0.8 else "string"
+
+
+# tests de type élément par élément sur un bloc numpy (boucle C)
+_is_str = np.frompyfunc(lambda v: isinstance(v, str), 1, 1)
+_is_number = np.frompyfunc(lambda v: isinstance(v, (int, float)), 1, 1)
 
 
 # excel/sanitizer/excel_sanitizer.py
@@ -71,7 +95,7 @@ def infer_type(values):
 class SanitizedTable:
     name: str
     columns: List[str]
-    rows: List[Dict[str, Any]]
+    rows: TableRows
     column_types: Dict[str, str]
     confidence: float
 
@@ -85,50 +109,111 @@ from processing.application.parsers.excel.normalizer import ExcelNormalizer
 
 
 class ExcelSanitizer:
+    # Lignes par bloc columnaire (entrée en tuples)
+    CHUNK_ROWS = 2_000
+
     @staticmethod
     def sanitize(doc: ExcelNormalizer) -> SanitizedDocument:
         sanitized_tables = []
 
         for table in doc.tables:
-            # 1️⃣ Normalize + dedupe headers
-            normalized_cols = [normalize_key(c) for c in table.columns]
-            normalized_cols = dedupe(normalized_cols)
-
-            clean_rows = []
-            column_values = {c: [] for c in normalized_cols}
-
-            for row in table.rows:
-                clean_row = {}
-
-                for old_key, new_key in zip(table.columns, normalized_cols):
-                    value = clean_value(row.get(old_key))
-                    clean_row[new_key] = value
-                    if value is not None:
-                        column_values[new_key].append(value)
-
-                # 2️⃣ Drop metadata rows
-                if is_metadata_row(clean_row):
-                    continue
-
-                # 3️⃣ Drop fully empty rows
-                if all(v is None for v in clean_row.values()):
-                    continue
-
-                clean_rows.append(clean_row)
-
-            # 4️⃣ Infer column types
-            column_types = {
-                col: infer_type(vals) for col, vals in column_values.items()
-            }
-
-            sanitized_tables.append(
-                SanitizedTable(
-                    name=table.name,
-                    columns=normalized_cols,
-                    rows=clean_rows,
-                    column_types=column_types,
-                    confidence=table.confidence,
-                )
-            )
+            sanitized = ExcelSanitizer.sanitize_table(table)
+            sanitized.rows.materialize()
+            sanitized_tables.append(sanitized)
 
         return SanitizedDocument(tables=sanitized_tables)
+
+    @staticmethod
+    def sanitize_table(
+        table, prescan_rows: Optional[int] = None, spill_dir: Optional[str] = None
+    ) -> SanitizedTable:
+        """
+        prescan_rows = None : types inférés sur toute la table (matérialisée).
+        prescan_rows = N : mode streaming, types inférés sur les N premières
+        lignes, les suivantes restent paresseuses.
+        spill_dir (feuille déversée, prescan_rows = None) : lignes conservées
+        déversées sur disque pendant l'inférence, relues bloc par bloc.
+        """
+        # 1️⃣ Normalize + dedupe headers
+        normalized_cols = [normalize_key(c) for c in table.columns]
+        normalized_cols = dedupe(normalized_cols)
+        keys, positions = collapse_keys(normalized_cols)
+
+        source = table.rows.positions([table.columns[p] for p in positions])
+        blocks = ExcelSanitizer._iter_sanitized_blocks(table.rows, source)
+
+        # 4️⃣ Infer column types : compteurs, aucune valeur retenue
+        numeric = np.zeros(len(keys), dtype=np.int64)
+        non_null = np.zeros(len(keys), dtype=np.int64)
+        scanned_rows = 0
+        scanned = []
+        writer = None
+        if spill_dir is not None and prescan_rows is None:
+            writer = SpillWriter(tempfile.mkdtemp(dir=spill_dir))
+
+        for cleaned, (is_num, present), kept in blocks:
+            if writer is not None:
+                writer.append(cleaned if kept.all() else cleaned[kept])
+            else:
+                scanned.append((cleaned, kept))
+
+            n = len(cleaned)
+            if prescan_rows is not None:
+                n = min(n, prescan_rows - scanned_rows)
+
+            numeric += is_num[:n].sum(axis=0)
+            non_null += present[:n].sum(axis=0)
+            scanned_rows += n
+
+            if prescan_rows is not None and scanned_rows >= prescan_rows:
+                break
+
+        column_types = {
+            col: infer_type_from_counts(int(numeric[j]), int(non_null[j]))
+            for j, col in enumerate(keys)
+        }
+
+        if writer is not None:
+            spilled = writer.close(len(keys))
+            kept_blocks = spilled.iter_blocks(ExcelSanitizer.CHUNK_ROWS)
+        else:
+            rest = ((cleaned, kept) for cleaned, _, kept in blocks)
+            kept_blocks = (
+                cleaned if kept.all() else cleaned[kept]
+                for cleaned, kept in chain(scanned, rest)
+                if kept.any()
+            )
+
+        return SanitizedTable(
+            name=table.name,
+            columns=normalized_cols,
+            rows=TableRows.from_chunks(keys, kept_blocks),
+            column_types=column_types,
+            confidence=table.confidence,
+        )
+
+    @staticmethod
+    def _iter_sanitized_blocks(
+        rows: TableRows, source: List[Optional[int]]
+    ) -> Iterator[Tuple[np.ndarray, Tuple[np.ndarray, np.ndarray], np.ndarray]]:
+        """
+        Un seul passage par bloc : coercition numérique des chaînes,
+        comptes pour l'inférence de type et masque des lignes conservées.
+        """
+        for block in rows.chunks(ExcelSanitizer.CHUNK_ROWS):
+            cleaned = take_columns(block, source)
+
+            is_str = _is_str(cleaned).astype(bool)
+            if is_str.any():
+                cleaned[is_str] = map_distinct(cleaned[is_str], clean_value)
+
+            present = cleaned != None  # noqa: E711
+            is_str = _is_str(cleaned).astype(bool)
+            is_num = present & _is_number(cleaned).astype(bool)
+
+            width = max(cleaned.shape[1], 1)
+            # 2️⃣ metadata rows / 3️⃣ fully empty rows
+            metadata = is_str.sum(axis=1) / width > 0.8
+            kept = ~metadata & present.any(axis=1)
+
+            yield cleaned, (is_num, present), kept
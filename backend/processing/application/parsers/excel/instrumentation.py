@@ -0,0 +1,216 @@
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from processing.application.parsers.excel.contracts import TableRows
+
+try:
+    import resource
+except ImportError:  # Windows : pas de getrusage, pic mémoire non mesuré
+    resource = None
+
+logger = logging.getLogger("etl.parser")
+
+# Étages du pipeline Excel, dans l'ordre du flux
+STAGES = [
+    "load",
+    "detect",
+    "normalize",
+    "unpivot",
+    "sanitize",
+    "analyze",
+    "clean",
+    "facts",
+]
+
+
+def peak_rss() -> int:
+    """
+    Pic de RSS du process (octets), 0 si non disponible.
+    """
+    if resource is None:
+        return 0
+    # ru_maxrss : Kio sous Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@dataclass
+class StageStats:
+    seconds: float = 0.0
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    tables_in: int = 0
+    tables_out: int = 0
+    # hausse du pic de RSS survenue pendant l'étage
+    peak_rss_delta: int = 0
+
+    @property
+    def tables_dropped(self) -> int:
+        return self.tables_in - self.tables_out
+
+
+class PipelineMetrics:
+    """
+    Chronométrage et comptages par étage d'un parsing.
+
+    Les étages sont des générateurs chaînés : le temps mesuré autour
+    d'un next() inclut celui des étages amont. Une pile de temps
+    "imbriqués" permet de ne compter pour chaque étage que son temps
+    propre. Désactivé, timed() rend l'itérable tel quel et measure()
+    ne fait rien : coût nul sur le flux de données.
+    """
+
+    # Taille des blocs chronométrés (tables lues en tuples)
+    CHUNK_ROWS = 2_000
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stages: Dict[str, StageStats] = {}
+        # compteurs propres à un parser (pages, taux de pages évitées...)
+        self.counters: Dict[str, Any] = {}
+        self._nested: List[float] = []
+        self._peak = peak_rss() if enabled else 0
+        self._started = time.perf_counter()
+
+    def stage(self, name: str) -> StageStats:
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats()
+        return stats
+
+    def count(self, name: str, value: Any) -> None:
+        if self.enabled:
+            self.counters[name] = value
+
+    # =========================
+    # MESURE
+    # =========================
+
+    def _enter(self) -> float:
+        self._nested.append(0.0)
+        return time.perf_counter()
+
+    def _exit(self, stats: StageStats, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        stats.seconds += elapsed - self._nested.pop()
+        if self._nested:
+            self._nested[-1] += elapsed
+
+        peak = peak_rss()
+        if peak > self._peak:
+            stats.peak_rss_delta += peak - self._peak
+            self._peak = peak
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[Optional[StageStats]]:
+        """
+        Appel d'étage (hors flux de lignes) : détection, pré-scan, etc.
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        stats = self.stage(name)
+        start = self._enter()
+        try:
+            yield stats
+        finally:
+            self._exit(stats, start)
+
+    def timed(
+        self,
+        name: str,
+        items: Iterable[Any],
+        count: Callable[[Any], int] = len,
+    ) -> Iterable[Any]:
+        """
+        Flux de sortie d'un étage (blocs, feuilles, faits) : temps propre
+        et lignes produites (count(item)).
+        """
+        if not self.enabled:
+            return items
+        return self._timed(self.stage(name), iter(items), count)
+
+    def timed_rows(self, name: str, rows: TableRows) -> TableRows:
+        """
+        Lignes d'une table (TableRows paresseux) chronométrées bloc par bloc.
+        """
+        if not self.enabled:
+            return rows
+        return TableRows.from_chunks(
+            rows.columns, self.timed(name, rows.chunks(self.CHUNK_ROWS))
+        )
+
+    def _timed(
+        self, stats: StageStats, items: Iterator[Any], count: Callable[[Any], int]
+    ) -> Iterator[Any]:
+        if stats.rows_out is None:
+            stats.rows_out = 0
+
+        while True:
+            start = self._enter()
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            finally:
+                self._exit(stats, start)
+
+            stats.rows_out += count(item)
+            yield item
+
+    # =========================
+    # RAPPORT
+    # =========================
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Vue sérialisable (JSON) : lignes en entrée d'un étage = lignes
+        produites par l'étage de lignes précédent.
+        """
+        stages = {}
+        previous_rows = None
+
+        for name in STAGES + sorted(set(self.stages) - set(STAGES)):
+            stats = self.stages.get(name)
+            if stats is None:
+                continue
+
+            if stats.rows_out is not None:
+                if stats.rows_in is None:
+                    stats.rows_in = previous_rows
+                previous_rows = stats.rows_out
+
+            stages[name] = dict(
+                asdict(stats),
+                seconds=round(stats.seconds, 4),
+                tables_dropped=stats.tables_dropped,
+            )
+
+        report = {
+            "wall_seconds": round(time.perf_counter() - self._started, 4),
+            "stages": stages,
+        }
+        if self.counters:
+            report["counters"] = dict(self.counters)
+        return report
+
+    def log(self, label: str) -> Dict[str, Any]:
+        report = self.report()
+        if not self.enabled:
+            return report
+
+        for name, stats in report["stages"].items():
+            logger.info(
+                f"⏱️ {label} | {name:<9} {stats['seconds']:>8.3f}s "
+                f"rows {stats['rows_in']} → {stats['rows_out']} "
+                f"tables {stats['tables_in']} → {stats['tables_out']} "
+                f"peak +{stats['peak_rss_delta'] // 1024**2} MB"
+            )
+        for name, value in report.get("counters", {}).items():
+            logger.info(f"⏱️ {label} | {name} = {value}")
+        logger.info(f"⏱️ {label} | total {report['wall_seconds']:.3f}s")
+
+        return report
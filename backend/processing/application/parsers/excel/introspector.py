@@ -1,5 +1,7 @@
 import io
+from typing import Any, Optional, Sequence
 
+import numpy as np
 from openpyxl import load_workbook
 from processing.application.parsers.excel.contracts import (
     ExcelIntrospection,
@@ -7,6 +9,121 @@ from processing.application.parsers.excel.contracts import (
 )
 
 
+class SheetStatsCollector:
+    """
+    Statistiques d'introspection calculées ligne par ligne.
+
+    Alimenté par un flux de lignes (aucune matrice en mémoire), il sert
+    à la fois à l'introspection seule et à la lecture unique du raw loader.
+
+    sample_rows : au-delà de N lignes, on ne compte plus les cellules
+    non vides (le ratio est extrapolé sur l'échantillon). Les lignes
+    vides en tête / en fin restent exactes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rows: int,
+        columns: int,
+        sample_rows: Optional[int] = None,
+    ):
+        self.name = name
+        self.rows = rows
+        self.columns = columns
+        self.sample_rows = sample_rows
+
+        self._seen_rows = 0
+        self._sampled_rows = 0
+        self._non_empty = 0
+        self._empty_top = 0
+        self._trailing_empty = 0
+        self._data_seen = False
+
+    @staticmethod
+    def unread(name: str, rows: int, columns: int) -> SheetIntrospection:
+        """
+        Feuille écartée sans lecture : seules les dimensions sont connues.
+        """
+        return SheetIntrospection(
+            name=name,
+            rows=rows,
+            columns=columns,
+            non_empty_ratio=-1.0,
+            merged_cells_count=-1,
+            empty_rows_top=-1,
+            empty_rows_bottom=-1,
+        )
+
+    def add_row(self, values: Sequence[Any]) -> None:
+        if self.sample_rows is None or self._seen_rows < self.sample_rows:
+            count = sum(1 for v in values if v not in (None, ""))
+            self._non_empty += count
+            self._sampled_rows += 1
+            is_empty = count == 0
+        else:
+            is_empty = all(v in (None, "") for v in values)
+
+        self._seen_rows += 1
+
+        if is_empty:
+            self._trailing_empty += 1
+            if not self._data_seen:
+                self._empty_top += 1
+        else:
+            self._trailing_empty = 0
+            self._data_seen = True
+
+    def add_counts(self, counts: np.ndarray) -> None:
+        """
+        Variante vectorisée de add_row : un bloc de lignes décrit par
+        son nombre de cellules non vides par ligne.
+        """
+        n = len(counts)
+        if n == 0:
+            return
+
+        if self.sample_rows is None:
+            sampled = n
+        else:
+            sampled = min(max(self.sample_rows - self._seen_rows, 0), n)
+
+        self._non_empty += int(counts[:sampled].sum())
+        self._sampled_rows += sampled
+        self._seen_rows += n
+
+        filled = np.flatnonzero(counts)
+        if len(filled) == 0:
+            self._trailing_empty += n
+            if not self._data_seen:
+                self._empty_top += n
+            return
+
+        if not self._data_seen:
+            self._empty_top += int(filled[0])
+            self._data_seen = True
+        self._trailing_empty = n - 1 - int(filled[-1])
+
+    def result(self) -> SheetIntrospection:
+        """
+        Statistiques des lignes vues jusqu'ici (lecture complète ou tête).
+        """
+        if self._sampled_rows < self.rows:
+            total_cells = max(self._sampled_rows * self.columns, 1)
+        else:
+            total_cells = max(self.rows * self.columns, 1)
+
+        return SheetIntrospection(
+            name=self.name,
+            rows=self.rows,
+            columns=self.columns,
+            non_empty_ratio=self._non_empty / total_cells,
+            merged_cells_count=-1,  # 🔥 inconnu en read_only
+            empty_rows_top=self._empty_top,
+            empty_rows_bottom=self._trailing_empty,
+        )
+
+
 class ExcelIntrospector:
     """
     Niveau 0 — Introspection
@@ -15,52 +132,29 @@ class ExcelIntrospector:
     """
 
     @staticmethod
-    def inspect(content: bytes) -> ExcelIntrospection:
+    def inspect(
+        content: bytes, stats_sample_rows: Optional[int] = None
+    ) -> ExcelIntrospection:
         wb = load_workbook(io.BytesIO(content), data_only=True, read_only=True)
 
         sheets_meta = []
 
-        for sheet in wb.worksheets:
-            rows = sheet.max_row or 0
-            cols = sheet.max_column or 0
-            total_cells = max(rows * cols, 1)
-
-            non_empty = 0
-            empty_top = 0
-            empty_bottom = 0
-
-            # --- empty rows top
-            for row in sheet.iter_rows():
-                if all(c.value in (None, "") for c in row):
-                    empty_top += 1
-                else:
-                    break
-
-            # --- empty rows bottom (SAFE)
-            all_rows = list(sheet.iter_rows())
-            for row in reversed(all_rows):
-                if all(c.value in (None, "") for c in row):
-                    empty_bottom += 1
-                else:
-                    break
-
-            # --- non empty count
-            for row in all_rows:
-                for cell in row:
-                    if cell.value not in (None, ""):
-                        non_empty += 1
-
-            sheets_meta.append(
-                SheetIntrospection(
+        try:
+            for sheet in wb.worksheets:
+                collector = SheetStatsCollector(
                     name=sheet.title,
-                    rows=rows,
-                    columns=cols,
-                    non_empty_ratio=non_empty / total_cells,
-                    merged_cells_count=-1,  # 🔥 inconnu en read_only
-                    empty_rows_top=empty_top,
-                    empty_rows_bottom=empty_bottom,
+                    rows=sheet.max_row or 0,
+                    columns=sheet.max_column or 0,
+                    sample_rows=stats_sample_rows,
                 )
-            )
+
+                # --- un seul passage en streaming (pas de list(iter_rows()))
+                for values in sheet.iter_rows(values_only=True):
+                    collector.add_row(values)
+
+                sheets_meta.append(collector.result())
+        finally:
+            wb.close()
 
         return ExcelIntrospection(
             file_size=len(content),
@@ -0,0 +1,130 @@
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from processing.application.parsers.excel.semantic_contracts import SemanticColumn
+
+
+@dataclass
+class LayoutEntry:
+    """
+    Mise en page connue : header détecté et rôles sémantiques associés.
+    """
+
+    header_row: int
+    columns: List[str]
+    # rempli au premier passage dans SemanticTableAnalyzer
+    roles: Optional[List[SemanticColumn]] = None
+
+
+class LayoutCache:
+    """
+    Cache des mises en page récurrentes (exports WDI, questionnaires
+    pays, matrice client).
+
+    Empreinte = largeur + nature (texte / nombre / vide) des lignes
+    au-dessus du header + texte exact du header. Les valeurs des lignes
+    de données n'y entrent pas : deux fichiers du même modèle partagent
+    l'empreinte. LRU en mémoire, propre à chaque process.
+    """
+
+    MAX_ENTRIES = 256
+    # Lignes candidates au header examinées lors de la recherche
+    LOOKUP_ROWS = 20
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or self.MAX_ENTRIES
+        self._entries: "OrderedDict[str, LayoutEntry]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        # empreinte trouvée mais rejetée par le contrôle de confiance
+        self.rejected = 0
+
+    # =========================
+    # EMPREINTE
+    # =========================
+
+    @staticmethod
+    def _kind(cell: Any) -> str:
+        if cell is None or cell == "":
+            return "e"
+        if isinstance(cell, str):
+            return "s"
+        return "n"
+
+    @staticmethod
+    def _fingerprint(width: int, kinds: Sequence[str], header: Sequence[Any]) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{width}|{'/'.join(kinds)}|".encode())
+        for cell in header:
+            text = cell.strip() if isinstance(cell, str) else LayoutCache._kind(cell)
+            digest.update(text.encode())
+            digest.update(b"\x1f")
+        return digest.hexdigest()
+
+    @staticmethod
+    def fingerprint(matrix: Sequence[Sequence[Any]], header_row: int) -> str:
+        kinds = [
+            "".join(LayoutCache._kind(c) for c in matrix[r]) for r in range(header_row)
+        ]
+        return LayoutCache._fingerprint(len(matrix[0]), kinds, matrix[header_row])
+
+    # =========================
+    # LECTURE / ÉCRITURE
+    # =========================
+
+    def lookup(
+        self, matrix: Sequence[Sequence[Any]]
+    ) -> Optional[Tuple[str, LayoutEntry]]:
+        """
+        Premier header candidat (lignes 0..LOOKUP_ROWS) dont l'empreinte
+        est connue. Le contrôle de confiance reste à la charge de l'appelant.
+        """
+        if not self._entries or len(matrix) == 0:
+            return None
+
+        width = len(matrix[0])
+        kinds: List[str] = []
+
+        for r in range(min(len(matrix) - 1, self.LOOKUP_ROWS)):
+            fp = self._fingerprint(width, kinds, matrix[r])
+            entry = self._entries.get(fp)
+            if entry is not None and entry.header_row == r:
+                self._entries.move_to_end(fp)
+                return fp, entry
+            kinds.append("".join(self._kind(c) for c in matrix[r]))
+
+        return None
+
+    def store(self, fingerprint: str, entry: LayoutEntry) -> None:
+        self._entries[fingerprint] = entry
+        self._entries.move_to_end(fingerprint)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def roles_for(
+        self, fingerprint: Optional[str], columns: List[str]
+    ) -> Optional[List[SemanticColumn]]:
+        entry = self._entries.get(fingerprint) if fingerprint else None
+        if entry is None or entry.roles is None:
+            return None
+        if [c.name for c in entry.roles] != columns:
+            return None
+        return entry.roles
+
+    def remember_roles(
+        self, fingerprint: Optional[str], roles: List[SemanticColumn]
+    ) -> None:
+        entry = self._entries.get(fingerprint) if fingerprint else None
+        if entry is not None and entry.roles is None:
+            entry.roles = roles
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "rejected": self.rejected,
+        }
@@ -1,16 +1,30 @@
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+
 from processing.application.parsers.excel.contracts import (
+    DetectedTable,
     NormalizedDocument,
     NormalizedTable,
+    RawSheet,
     RawWorkbook,
     StructuredWorkbook,
+    TableRows,
+    collapse_keys,
+    take_columns,
 )
 from processing.application.parsers.excel.introspector import ExcelIntrospection
+from processing.application.parsers.excel.spill import SpilledMatrix
 from processing.application.parsers.excel.structure_analyzer import (
     ExcelStructureAnalyzer,
 )
 
 
 class ExcelNormalizer:
+    # Lignes par bloc columnaire (feuilles numpy)
+    CHUNK_ROWS = 2_000
+
     @staticmethod
     def normalize(
         raw: RawWorkbook, structured: StructuredWorkbook
@@ -19,84 +33,206 @@ class ExcelNormalizer:
         tables = []
 
         for table in structured.tables:
-            sheet = raw.sheets[table.sheet]
-            rows = []
-
-            for r in range(table.data_start_row, table.data_end_row + 1):
-                values = sheet.matrix[r]
-                row_data = {}
-
-                for idx, col in enumerate(table.columns):
-                    row_data[col.lower()] = values[idx] if idx < len(values) else None
-
-                if any(v not in (None, "") for v in row_data.values()):
-                    rows.append(row_data)
-
-            tables.append(
-                NormalizedTable(
-                    name=f"{table.sheet}_table",
-                    columns=[c.lower() for c in table.columns],
-                    rows=rows,
-                    confidence=table.confidence,
-                )
-            )
+            normalized = ExcelNormalizer.normalize_table(raw.sheets[table.sheet], table)
+            normalized.rows.materialize()
+            tables.append(normalized)
 
         return NormalizedDocument(tables=tables)
 
+    @staticmethod
+    def normalize_table(sheet: RawSheet, table: DetectedTable) -> NormalizedTable:
+        """
+        Version paresseuse (streaming) : rows est un générateur de blocs
+        columnaires (feuille numpy) ou de tuples.
+        """
+        columns = [c.lower() for c in table.columns]
+        # doublons (casse) : dernière colonne retenue, comme un dict par ligne
+        keys, positions = collapse_keys(columns)
+
+        if isinstance(sheet.matrix, (np.ndarray, SpilledMatrix)):
+            rows = TableRows.from_chunks(
+                keys, ExcelNormalizer._iter_chunks(sheet.matrix, table, positions)
+            )
+        else:
+            rows = TableRows(
+                keys, ExcelNormalizer._iter_tuples(sheet, table, positions)
+            )
+
+        return NormalizedTable(
+            name=f"{table.sheet}_table",
+            columns=columns,
+            rows=rows,
+            confidence=table.confidence,
+        )
+
+    @staticmethod
+    def normalize_stream(
+        table: DetectedTable, blocks: Iterable[np.ndarray]
+    ) -> NormalizedTable:
+        """
+        Variante sans matrice : blocs de lignes de données (largeurs
+        libres) lus au fil de l'eau, après le header détecté (CSV).
+        """
+        columns = [c.lower() for c in table.columns]
+        keys, positions = collapse_keys(columns)
+
+        return NormalizedTable(
+            name=f"{table.sheet}_table",
+            columns=columns,
+            rows=TableRows.from_chunks(
+                keys, ExcelNormalizer._iter_blocks(blocks, positions)
+            ),
+            confidence=table.confidence,
+        )
+
+    @staticmethod
+    def _iter_chunks(
+        matrix: np.ndarray, table: DetectedTable, positions: List[int]
+    ) -> Iterator[np.ndarray]:
+        """
+        Feuille columnaire : blocs découpés directement dans la matrice.
+        """
+        step = ExcelNormalizer.CHUNK_ROWS
+        blocks = (
+            matrix[start : min(start + step, table.data_end_row + 1)]
+            for start in range(table.data_start_row, table.data_end_row + 1, step)
+        )
+        return ExcelNormalizer._iter_blocks(blocks, positions)
+
+    @staticmethod
+    def _iter_blocks(
+        blocks: Iterable[np.ndarray], positions: List[int]
+    ) -> Iterator[np.ndarray]:
+        """
+        Colonnes du header extraites bloc par bloc, lignes vides écartées
+        par masque.
+        """
+        for block in blocks:
+            width = block.shape[1]
+            block = take_columns(block, [p if p < width else None for p in positions])
+
+            filled = ((block != None) & (block != "")).any(axis=1)  # noqa: E711
+            if filled.all():
+                yield block
+            elif filled.any():
+                yield block[filled]
+
+    @staticmethod
+    def _iter_tuples(
+        sheet: RawSheet, table: DetectedTable, positions: List[int]
+    ) -> Iterator[tuple]:
+        width = len(table.columns)
+        if positions == list(range(width)):
+            pick = None
+        elif len(positions) > 1:
+            pick = itemgetter(*positions)
+        else:
+            pick = lambda values: (values[positions[0]],)  # noqa: E731
+
+        for r in range(table.data_start_row, table.data_end_row + 1):
+            values = sheet.matrix[r]
+            if len(values) < width:
+                values = list(values) + [None] * (width - len(values))
+
+            row = tuple(values[:width]) if pick is None else pick(values)
+
+            if any(v not in (None, "") for v in row):
+                yield row
+
 
 import re
-from typing import List
 
 YEAR_COL_RE = re.compile(r"(19|20)\d{2}")
 
 
 class TemporalUnpivotNormalizer:
+    # Lignes sources dépliées par bloc vectorisé
+    CHUNK_ROWS = 2_000
+
     @staticmethod
     def normalize(doc: NormalizedDocument) -> NormalizedDocument:
         new_tables = []
 
         for table in doc.tables:
-            static_cols = []
-            year_cols = {}
-
-            # 1️⃣ Identifier colonnes statiques vs temporelles
-            for col in table.columns:
-                match = YEAR_COL_RE.search(col)
-                if match:
-                    year = int(match.group())
-                    year_cols[col] = year
-                else:
-                    static_cols.append(col)
+            unpivoted = TemporalUnpivotNormalizer.normalize_table(table)
+            unpivoted.rows.materialize()
+            new_tables.append(unpivoted)
+
+        return NormalizedDocument(tables=new_tables)
+
+    @staticmethod
+    def normalize_table(table: NormalizedTable) -> NormalizedTable:
+        """
+        Version paresseuse (streaming) : rows est un générateur de blocs
+        columnaires.
+        """
+        # 1️⃣ Identifier colonnes statiques vs temporelles
+        year_cols = TemporalUnpivotNormalizer.year_columns(table.columns)
+        static_cols = [col for col in table.columns if col not in year_cols]
+
+        if not year_cols:
+            return table
+
+        static_keys = list(dict.fromkeys(static_cols))
+        keys = list(dict.fromkeys(static_keys + ["year", "value"]))
+
+        return NormalizedTable(
+            name=table.name,
+            columns=static_cols + ["year", "value"],
+            rows=TableRows.from_chunks(
+                keys,
+                TemporalUnpivotNormalizer._iter_chunks(
+                    table.rows, keys, static_keys, year_cols
+                ),
+            ),
+            confidence=table.confidence,
+        )
+
+    @staticmethod
+    def year_columns(columns: List[str]) -> Dict[str, int]:
+        """
+        Colonnes temporelles (libellé contenant une année) → année.
+        """
+        year_cols = {}
+        for col in columns:
+            match = YEAR_COL_RE.search(col)
+            if match:
+                year_cols[col] = int(match.group())
+        return year_cols
 
-            if not year_cols:
-                new_tables.append(table)
+    @staticmethod
+    def _iter_chunks(
+        rows: TableRows,
+        keys: List[str],
+        static_keys: List[str],
+        year_cols: Dict[str, int],
+    ) -> Iterator[np.ndarray]:
+        """
+        Dépliage "melt" vectorisé, bloc par bloc (CHUNK_ROWS lignes
+        sources) : seul le bloc courant et sa sortie sont résidents.
+        """
+        static_pos = rows.positions(static_keys)
+        year_pos = rows.positions(list(year_cols))
+        years = np.array(list(year_cols.values()), dtype=object)
+
+        for block in rows.chunks(TemporalUnpivotNormalizer.CHUNK_ROWS):
+            cells = take_columns(block, year_pos)
+
+            # 2️⃣ Déplier SANS PERTE — ⚠️ ON NE JETTE PAS 0, seulement None
+            row_idx, year_idx = np.nonzero(cells != None)  # noqa: E711
+            if len(row_idx) == 0:
                 continue
 
-            rows = []
-
-            # 2️⃣ Déplier SANS PERTE
-            for row in table.rows:
-                for col, year in year_cols.items():
-                    value = row.get(col)
-
-                    # ⚠️ ON NE JETTE PAS 0
-                    if value is None:
-                        continue
-
-                    new_row = {
-                        **{c: row.get(c) for c in static_cols},
-                        "year": year,
-                        "value": value,
-                    }
-                    rows.append(new_row)
-
-            new_tables.append(
-                NormalizedTable(
-                    name=table.name,
-                    columns=static_cols + ["year", "value"],
-                    rows=rows,
-                    confidence=table.confidence,
-                )
-            )
+            static = take_columns(block, static_pos)[row_idx]
 
-        return NormalizedDocument(tables=new_tables)
+            # même ordre de clés qu'un dict {**statiques, "year", "value"}
+            out = np.empty((len(row_idx), len(keys)), dtype=object)
+            for j, key in enumerate(keys):
+                if key == "year":
+                    out[:, j] = years[year_idx]
+                elif key == "value":
+                    out[:, j] = cells[row_idx, year_idx]
+                else:
+                    out[:, j] = static[:, static_keys.index(key)]
+
+            yield out
@@ -1,8 +1,23 @@
-import io
-from typing import Any, List
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
-from processing.application.parsers.excel.contracts import RawSheet, RawWorkbook
+from openpyxl.cell.cell import ERROR_CODES
+from processing.application.parsers.excel.contracts import (
+    ColumnarRawSheet,
+    ExcelIntrospection,
+    RawSheet,
+    RawWorkbook,
+    SheetIntrospection,
+)
+from processing.application.parsers.excel.introspector import SheetStatsCollector
+from processing.application.parsers.excel.reader_engines import (
+    EngineSheet,
+    ReaderEngines,
+)
+from processing.application.parsers.excel.spill import SpillPolicy
 
 # =========================
 # CONSTANTES TECHNIQUES
@@ -27,31 +42,202 @@ IGNORED_SHEET_NAMES = {
 
 EMPTY_MARKERS = {"...", "na", "n/a", "null", "none", "-", ".."}
 
+# Chaînes lues comme NaN par pd.read_excel (na_values par défaut) :
+# conservées pour que la lecture streaming reste iso-pandas.
+READER_NA_VALUES = {
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+}
+
+RawSheetLike = Union[RawSheet, ColumnarRawSheet]
+
+# Chaînes converties en None dès la lecture
+READER_NULL_STRINGS = READER_NA_VALUES | set(ERROR_CODES)
+
+# type() élément par élément sur un tableau numpy (boucle C)
+_cell_type = np.frompyfunc(type, 1, 1)
+
+# =========================
+# SHEET SELECTION
+# =========================
+
+
+class SheetSelector:
+    """
+    Sélection des feuilles AVANT parsing :
+    - noms ignorés (IGNORED_SHEET_NAMES) → jamais lues
+    - dimensions déclarées trop petites pour un header + des données
+    - tête de feuille quasi vide (introspection) → lecture interrompue
+    """
+
+    MIN_ROWS = 2
+    MIN_COLUMNS = 2
+    # Seuil bas : une cellule isolée loin à droite gonfle les dimensions
+    MIN_NON_EMPTY_RATIO = 0.001
+    HEAD_ROWS = 1_000
+
+    @staticmethod
+    def is_ignored(sheet_name: str) -> bool:
+        normalized = sheet_name.strip().lower()
+        return normalized in IGNORED_SHEET_NAMES
+
+    @staticmethod
+    def has_tabular_dimensions(rows: int, columns: int) -> bool:
+        # Dimensions absentes (0) ou "A1" (écrit par défaut par certains
+        # générateurs) : non fiables, on ne conclut pas.
+        if rows * columns <= 1:
+            return True
+        return rows >= SheetSelector.MIN_ROWS and columns >= SheetSelector.MIN_COLUMNS
+
+    @staticmethod
+    def looks_tabular(meta: SheetIntrospection) -> bool:
+        return meta.non_empty_ratio >= SheetSelector.MIN_NON_EMPTY_RATIO
+
+    @staticmethod
+    def should_read(sheet_name: str, rows: int, columns: int) -> bool:
+        return not SheetSelector.is_ignored(
+            sheet_name
+        ) and SheetSelector.has_tabular_dimensions(rows, columns)
+
+
 # =========================
 # RAW LOADER
 # =========================
 
 
+# =========================
+# BOOLÉENS / ENTIERS (iso pandas)
+# =========================
+
+
+class BoolIntUnifier:
+    """
+    pd.read_excel(dtype=object) ramène, colonne par colonne, les valeurs
+    égales en Python (True / 1, False / 0) à la forme de leur première
+    occurrence : un TRUE dans une colonne numérique devient 1, un 1 dans
+    une colonne booléenne devient True.
+    Première occurrence mémorisée par (colonne, valeur) d'un bloc de
+    lignes à l'autre : une instance par feuille.
+    """
+
+    def __init__(self):
+        self._first = {}
+
+    def apply_block(
+        self, block: np.ndarray, types: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Bloc 2D (dtype=object), modifié en place. types : type de chaque
+        cellule (même forme), recalculé si absent.
+        """
+        if not block.size:
+            return block
+
+        if types is None:
+            types = _cell_type(block)
+        candidates = (types == bool).astype(bool)  # noqa: E721
+        ints = (types == int).astype(bool)  # noqa: E721
+        if ints.any():
+            values = block[ints]
+            candidates[ints] = (values == 0) | (values == 1)
+
+        for j in np.flatnonzero(candidates.any(axis=0)):
+            rows = np.flatnonzero(candidates[:, j])
+            values = block[rows, j]
+            for value in (False, True):
+                members = rows[values == value]
+                if len(members):
+                    block[members, j] = self._first.setdefault(
+                        (j, value), block[members[0], j]
+                    )
+
+        return block
+
+    def apply_row(self, row: List[Any]) -> List[Any]:
+        """
+        Variante ligne à ligne (matrice List[List[Any]]), en place.
+        """
+        for j, cell in enumerate(row):
+            if type(cell) in (bool, int) and cell in (0, 1):
+                row[j] = self._first.setdefault((j, bool(cell)), cell)
+        return row
+
+
 class ExcelRawLoader:
     """
     Parsing brut tolérant (ET – niveau 0).
 
     Responsabilités (Google-grade) :
-    - Lecture Excel (I/O)
-    - Conversion Pandas → Python natif
+    - Lecture Excel (I/O) en UN SEUL passage, moteur au choix
+      (openpyxl streaming, calamine — voir ReaderEngines)
+    - Statistiques d'introspection calculées pendant la lecture
+    - Conversion cellules → Python natif (iso pd.read_excel, y compris
+      booléens / entiers d'une même colonne, BoolIntUnifier)
     - Normalisation TECHNIQUE des strings
     - Suppression UNIQUEMENT des lignes 100 % vides
     - ZÉRO interprétation métier
     """
 
+    COLUMNAR_BLOCK_ROWS = 10_000
+
     # -------------------------------------------------
     # SHEET FILTER
     # -------------------------------------------------
 
     @staticmethod
     def _should_ignore_sheet(sheet_name: str) -> bool:
-        normalized = sheet_name.strip().lower()
-        return normalized in IGNORED_SHEET_NAMES
+        return SheetSelector.is_ignored(sheet_name)
+
+    # -------------------------------------------------
+    # CELL CONVERSION (iso pandas)
+    # -------------------------------------------------
+
+    @staticmethod
+    def _convert_cell(value: Any) -> Any:
+        """
+        Reproduit la conversion de pd.read_excel(engine="openpyxl") :
+        - float entier → int
+        - cellules en erreur et na_values par défaut → None
+        - date seule (calamine) → datetime à minuit (comme openpyxl)
+        Booléens / entiers d'une même colonne : voir BoolIntUnifier.
+        """
+        if isinstance(value, float):
+            return int(value) if value.is_integer() else value
+
+        if type(value) is date:
+            return datetime(value.year, value.month, value.day)
+
+        if isinstance(value, str) and value in READER_NULL_STRINGS:
+            return None
+
+        return value
+
+    @staticmethod
+    def _data_width(values: Sequence[Any]) -> int:
+        """
+        Largeur utile d'une ligne brute (cellules vides de fin ignorées).
+        """
+        width = len(values)
+        while width and values[width - 1] in (None, ""):
+            width -= 1
+        return width
 
     # -------------------------------------------------
     # STRING NORMALIZATION (TECHNIQUE)
@@ -100,49 +286,322 @@ class ExcelRawLoader:
         return cleaned_rows
 
     # -------------------------------------------------
-    # MAIN LOADER
+    # COLUMNAR NORMALIZATION (VECTORISÉE)
     # -------------------------------------------------
 
     @staticmethod
-    def load(content: bytes) -> RawWorkbook:
+    def _normalize_block(
+        block: np.ndarray, unifier: Optional[BoolIntUnifier] = None
+    ) -> np.ndarray:
         """
-        Point d’entrée unique.
+        Équivalent vectorisé de _convert_cell + _normalize_string,
+        appliqué en place sur un bloc 2D (dtype=object).
+        unifier : booléens / entiers ramenés à la forme de la feuille.
         """
-        try:
-            dfs = pd.read_excel(
-                io.BytesIO(content),
-                sheet_name=None,
-                header=None,
-                dtype=object,
-                engine="openpyxl",
+        flat = block.reshape(-1)
+        types = _cell_type(flat)
+
+        # float entier → int (iso pandas)
+        float_idx = np.flatnonzero(types == float)  # noqa: E721
+        if len(float_idx):
+            floats = flat[float_idx].astype(np.float64)
+            integral = np.isfinite(floats) & (floats == np.floor(floats))
+            safe = integral & (np.abs(floats) < 2**63)
+            flat[float_idx[safe]] = floats[safe].astype(np.int64).tolist()
+            for idx in float_idx[integral & ~safe]:
+                flat[idx] = int(flat[idx])
+
+        if unifier is not None:
+            converted = types.copy()
+            if len(float_idx):
+                converted[float_idx[integral]] = int
+            unifier.apply_block(block, converted.reshape(block.shape))
+
+        # date seule (calamine) → datetime à minuit (iso openpyxl)
+        for idx in np.flatnonzero(types == date):
+            day = flat[idx]
+            flat[idx] = datetime(day.year, day.month, day.day)
+
+        # strings : na_values, invisibles, trim, marqueurs vides
+        str_idx = np.flatnonzero(types == str)  # noqa: E721
+        if len(str_idx):
+            raw = pd.Series(flat[str_idx], dtype=object)
+            cleaned = (
+                raw.str.replace("\xa0", " ", regex=False)
+                .str.replace("\u200b", "", regex=False)
+                .str.strip()
             )
-        except Exception as exc:
-            raise RuntimeError(f"Pandas failed to load Excel: {exc}") from exc
+            to_none = (
+                raw.isin(READER_NULL_STRINGS)
+                | cleaned.eq("")
+                | cleaned.str.lower().isin(EMPTY_MARKERS)
+            )
+            values = cleaned.to_numpy(dtype=object)
+            values[to_none.to_numpy()] = None
+            flat[str_idx] = values
 
-        sheets = {}
+        return block
 
-        for sheet_name, df in dfs.items():
-            if ExcelRawLoader._should_ignore_sheet(sheet_name):
-                continue
+    @staticmethod
+    def normalize_rows(rows: List[Sequence[Any]]) -> np.ndarray:
+        """
+        Lignes brutes (listes de cellules, largeurs variables) → bloc 2D
+        normalisé comme une feuille columnaire (lignes vides conservées).
+        """
+        return ExcelRawLoader._normalize_block(ExcelRawLoader._to_block(rows))
 
-            # Pandas → Python (NaN → None)
-            matrix = df.where(pd.notnull(df), None).values.tolist()
+    @staticmethod
+    def _to_block(rows: List[Sequence[Any]]) -> np.ndarray:
+        width = max((len(r) for r in rows), default=0)
+        block = np.full((len(rows), width), None, dtype=object)
+        for i, values in enumerate(rows):
+            block[i, : len(values)] = values
+        return block
+
+    @staticmethod
+    def _fit_width(block: np.ndarray, width: int) -> np.ndarray:
+        if block.shape[1] >= width:
+            return block[:, :width]
+        padding = np.full((block.shape[0], width - block.shape[1]), None, dtype=object)
+        return np.hstack([block, padding])
+
+    # -------------------------------------------------
+    # SHEET READERS
+    # -------------------------------------------------
+
+    @staticmethod
+    def _read_sheet(
+        sheet: EngineSheet, collector: SheetStatsCollector
+    ) -> Optional[RawSheet]:
+        """
+        Lecture ligne à ligne → matrice List[List[Any]].
+        """
+        matrix = []
+        width = 0
+        unifier = BoolIntUnifier()
+
+        for index, values in enumerate(sheet.iter_rows()):
+            if index == SheetSelector.HEAD_ROWS and not SheetSelector.looks_tabular(
+                collector.result()
+            ):
+                return None
+
+            collector.add_row(values)
+
+            row_width = ExcelRawLoader._data_width(values)
+            width = max(width, row_width)
 
             # Normalisation TECHNIQUE cellule par cellule
-            matrix = [
-                [ExcelRawLoader._normalize_string(cell) for cell in row]
-                for row in matrix
+            row = [
+                ExcelRawLoader._normalize_string(ExcelRawLoader._convert_cell(cell))
+                for cell in values[:row_width]
             ]
 
+            unifier.apply_row(row)
+
+            # Suppression des lignes 100 % vides
+            if any(cell is not None for cell in row):
+                matrix.append(row)
+
+        if not matrix or not SheetSelector.looks_tabular(collector.result()):
+            return None
+
+        # Matrice rectangulaire (largeur max, comme pandas)
+        for row in matrix:
+            row.extend([None] * (width - len(row)))
+
+        return RawSheet(name=sheet.name, matrix=matrix)
+
+    @staticmethod
+    def _read_columnar_sheet(
+        sheet: EngineSheet,
+        collector: SheetStatsCollector,
+        spill: Optional[SpillPolicy] = None,
+    ) -> Optional[ColumnarRawSheet]:
+        """
+        Lecture par blocs de lignes → matrice numpy (dtype=object).
+        Statistiques, normalisation et filtre des lignes vides sont
+        calculés par bloc, colonne par colonne.
+
+        spill : au-delà du seuil de la politique (dimensions déclarées,
+        sinon lignes lues × largeur), blocs écrits sur disque au fil de
+        la lecture et matrice rendue en SpilledMatrix.
+        """
+        blocks = []
+        kept_rows = 0
+        width = 0
+        writer = None
+        unifier = BoolIntUnifier()
+        if spill is not None and spill.should_spill(sheet.rows, sheet.columns):
+            writer = spill.writer()
+        rows_iter = sheet.iter_rows()
+
+        # 1er bloc = tête de feuille, contrôlée avant de lire la suite
+        block_rows = SheetSelector.HEAD_ROWS
+
+        while True:
+            rows = list(islice(rows_iter, block_rows))
+            if not rows:
+                break
+
+            block = ExcelRawLoader._to_block(rows)
+            del rows
+
+            # cellules "présentes" au sens pandas (None / "" exclus)
+            present = (block != None) & (block != "")  # noqa: E711
+            counts = present.sum(axis=1)
+            collector.add_counts(counts)
+
+            if block.shape[1]:
+                last = block.shape[1] - np.argmax(present[:, ::-1], axis=1)
+                width = max(width, int(np.where(counts > 0, last, 0).max()))
+
+            block = ExcelRawLoader._normalize_block(block, unifier)
+
             # Suppression des lignes 100 % vides
-            matrix = ExcelRawLoader._drop_fully_empty_rows(matrix)
+            keep = (block != None).any(axis=1)  # noqa: E711
+            if keep.any():
+                kept = block if keep.all() else block[keep]
+                kept_rows += len(kept)
+
+                # dimensions déclarées absentes ou fausses : bascule en cours
+                # de lecture, blocs déjà lus déversés en premier
+                if writer is None and spill is not None:
+                    if spill.should_spill(kept_rows, width):
+                        writer = spill.writer()
+                        for previous in blocks:
+                            writer.append(previous)
+                        blocks = []
+
+                if writer is None:
+                    blocks.append(kept)
+                else:
+                    writer.append(kept)
+
+            if block_rows == SheetSelector.HEAD_ROWS:
+                if not SheetSelector.looks_tabular(collector.result()):
+                    return None
+                block_rows = ExcelRawLoader.COLUMNAR_BLOCK_ROWS
 
-            if not matrix:
+        if not kept_rows or width == 0:
+            return None
+
+        if writer is not None:
+            return ColumnarRawSheet(name=sheet.name, values=writer.close(width))
+
+        values = np.concatenate(
+            [ExcelRawLoader._fit_width(b, width) for b in blocks], axis=0
+        )
+
+        return ColumnarRawSheet(name=sheet.name, values=values)
+
+    # -------------------------------------------------
+    # MAIN LOADER
+    # -------------------------------------------------
+
+    @staticmethod
+    def load(
+        content: bytes, columnar: bool = False, engine: Optional[str] = None
+    ) -> RawWorkbook:
+        """
+        Point d’entrée unique.
+        """
+        _, raw = ExcelRawLoader.load_with_introspection(
+            content, columnar=columnar, engine=engine
+        )
+        return raw
+
+    @staticmethod
+    def load_with_introspection(
+        content: bytes,
+        stats_sample_rows: Optional[int] = None,
+        columnar: bool = False,
+        engine: Optional[str] = None,
+    ) -> Tuple[ExcelIntrospection, RawWorkbook]:
+        """
+        Lecture unique du classeur : chaque feuille est parcourue UNE fois
+        et alimente à la fois l'introspection (niveau 0) et la matrice brute.
+
+        stats_sample_rows : échantillonnage des statistiques sur les
+        feuilles volumineuses (voir SheetStatsCollector).
+        columnar : matrices ColumnarRawSheet (numpy) au lieu de listes.
+        engine : moteur de lecture (voir ReaderEngines.select).
+        """
+        sheets_meta = []
+        sheets = {}
+
+        for meta, sheet in ExcelRawLoader.iter_sheets(
+            content,
+            stats_sample_rows=stats_sample_rows,
+            columnar=columnar,
+            engine=engine,
+        ):
+            sheets_meta.append(meta)
+            if sheet is not None:
+                sheets[sheet.name] = sheet
+
+        introspection = ExcelIntrospection(
+            file_size=len(content),
+            sheets=sheets_meta,
+        )
+
+        return introspection, RawWorkbook(sheets=sheets)
+
+    @staticmethod
+    def iter_sheets(
+        content: bytes,
+        stats_sample_rows: Optional[int] = None,
+        columnar: bool = False,
+        engine: Optional[str] = None,
+        spill: Optional[SpillPolicy] = None,
+    ) -> Iterator[Tuple[SheetIntrospection, Optional[RawSheetLike]]]:
+        """
+        Lecture paresseuse, UNE feuille à la fois : la mémoire est bornée
+        par la plus grosse feuille retenue, pas par le classeur.
+
+        Les feuilles écartées par SheetSelector ne sont jamais parsées
+        (sheet = None, statistiques inconnues = -1).
+
+        spill (mode columnaire) : feuilles dépassant le seuil de la
+        politique déversées sur disque (SpilledMatrix).
+        """
+        reader = ReaderEngines.select(content, engine)
+
+        yield from ExcelRawLoader.read_sheets(
+            reader.iter_sheets(content),
+            stats_sample_rows=stats_sample_rows,
+            columnar=columnar,
+            spill=spill,
+        )
+
+    @staticmethod
+    def read_sheets(
+        sources: Iterable[EngineSheet],
+        stats_sample_rows: Optional[int] = None,
+        columnar: bool = False,
+        spill: Optional[SpillPolicy] = None,
+    ) -> Iterator[Tuple[SheetIntrospection, Optional[RawSheetLike]]]:
+        """
+        Sélection + lecture de feuilles déjà ouvertes par un moteur
+        (ReaderEngines, ou tête de feuille seule pour l'aperçu).
+        """
+        for source in sources:
+            rows, columns = source.rows, source.columns
+
+            if not SheetSelector.should_read(source.name, rows, columns):
+                yield SheetStatsCollector.unread(source.name, rows, columns), None
                 continue
 
-            sheets[sheet_name] = RawSheet(
-                name=sheet_name,
-                matrix=matrix,
+            collector = SheetStatsCollector(
+                name=source.name,
+                rows=rows,
+                columns=columns,
+                sample_rows=stats_sample_rows,
             )
 
-        return RawWorkbook(sheets=sheets)
+            if columnar:
+                sheet = ExcelRawLoader._read_columnar_sheet(source, collector, spill)
+            else:
+                sheet = ExcelRawLoader._read_sheet(source, collector)
+
+            yield collector.result(), sheet
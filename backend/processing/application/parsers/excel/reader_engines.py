@@ -0,0 +1,176 @@
+import importlib.util
+import io
+from typing import Any, Callable, Iterator, Optional, Sequence, Tuple
+
+from openpyxl import load_workbook
+
+# Signature OLE2 (classeurs .xls Excel 97-2003)
+OLE2_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+
+class EngineSheet:
+    """
+    Feuille exposée par un moteur de lecture : dimensions déclarées
+    (lues sans parcourir la feuille) + flux de lignes à la demande.
+    """
+
+    __slots__ = ("name", "rows", "columns", "_iter_rows")
+
+    def __init__(
+        self,
+        name: str,
+        rows: int,
+        columns: int,
+        iter_rows: Callable[[], Iterator[Sequence[Any]]],
+    ):
+        self.name = name
+        self.rows = rows
+        self.columns = columns
+        self._iter_rows = iter_rows
+
+    def iter_rows(self) -> Iterator[Sequence[Any]]:
+        return self._iter_rows()
+
+
+class OpenpyxlEngine:
+    """
+    Lecture streaming openpyxl (read-only) : mémoire bornée par la ligne
+    courante, mais conversion XML → Python en pur Python (lent).
+    xlsx / xlsm uniquement.
+    """
+
+    name = "openpyxl"
+
+    @staticmethod
+    def is_available() -> bool:
+        return True
+
+    @staticmethod
+    def iter_sheets(content: bytes) -> Iterator[EngineSheet]:
+        try:
+            wb = load_workbook(
+                io.BytesIO(content), read_only=True, data_only=True, keep_links=False
+            )
+        except Exception as exc:
+            raise RuntimeError(f"openpyxl failed to load Excel: {exc}") from exc
+
+        try:
+            for ws in wb.worksheets:
+                yield EngineSheet(
+                    name=ws.title,
+                    rows=ws.max_row or 0,
+                    columns=ws.max_column or 0,
+                    iter_rows=lambda ws=ws: OpenpyxlEngine._iter_rows(ws),
+                )
+        finally:
+            wb.close()
+
+    @staticmethod
+    def _iter_rows(ws) -> Iterator[Sequence[Any]]:
+        # Dimensions déclarées parfois fausses : on lit tout (comme pandas)
+        ws.reset_dimensions()
+        return ws.iter_rows(values_only=True)
+
+
+class CalamineEngine:
+    """
+    Lecture via calamine (Rust, paquet python-calamine) : nettement plus
+    rapide qu'openpyxl, lit aussi les .xls / .xlsb / .ods. La feuille
+    courante est décodée en une fois (mémoire bornée par la feuille,
+    comme la matrice columnaire qui en est construite).
+
+    Dépendance optionnelle : importée à l'usage.
+    """
+
+    name = "calamine"
+
+    @staticmethod
+    def is_available() -> bool:
+        return importlib.util.find_spec("python_calamine") is not None
+
+    @staticmethod
+    def iter_sheets(content: bytes) -> Iterator[EngineSheet]:
+        try:
+            from python_calamine import CalamineWorkbook
+        except ImportError as exc:
+            raise RuntimeError(
+                "python-calamine is required to read this workbook "
+                "(legacy .xls or EXCEL_READER_ENGINE=calamine)"
+            ) from exc
+
+        try:
+            wb = CalamineWorkbook.from_filelike(io.BytesIO(content))
+        except Exception as exc:
+            raise RuntimeError(f"calamine failed to load Excel: {exc}") from exc
+
+        for name in wb.sheet_names:
+            sheet = wb.get_sheet_by_name(name)
+            rows, columns = CalamineEngine._dimensions(sheet)
+            yield EngineSheet(
+                name=name,
+                rows=rows,
+                columns=columns,
+                iter_rows=lambda sheet=sheet: CalamineEngine._iter_rows(sheet),
+            )
+
+    @staticmethod
+    def _dimensions(sheet) -> Tuple[int, int]:
+        """
+        Dimensions au sens openpyxl (max_row / max_column) : dernière
+        cellule utilisée + 1, zone vide de tête comprise. total_height /
+        total_width sont des indices (0-basés), pas des nombres.
+        """
+        if sheet.end is None:
+            return 0, 0
+        last_row, last_column = sheet.end
+        return last_row + 1, last_column + 1
+
+    @staticmethod
+    def _iter_rows(sheet) -> Iterator[Sequence[Any]]:
+        # skip_empty_area=False : lignes / colonnes vides de tête conservées,
+        # indices de lignes identiques à openpyxl
+        return iter(sheet.to_python(skip_empty_area=False))
+
+
+class ReaderEngines:
+    """
+    Choix du moteur de lecture :
+    - "openpyxl" / "calamine" : forcé (configuration)
+    - "auto" : calamine pour les .xls (openpyxl ne les lit pas) et pour
+      les fichiers ≥ CALAMINE_MIN_BYTES s'il est installé, openpyxl sinon
+    """
+
+    ENGINES = {
+        OpenpyxlEngine.name: OpenpyxlEngine,
+        CalamineEngine.name: CalamineEngine,
+    }
+    AUTO = "auto"
+    # En dessous, le coût de lecture reste négligeable devant l'analyse
+    CALAMINE_MIN_BYTES = 1024**2
+
+    @staticmethod
+    def is_legacy_xls(content: bytes) -> bool:
+        return content[: len(OLE2_MAGIC)] == OLE2_MAGIC
+
+    @staticmethod
+    def select(content: bytes, engine: Optional[str] = None):
+        engine = engine or ReaderEngines.AUTO
+
+        if engine != ReaderEngines.AUTO:
+            try:
+                return ReaderEngines.ENGINES[engine]
+            except KeyError:
+                raise ValueError(
+                    f"Moteur de lecture Excel inconnu : {engine}"
+                ) from None
+
+        if ReaderEngines.is_legacy_xls(content):
+            return CalamineEngine
+
+        if (
+            len(content) >= ReaderEngines.CALAMINE_MIN_BYTES
+            and CalamineEngine.is_available()
+        ):
+            return CalamineEngine
+
+        return OpenpyxlEngine
@@ -1,7 +1,10 @@
 import re
-from typing import List
+from typing import List, Optional
 
-from processing.application.parsers.excel.header_repair import SanitizedDocument
+from processing.application.parsers.excel.header_repair import (
+    SanitizedDocument,
+    SanitizedTable,
+)
 from processing.application.parsers.excel.semantic_contracts import (
     SemanticColumn,
     SemanticDocument,
@@ -23,22 +26,34 @@ class SemanticTableAnalyzer:
         semantic_tables = []
 
         for table in doc.tables:
+            semantic_tables.append(SemanticTableAnalyzer.analyze_table(table))
+
+        return SemanticDocument(tables=semantic_tables)
+
+    @staticmethod
+    def analyze_table(
+        table: SanitizedTable, roles: Optional[List[SemanticColumn]] = None
+    ) -> SemanticTable:
+        """
+        Rôles déduits des seuls noms de colonnes : rows transmis tel quel
+        (liste ou générateur). roles : rôles déjà connus (mise en page en
+        cache), repris tels quels s'ils portent sur les mêmes colonnes.
+        """
+        if roles is not None and [c.name for c in roles] == table.columns:
+            semantic_columns = list(roles)
+        else:
             semantic_columns = []
 
             for col in table.columns:
                 role, year = SemanticTableAnalyzer._infer_role(col, table)
                 semantic_columns.append(SemanticColumn(name=col, role=role, year=year))
 
-            semantic_tables.append(
-                SemanticTable(
-                    name=table.name,
-                    columns=semantic_columns,
-                    rows=table.rows,
-                    confidence=table.confidence,
-                )
-            )
-
-        return SemanticDocument(tables=semantic_tables)
+        return SemanticTable(
+            name=table.name,
+            columns=semantic_columns,
+            rows=table.rows,
+            confidence=table.confidence,
+        )
 
     @staticmethod
     def _infer_role(column: str, table) -> tuple[str, int | None]:
@@ -19,14 +19,16 @@ class SemanticColumn:
 
 
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import List
+
+from processing.application.parsers.excel.contracts import TableRows
 
 
 @dataclass
 class SemanticTable:
     name: str
     columns: List[SemanticColumn]
-    rows: List[Dict[str, Any]]
+    rows: TableRows
     confidence: float
 
 
@@ -1,5 +1,11 @@
 import logging
 
+from processing.application.parsers.excel.contracts import (
+    TableRows,
+    collapse_keys,
+    map_distinct,
+    take_columns,
+)
 from processing.application.parsers.excel.semantic_contracts import (
     SemanticColumn,
     SemanticDocument,
@@ -9,7 +15,8 @@ from processing.application.parsers.excel.semantic_contracts import (
 logger = logging.getLogger("etl.service")
 import logging
 import re
-from typing import Any, Dict, List
+from itertools import chain
+from typing import Any, Callable, Dict, Iterator, List
 
 import numpy as np
 
@@ -21,6 +28,13 @@ REQUIRED_ROLES = {"country", "indicator", "year_value"}
 MIN_NON_NULL_RATIO = 0.8
 MIN_ROWS_PER_TABLE = 5
 
+MISSING_YEAR_VALUES = {"..", "...", "NA", "N/A", "#N/A", "", "-", "--", "NaN", "nan"}
+NON_NUMERIC_RE = re.compile(r"[^\d.-]")
+
+# tests de type élément par élément sur une colonne numpy (boucle C)
+_is_str = np.frompyfunc(lambda v: isinstance(v, str), 1, 1)
+_is_number = np.frompyfunc(lambda v: isinstance(v, (int, float)), 1, 1)
+
 
 class SemanticDataCleaner:
     """
@@ -29,6 +43,9 @@ class SemanticDataCleaner:
     aux exigences client.
     """
 
+    # Lignes par bloc columnaire (entrée en tuples)
+    CHUNK_ROWS = 2_000
+
     # ================================
     # API PRINCIPALE
     # ================================
@@ -50,20 +67,34 @@ class SemanticDataCleaner:
 
     @staticmethod
     def _clean_semantic_table(table: "SemanticTable") -> "SemanticTable | None":
-        cleaned_rows = []
+        cleaned_table = SemanticDataCleaner.clean_table(table)
 
-        for row in table.rows:
-            cleaned_row = SemanticDataCleaner._clean_row(row, table.columns)
+        if cleaned_table:
+            cleaned_table.rows.materialize()
 
-            if not SemanticDataCleaner._is_valid_row(cleaned_row, table.columns):
-                continue
+        return cleaned_table
+
+    @staticmethod
+    def clean_table(table: "SemanticTable") -> "SemanticTable | None":
+        """
+        Version paresseuse (streaming) : seuls les blocs nécessaires pour
+        réunir MIN_ROWS_PER_TABLE lignes valides sont lus d'avance pour
+        décider du sort de la table ; la suite reste un générateur.
+        """
+        # doublons de noms : dernière colonne retenue, comme un dict par ligne
+        keys, positions = collapse_keys([col.name for col in table.columns])
+        columns = [table.columns[p] for p in positions]
 
-            if not SemanticDataCleaner._has_enough_data(cleaned_row):
-                continue
+        cleaned_blocks = SemanticDataCleaner._iter_valid_blocks(table, keys, columns)
 
-            cleaned_rows.append(cleaned_row)
+        head, head_rows = [], 0
+        for block in cleaned_blocks:
+            head.append(block)
+            head_rows += len(block)
+            if head_rows >= MIN_ROWS_PER_TABLE:
+                break
 
-        if len(cleaned_rows) < MIN_ROWS_PER_TABLE:
+        if head_rows < MIN_ROWS_PER_TABLE:
             logger.warning(
                 f"Table '{table.name}' ignorée (trop peu de lignes exploitables)"
             )
@@ -72,48 +103,101 @@ class SemanticDataCleaner:
         return SemanticTable(
             name=table.name,
             columns=table.columns,
-            rows=cleaned_rows,
+            rows=TableRows.from_chunks(keys, chain(head, cleaned_blocks)),
             confidence=table.confidence,
         )
 
+    @staticmethod
+    def _iter_valid_blocks(
+        table: "SemanticTable", keys: List[str], columns: list["SemanticColumn"]
+    ) -> Iterator[np.ndarray]:
+        positions = table.rows.positions(keys)
+        cleaners = [SemanticDataCleaner._compile_cleaner(col) for col in columns]
+        required = [j for j, col in enumerate(columns) if col.role in REQUIRED_ROLES]
+
+        for block in table.rows.chunks(SemanticDataCleaner.CHUNK_ROWS):
+            block = take_columns(block, positions)
+            cleaned = np.empty(block.shape, dtype=object)
+
+            for j, clean in enumerate(cleaners):
+                cleaned[:, j] = clean(block[:, j])
+
+            mask = SemanticDataCleaner._valid_rows_mask(cleaned, required)
+            if mask.all():
+                yield cleaned
+            elif mask.any():
+                yield cleaned[mask]
+
     # ================================
-    # ROW LEVEL
+    # ROW LEVEL (masques)
     # ================================
 
     @staticmethod
-    def _clean_row(row: dict, columns: list["SemanticColumn"]) -> dict:
-        cleaned_row = {}
+    def _valid_rows_mask(block: np.ndarray, required: List[int]) -> np.ndarray:
+        """
+        Lignes dont tous les champs critiques sont présents et dont le
+        ratio de valeurs non nulles atteint MIN_NON_NULL_RATIO.
+        """
+        present = block != None  # noqa: E711
 
-        for col in columns:
-            original_value = row.get(col.name)
-            cleaned_value = SemanticDataCleaner._clean_value(
-                original_value, col.role, col.year
-            )
-            cleaned_row[col.name] = cleaned_value
+        valid = present[:, required].all(axis=1)
+        ratio = present.sum(axis=1) / block.shape[1]
+
+        return valid & (ratio >= MIN_NON_NULL_RATIO)
 
-        return cleaned_row
+    # ================================
+    # COLUMN LEVEL
+    # ================================
 
     @staticmethod
-    def _is_valid_row(row: dict, columns: list["SemanticColumn"]) -> bool:
+    def _compile_cleaner(col: "SemanticColumn") -> Callable[[np.ndarray], np.ndarray]:
         """
-        Vérifie que tous les champs critiques sont présents.
+        Fonction de nettoyage d'une colonne entière, choisie UNE fois
+        selon le rôle (mêmes règles que _clean_value).
         """
-        for col in columns:
-            if col.role in REQUIRED_ROLES:
-                if row.get(col.name) is None:
-                    return False
-        return True
+        if col.role == "year_value":
+            return SemanticDataCleaner._clean_year_column
+
+        if col.role == "country":
+            cleaner = SemanticDataCleaner._clean_country_value
+        elif col.role == "indicator":
+            cleaner = SemanticDataCleaner._clean_indicator_value
+        elif col.role in {"country_code", "indicator_code"}:
+            cleaner = SemanticDataCleaner._clean_code_value
+        else:
+            cleaner = SemanticDataCleaner._clean_unknown_value
+
+        # les cleaners de rôle ne modifient que les chaînes
+        def clean_column(values: np.ndarray) -> np.ndarray:
+            is_str = _is_str(values).astype(bool)
+            if not is_str.any():
+                return values
+
+            out = values.copy()
+            out[is_str] = map_distinct(values[is_str], cleaner)
+            return out
+
+        return clean_column
 
     @staticmethod
-    def _has_enough_data(row: dict) -> bool:
+    def _clean_year_column(values: np.ndarray) -> np.ndarray:
         """
-        Vérifie le ratio de valeurs non nulles.
+        Numériques convertis en bloc (astype float), chaînes parsées une
+        à une ; tout le reste devient None.
         """
-        values = list(row.values())
-        non_null_count = sum(v is not None for v in values)
-        ratio = non_null_count / len(values)
+        out = np.full(len(values), None, dtype=object)
 
-        return ratio >= MIN_NON_NULL_RATIO
+        is_num = _is_number(values).astype(bool)
+        if is_num.any():
+            out[is_num] = values[is_num].astype(np.float64)
+
+        is_str = _is_str(values).astype(bool)
+        if is_str.any():
+            out[is_str] = map_distinct(
+                values[is_str], SemanticDataCleaner._parse_year_string
+            )
+
+        return out
 
     # ================================
     # VALUE LEVEL
@@ -144,25 +228,27 @@ class SemanticDataCleaner:
 
     @staticmethod
     def _clean_year_value(value):
-        missing_values = {"..", "...", "NA", "N/A", "#N/A", "", "-", "--", "NaN", "nan"}
-
         if isinstance(value, str):
-            value = value.strip()
-
-            if value in missing_values:
-                return None
-
-            cleaned = re.sub(r"[^\d.-]", "", value)
-            try:
-                return float(cleaned) if cleaned else None
-            except ValueError:
-                return None
+            return SemanticDataCleaner._parse_year_string(value)
 
         if isinstance(value, (int, float)):
             return float(value)
 
         return None
 
+    @staticmethod
+    def _parse_year_string(value: str):
+        value = value.strip()
+
+        if value in MISSING_YEAR_VALUES:
+            return None
+
+        cleaned = NON_NUMERIC_RE.sub("", value)
+        try:
+            return float(cleaned) if cleaned else None
+        except ValueError:
+            return None
+
     @staticmethod
     def _clean_country_value(value):
         if isinstance(value, str):
@@ -0,0 +1,307 @@
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# =========================
+# ENCODAGE COLUMNAIRE
+# =========================
+#
+# Deux fichiers par feuille, lus en memmap :
+# - tags (uint8) : type de chaque cellule
+# - payload (int64) : valeur (bits du float, entier, code de chaîne,
+#   microsecondes depuis l'epoch, index d'objet)
+# Écrits bloc par bloc, colonne après colonne (segments columnaires).
+# Chaînes (répétées : pays, codes) dans un dictionnaire par colonne,
+# gardé en mémoire ; types imprévus (time, float numpy...) dans une
+# liste d'objets. Relecture à l'identique (mêmes types Python).
+
+NONE, FLOAT, INT, BOOL, TEXT, DATETIME, OBJECT = range(7)
+
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+
+# type() / tzinfo élément par élément (boucle C)
+_cell_type = np.frompyfunc(type, 1, 1)
+_is_naive = np.frompyfunc(lambda v: v.tzinfo is None, 1, 1)
+
+
+def encode_column(
+    values: np.ndarray, strings: Dict[str, int], objects: List[Any]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Colonne (dtype=object) → (tags, payload). `strings` et `objects`
+    sont complétés au besoin.
+    """
+    n = len(values)
+    tags = np.zeros(n, np.uint8)
+    payload = np.zeros(n, np.int64)
+    types = _cell_type(values)
+    rest = (types != type(None)).astype(bool)
+
+    mask = (types == float).astype(bool)
+    if mask.any():
+        tags[mask] = FLOAT
+        payload[mask] = np.array(values[mask].tolist(), np.float64).view(np.int64)
+        rest &= ~mask
+
+    mask = (types == bool).astype(bool)
+    if mask.any():
+        tags[mask] = BOOL
+        payload[mask] = np.array(values[mask].tolist(), np.int64)
+        rest &= ~mask
+
+    mask = (types == int).astype(bool)
+    if mask.any():
+        ints = values[mask].tolist()
+        # au-delà de int64 : conservés tels quels (objets)
+        if min(ints) >= _INT64_MIN and max(ints) <= _INT64_MAX:
+            tags[mask] = INT
+            payload[mask] = np.array(ints, np.int64)
+            rest &= ~mask
+
+    mask = (types == str).astype(bool)
+    if mask.any():
+        codes, uniques = pd.factorize(values[mask])
+        mapping = np.array(
+            [strings.setdefault(s, len(strings)) for s in uniques], np.int64
+        )
+        tags[mask] = TEXT
+        payload[mask] = mapping[codes]
+        rest &= ~mask
+
+    mask = (types == datetime).astype(bool)
+    if mask.any():
+        mask[mask] = _is_naive(values[mask]).astype(bool)
+    if mask.any():
+        stamps = np.array(values[mask].tolist(), "datetime64[us]")
+        tags[mask] = DATETIME
+        payload[mask] = stamps.astype(np.int64)
+        rest &= ~mask
+
+    for i in np.flatnonzero(rest):
+        tags[i] = OBJECT
+        payload[i] = len(objects)
+        objects.append(values[i])
+
+    return tags, payload
+
+
+def decode_column(
+    tags: np.ndarray, payload: np.ndarray, strings: np.ndarray, objects: List[Any]
+) -> np.ndarray:
+    out = np.full(len(tags), None, dtype=object)
+
+    for tag in np.unique(tags):
+        mask = tags == tag
+        if tag == FLOAT:
+            out[mask] = payload[mask].view(np.float64).tolist()
+        elif tag == INT:
+            out[mask] = payload[mask].tolist()
+        elif tag == BOOL:
+            out[mask] = payload[mask].astype(bool).tolist()
+        elif tag == TEXT:
+            out[mask] = strings[payload[mask]]
+        elif tag == DATETIME:
+            out[mask] = payload[mask].astype("datetime64[us]").tolist()
+        elif tag == OBJECT:
+            for i, index in zip(np.flatnonzero(mask), payload[mask]):
+                out[i] = objects[index]
+
+    return out
+
+
+# (première ligne, lignes, largeur, position du segment dans les fichiers)
+Segment = Tuple[int, int, int, int]
+
+
+# =========================
+# MATRICE DÉVERSÉE
+# =========================
+
+
+class SpilledMatrix:
+    """
+    Matrice de feuille (dtype=object) déversée sur disque : seules les
+    lignes demandées sont décodées. Indexable comme la matrice numpy
+    d'une ColumnarRawSheet (matrix[i], matrix[a:b], matrix[:, j]) ;
+    sérialisable à bas coût (chemins + dictionnaires, memmaps rouverts
+    à la demande).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        rows: int,
+        width: int,
+        segments: List[Segment],
+        strings: List[np.ndarray],
+        objects: List[Any],
+    ):
+        self.directory = directory
+        self.rows = rows
+        self.width = width
+        self.segments = segments
+        self.strings = strings
+        self.objects = objects
+        self._tags = None
+        self._payload = None
+
+    def __getstate__(self):
+        return {**self.__dict__, "_tags": None, "_payload": None}
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (self.rows, self.width)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _open(self) -> None:
+        path = os.path.join(self.directory, "cells")
+        self._tags = np.memmap(f"{path}.tags", np.uint8, mode="r")
+        self._payload = np.memmap(f"{path}.payload", np.int64, mode="r")
+
+    def decode(
+        self, start: int, stop: int, columns: Optional[Sequence[int]] = None
+    ) -> np.ndarray:
+        """
+        Lignes start..stop (exclu), toutes les colonnes ou `columns`.
+        """
+        columns = range(self.width) if columns is None else columns
+        out = np.full((max(stop - start, 0), len(columns)), None, dtype=object)
+        if stop <= start:
+            return out
+
+        if self._tags is None:
+            self._open()
+
+        for first, count, width, offset in self.segments:
+            lo, hi = max(start, first), min(stop, first + count)
+            if lo >= hi:
+                continue
+
+            for k, j in enumerate(columns):
+                if j >= width:
+                    continue
+                base = offset + j * count + (lo - first)
+                out[lo - start : hi - start, k] = decode_column(
+                    np.asarray(self._tags[base : base + hi - lo]),
+                    np.asarray(self._payload[base : base + hi - lo]),
+                    self.strings[j],
+                    self.objects,
+                )
+
+        return out
+
+    def iter_blocks(self, size: int) -> Iterator[np.ndarray]:
+        for start in range(0, self.rows, size):
+            yield self.decode(start, min(start + size, self.rows))
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            rows, column = key
+            start, stop, _ = rows.indices(self.rows)
+            return self.decode(start, stop, [column])[:, 0]
+
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.rows)
+            if step != 1:
+                raise IndexError("SpilledMatrix : slice avec pas non supportée")
+            return self.decode(start, stop)
+
+        index = key + self.rows if key < 0 else key
+        if not 0 <= index < self.rows:
+            raise IndexError(key)
+        return self.decode(index, index + 1)[0]
+
+
+class SpillWriter:
+    """
+    Blocs de lignes (2D, largeurs libres) ajoutés au fil de la lecture,
+    UN segment columnaire par bloc ; close(width) rend la SpilledMatrix
+    (colonnes au-delà de width ignorées, manquantes = None).
+    """
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        path = os.path.join(directory, "cells")
+        self._tags = open(f"{path}.tags", "wb")
+        self._payload = open(f"{path}.payload", "wb")
+        self.rows = 0
+        self.offset = 0
+        self.segments: List[Segment] = []
+        self.strings: List[Dict[str, int]] = []
+        self.objects: List[Any] = []
+
+    def append(self, block: np.ndarray) -> None:
+        count, width = block.shape
+        if not count:
+            return
+
+        while len(self.strings) < width:
+            self.strings.append({})
+
+        for j in range(width):
+            tags, payload = encode_column(block[:, j], self.strings[j], self.objects)
+            self._tags.write(tags.tobytes())
+            self._payload.write(payload.tobytes())
+
+        self.segments.append((self.rows, count, width, self.offset))
+        self.rows += count
+        self.offset += count * width
+
+    def close(self, width: Optional[int] = None) -> SpilledMatrix:
+        self._tags.close()
+        self._payload.close()
+
+        if width is None:
+            width = len(self.strings)
+
+        strings = []
+        for j in range(width):
+            known = self.strings[j] if j < len(self.strings) else {}
+            table = np.empty(len(known), dtype=object)
+            table[:] = list(known)
+            strings.append(table)
+
+        return SpilledMatrix(
+            self.directory, self.rows, width, self.segments, strings, self.objects
+        )
+
+
+# =========================
+# POLITIQUE DE DÉVERSEMENT
+# =========================
+
+
+class SpillPolicy:
+    """
+    Déversement sur disque des feuilles dont la taille (lignes ×
+    colonnes de l'introspection, ou lues jusqu'ici quand les dimensions
+    déclarées manquent) atteint min_cells.
+    Un répertoire temporaire par parsing, créé à la première feuille
+    déversée et supprimé par cleanup().
+    """
+
+    def __init__(self, min_cells: int, directory: Optional[str] = None):
+        self.min_cells = min_cells
+        self.directory = directory
+        self.root: Optional[str] = None
+
+    def should_spill(self, rows: int, columns: int) -> bool:
+        return bool(self.min_cells) and rows * columns >= self.min_cells
+
+    def writer(self) -> SpillWriter:
+        if self.root is None:
+            self.root = tempfile.mkdtemp(prefix="excel-spill-", dir=self.directory)
+        return SpillWriter(tempfile.mkdtemp(dir=self.root))
+
+    def cleanup(self) -> None:
+        if self.root is not None:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self.root = None
@@ -1,10 +1,35 @@
-from typing import Any, List
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence, Tuple
 
+import numpy as np
 from processing.application.parsers.excel.contracts import (
     DetectedTable,
     RawWorkbook,
     StructuredWorkbook,
 )
+from processing.application.parsers.excel.layout_cache import LayoutCache, LayoutEntry
+
+# type() / len() élément par élément sur un tableau numpy (boucle C)
+_cell_type = np.frompyfunc(type, 1, 1)
+_cell_len = np.frompyfunc(len, 1, 1)
+
+
+@dataclass
+class RowStatistics:
+    """
+    Statistiques par ligne, calculées UNE fois par feuille (vectorisé).
+    """
+
+    non_empty: np.ndarray
+    strings: np.ndarray
+    numerics: np.ndarray
+    label_length: np.ndarray
+    width: np.ndarray
+    header_scores: np.ndarray
+
+    @property
+    def non_empty_ratio(self) -> np.ndarray:
+        return self.non_empty / np.maximum(self.width, 1)
 
 
 class ExcelStructureAnalyzer:
@@ -19,21 +44,27 @@ class ExcelStructureAnalyzer:
     FINAL_HEADER_THRESHOLD = 0.8
     MIN_NON_EMPTY_RATIO = 0.4
     MAX_SCAN_ROWS = 100
+    # Recherche de la fin des données par tranches de lignes
+    DATA_END_SCAN_ROWS = 50_000
 
     # =========================
     # PUBLIC ENTRYPOINT
     # =========================
 
     @staticmethod
-    def analyze(raw: RawWorkbook) -> StructuredWorkbook:
+    def analyze(
+        raw: RawWorkbook, layouts: Optional[LayoutCache] = None
+    ) -> StructuredWorkbook:
         tables = []
 
         for sheet_name, sheet in raw.sheets.items():
             matrix = sheet.matrix
-            if not matrix:
+            if len(matrix) == 0:
                 continue
 
-            header_row, confidence = ExcelStructureAnalyzer._detect_final_header(matrix)
+            header_row, confidence, layout = ExcelStructureAnalyzer._detect_header(
+                matrix, layouts
+            )
 
             if header_row is None:
                 continue
@@ -51,50 +82,186 @@ class ExcelStructureAnalyzer:
                     columns=columns,
                     orientation="horizontal",
                     confidence=confidence,
+                    layout=layout,
                 )
             )
 
         return StructuredWorkbook(tables=tables)
 
+    # =========================
+    # ROW STATISTICS
+    # =========================
+
+    @staticmethod
+    def _as_array(rows: Sequence[Sequence[Any]]) -> np.ndarray:
+        """
+        Vue 2D (dtype=object) des lignes ; les lignes courtes sont complétées.
+        """
+        if isinstance(rows, np.ndarray):
+            return rows
+
+        width = max((len(r) for r in rows), default=0)
+        block = np.full((len(rows), width), None, dtype=object)
+        for i, row in enumerate(rows):
+            block[i, : len(row)] = row
+        return block
+
+    @staticmethod
+    def _row_statistics(rows: Sequence[Sequence[Any]]) -> RowStatistics:
+        """
+        Un seul passage vectorisé : comptes, longueurs et score header
+        de chaque ligne (mêmes règles que _header_likelihood_score).
+        """
+        block = ExcelStructureAnalyzer._as_array(rows)
+        widths = np.array([len(r) for r in rows], dtype=np.int64)
+
+        present = (block != None) & (block != "")  # noqa: E711
+        types = _cell_type(block)
+        is_str = present & (types == str)
+        is_num = present & ((types == int) | (types == float) | (types == bool))
+
+        lengths = np.zeros(block.shape, dtype=np.int64)
+        if is_str.any():
+            lengths[is_str] = _cell_len(block[is_str]).astype(np.int64)
+
+        non_empty = present.sum(axis=1)
+        strings = is_str.sum(axis=1)
+        numerics = is_num.sum(axis=1)
+        label_length = lengths.sum(axis=1)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = strings / non_empty
+        avg_len = label_length / np.maximum(strings, 1)
+        scores = np.where(avg_len < 30, scores + 0.1, scores)
+        scores = np.where(numerics > strings, scores - 0.2, scores)
+        scores = np.clip(scores, 0.0, 1.0)
+        scores = np.where(non_empty < 2, 0.0, scores)
+
+        return RowStatistics(
+            non_empty=non_empty,
+            strings=strings,
+            numerics=numerics,
+            label_length=label_length,
+            width=widths,
+            header_scores=scores,
+        )
+
     # =========================
     # HEADER DETECTION
     # =========================
 
     @staticmethod
-    def _detect_final_header(matrix: List[List[Any]]):
+    def _detect_header(
+        matrix: Sequence[Sequence[Any]], layouts: Optional[LayoutCache]
+    ) -> Tuple[Optional[int], float, Optional[str]]:
         """
-        Détecte le header FINAL (pas juste un candidat)
+        Mise en page connue => header repris du cache après contrôle de
+        confiance ; sinon détection complète, mémorisée si le header est
+        FINAL.
         """
-        candidates = []
+        if layouts is None:
+            return (*ExcelStructureAnalyzer._detect_final_header(matrix), None)
+
+        found = layouts.lookup(matrix)
+        if found is not None:
+            fingerprint, entry = found
+            confidence = ExcelStructureAnalyzer._confirm_header(
+                matrix, entry.header_row
+            )
+            if confidence is not None:
+                layouts.hits += 1
+                return entry.header_row, confidence, fingerprint
+            layouts.rejected += 1
+        else:
+            layouts.misses += 1
+
+        header_row, confidence = ExcelStructureAnalyzer._detect_final_header(matrix)
+        if header_row is None:
+            return None, 0.0, None
+
+        # header de repli (non FINAL) : trop incertain pour être mémorisé
+        if ExcelStructureAnalyzer._confirm_header(matrix, header_row) is None:
+            return header_row, confidence, None
+
+        fingerprint = LayoutCache.fingerprint(matrix, header_row)
+        layouts.store(
+            fingerprint,
+            LayoutEntry(
+                header_row=header_row,
+                columns=ExcelStructureAnalyzer._extract_columns(matrix[header_row]),
+            ),
+        )
+        return header_row, confidence, fingerprint
 
+    @staticmethod
+    def _confirm_header(matrix: Sequence[Sequence[Any]], header_row: int):
+        """
+        Contrôle de confiance sur les seules lignes 0..header_row+1 :
+        score du header si _detect_final_header retiendrait exactement
+        cette ligne (aucun header FINAL plus haut), sinon None.
+        """
         scan_limit = min(len(matrix) - 1, ExcelStructureAnalyzer.MAX_SCAN_ROWS)
+        if header_row >= scan_limit:
+            return None
 
-        for i in range(scan_limit):
-            row = matrix[i]
-            next_row = matrix[i + 1]
+        stats = ExcelStructureAnalyzer._row_statistics(matrix[: header_row + 2])
+        scores = stats.header_scores
+        ratios = stats.non_empty_ratio
 
-            score = ExcelStructureAnalyzer._header_likelihood_score(row)
+        for idx in range(header_row + 1):
+            if scores[idx] >= ExcelStructureAnalyzer.HEADER_THRESHOLD and (
+                ExcelStructureAnalyzer._is_final_header_at(scores, ratios, idx)
+            ):
+                return float(scores[idx]) if idx == header_row else None
 
-            if score >= ExcelStructureAnalyzer.HEADER_THRESHOLD:
-                candidates.append((i, score))
+        return None
 
-        for idx, score in candidates:
-            row = matrix[idx]
-            next_row = matrix[idx + 1]
+    @staticmethod
+    def _detect_final_header(matrix: Sequence[Sequence[Any]]):
+        """
+        Détecte le header FINAL (pas juste un candidat)
+        """
+        scan_limit = min(len(matrix) - 1, ExcelStructureAnalyzer.MAX_SCAN_ROWS)
+        if scan_limit <= 0:
+            return None, 0.0
 
-            if ExcelStructureAnalyzer._is_final_header(row, next_row):
-                return idx, score
+        # lignes 0..scan_limit incluse (la ligne suivant le dernier candidat)
+        stats = ExcelStructureAnalyzer._row_statistics(matrix[: scan_limit + 1])
+        scores = stats.header_scores
+        ratios = stats.non_empty_ratio
+
+        candidates = np.flatnonzero(
+            scores[:scan_limit] >= ExcelStructureAnalyzer.HEADER_THRESHOLD
+        )
+
+        for idx in candidates:
+            if ExcelStructureAnalyzer._is_final_header_at(scores, ratios, idx):
+                return int(idx), float(scores[idx])
 
         # fallback : meilleur score si aucun "final" détecté
-        if candidates:
-            return max(candidates, key=lambda x: x[1])
+        if len(candidates):
+            best = candidates[np.argmax(scores[candidates])]
+            return int(best), float(scores[best])
 
         return None, 0.0
 
+    @staticmethod
+    def _is_final_header_at(
+        scores: np.ndarray, ratios: np.ndarray, idx: int
+    ) -> bool:
+        """
+        Header FINAL = header fort suivi de données (statistiques précalculées)
+        """
+        return (
+            scores[idx] >= ExcelStructureAnalyzer.FINAL_HEADER_THRESHOLD
+            and ratios[idx] >= ExcelStructureAnalyzer.MIN_NON_EMPTY_RATIO
+            and scores[idx + 1] < 0.3
+        )
+
     @staticmethod
     def _header_likelihood_score(row: List[Any]) -> float:
         """
-        Probabilité qu'une ligne soit un header
+        Probabilité qu'une ligne soit un header (version ligne unique)
         """
         non_empty = [c for c in row if c not in (None, "")]
         if len(non_empty) < 2:
@@ -156,15 +323,22 @@ class ExcelStructureAnalyzer:
         return columns
 
     @staticmethod
-    def _find_data_end(matrix: List[List[Any]], start: int) -> int:
+    def _find_data_end(matrix: Sequence[Sequence[Any]], start: int) -> int:
         """
         Fin des données = première ligne totalement vide
         """
-        end = start
+        if start >= len(matrix):
+            return start
+
+        # par tranches : une matrice déversée n'est jamais décodée en entier
+        step = ExcelStructureAnalyzer.DATA_END_SCAN_ROWS
+        for offset in range(start, len(matrix), step):
+            block = ExcelStructureAnalyzer._as_array(matrix[offset : offset + step])
+            present = (block != None) & (block != "")  # noqa: E711
+            empty_rows = np.flatnonzero(~present.any(axis=1))
 
-        for i in range(start, len(matrix)):
-            if all(c in (None, "") for c in matrix[i]):
-                break
-            end = i
+            if len(empty_rows):
+                first_empty = offset + int(empty_rows[0])
+                return first_empty - 1 if first_empty > start else start
 
-        return end
+        return len(matrix) - 1
@@ -0,0 +1,96 @@
+import types
+
+from processing.application.parsers.excel.excel_parser import ExcelParser
+from processing.application.parsers.excel.header_repair import ExcelSanitizer
+from processing.application.parsers.excel.normalizer import (
+    ExcelNormalizer,
+    TemporalUnpivotNormalizer,
+)
+from processing.application.parsers.excel.raw_loader import ExcelRawLoader
+from processing.application.parsers.excel.semantic_analyzer import SemanticTableAnalyzer
+from processing.application.parsers.excel.semantic_data_cleaner import (
+    SemanticDataCleaner,
+)
+from processing.application.parsers.excel.structure_analyzer import (
+    ExcelStructureAnalyzer,
+)
+from processing.application.parsers.parser_factory import ParserFactory
+from processing.application.parsers.worker_pool import worker_pools
+
+
+def _document_level_rows(content):
+    raw = ExcelRawLoader.load(content)
+    structured = ExcelStructureAnalyzer.analyze(raw)
+    normalized = ExcelNormalizer.normalize(raw, structured)
+    unpivoted = TemporalUnpivotNormalizer.normalize(normalized)
+    sanitized = ExcelSanitizer.sanitize(unpivoted)
+    semantic = SemanticTableAnalyzer.analyze(sanitized)
+    cleaned = SemanticDataCleaner.clean_semantic_document(semantic)
+    return [row for table in cleaned.tables for row in table.rows]
+
+
+def test_streaming_parse_yields_same_facts(make_workbook, wdi_sheet):
+    content = make_workbook({"Data": wdi_sheet})
+
+    streamed = ExcelParser("doc-1", content, "wdi.xlsx", streaming=True).parse()
+    materialized = ExcelParser("doc-1", content, "wdi.xlsx").parse()
+
+    assert isinstance(streamed, types.GeneratorType)
+    assert list(streamed) == materialized
+    assert [f.payload for f in materialized] == _document_level_rows(content)
+    # 6 pays × 2 années non nulles (".." écarté, 0 conservé)
+    assert len(materialized) == 12
+    assert [f.source["row"] for f in materialized] == list(range(12))
+
+
+def test_parallel_parse_keeps_fact_order(make_workbook, wdi_sheet):
+    content = make_workbook(
+        {"Economy": wdi_sheet, "Health": wdi_sheet, "Education": wdi_sheet}
+    )
+
+    sequential = ExcelParser("doc-1", content, "wdi.xlsx").parse()
+    parallel = ExcelParser("doc-1", content, "wdi.xlsx", workers=2).parse()
+
+    assert parallel == sequential
+    assert [f.source["sheet"] for f in parallel[::12]] == [
+        "Economy_table",
+        "Health_table",
+        "Education_table",
+    ]
+
+
+def test_parallel_parses_reuse_one_pool(make_workbook, wdi_sheet):
+    content = make_workbook({"Economy": wdi_sheet, "Health": wdi_sheet})
+    sequential = ExcelParser("doc-1", content, "wdi.xlsx").parse()
+    created = worker_pools().created
+
+    # documents enchaînés : même pool, jamais arrêté entre deux parses
+    for _ in range(8):
+        assert ExcelParser("doc-1", content, "wdi.xlsx", workers=2).parse() == (
+            sequential
+        )
+
+    assert worker_pools().created <= created + 1
+
+
+def test_type_prescan_only_bounds_streaming_parses(
+    monkeypatch, settings, make_workbook, wdi_sheet
+):
+    content = make_workbook({"Data": wdi_sheet})
+    prescans = []
+    sanitize_table = ExcelSanitizer.sanitize_table
+
+    def spy(table, prescan_rows=None, spill_dir=None):
+        prescans.append(prescan_rows)
+        return sanitize_table(table, prescan_rows=prescan_rows, spill_dir=spill_dir)
+
+    monkeypatch.setattr(ExcelSanitizer, "sanitize_table", staticmethod(spy))
+
+    ExcelParser("doc-1", content, "wdi.xlsx").parse()
+    list(ExcelParser("doc-1", content, "wdi.xlsx", streaming=True).parse())
+    assert prescans == [None, ExcelParser.TYPE_PRESCAN_ROWS]
+
+    settings.EXCEL_PARSER_STREAMING = True
+    parser = ParserFactory.from_document("doc-1", content, "wdi.xlsx")
+    assert parser.streaming
+    assert ParserFactory.parser_version("wdi.xlsx").endswith(":stream")
@@ -0,0 +1,50 @@
+import datetime
+import math
+
+import numpy as np
+import pytest
+from processing.application.parsers.excel.contracts import TableRows
+from processing.application.parsers.excel.fact_builder import BlindFactBuilder
+
+COLUMNS = ["value", "Country", "year", "100% share", "notes", "flag"]
+ROWS = [
+    (1.5, "France", 2020, 0, None, True),
+    (2, "Côte d'Ivoire", 2021, 0.1, "a, b", False),
+    (math.nan, 'say "hi"', 2022, math.inf, datetime.date(2020, 1, 2), None),
+    (None, None, "2023", -3, {"b": 1, "a": [1, 2]}, 1),
+    (np.float64(0.5), "", 10**20, 1e-7, datetime.datetime(2020, 1, 1), 1.0),
+]
+
+
+@pytest.mark.parametrize("hash_name", ["sha256", "xxh3_128"])
+def test_batch_ids_match_row_by_row_build(hash_name):
+    builder = BlindFactBuilder(hash_name)
+    source = {"document_id": "doc-1", "sheet": "t"}
+
+    rows = TableRows(COLUMNS, ROWS)
+    expected = [builder.build(row, source, i) for i, row in enumerate(rows)]
+    batched = list(builder.build_rows(TableRows(COLUMNS, ROWS), source))
+
+    assert [f.entity_id for f in batched] == [f.entity_id for f in expected]
+    # repr : NaN != NaN
+    assert [repr(f.payload) for f in batched] == [repr(f.payload) for f in expected]
+    assert [f.source for f in batched] == [f.source for f in expected]
+
+
+def test_default_hash_keeps_historical_ids():
+    fact = BlindFactBuilder().build({"b": 1, "a": "x"}, {"sheet": "s"}, 0)
+
+    # sha256('{"a": "x", "b": 1}')
+    assert fact.entity_id == (
+        "385820f0096fd558f4091319e7fa742cebf877dc3baca180981889f1c40eca84"
+    )
+
+
+def test_batches_keep_row_numbering(monkeypatch):
+    monkeypatch.setattr(BlindFactBuilder, "BATCH_ROWS", 2)
+    rows = TableRows(["a"], [(i,) for i in range(5)])
+
+    facts = list(BlindFactBuilder().build_rows(rows, {"sheet": "s"}))
+
+    assert [f.source["row"] for f in facts] == [0, 1, 2, 3, 4]
+    assert [f.payload for f in facts] == [{"a": i} for i in range(5)]
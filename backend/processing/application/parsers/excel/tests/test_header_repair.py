@@ -0,0 +1,49 @@
+from processing.application.parsers.excel.contracts import NormalizedTable, TableRows
+from processing.application.parsers.excel.header_repair import ExcelSanitizer
+
+
+def _table(columns, rows):
+    return NormalizedTable(
+        name="t",
+        columns=columns,
+        rows=TableRows(list(dict.fromkeys(columns)), rows),
+        confidence=1.0,
+    )
+
+
+def test_sanitize_coerces_strings_and_drops_metadata_rows():
+    table = _table(
+        ["Country Name", "Value %"],
+        [
+            ("France", " 1.5 "),
+            ("Source: World Bank", "notes"),
+            ("-", "N/A"),
+            ("Spain", 2),
+        ],
+    )
+
+    sanitized = ExcelSanitizer.sanitize_table(table)
+    rows = sanitized.rows.materialize()
+
+    assert sanitized.columns == ["country_name", "value_percent"]
+    assert [r.copy() for r in rows] == [
+        {"country_name": "France", "value_percent": 1.5},
+        {"country_name": "Spain", "value_percent": 2},
+    ]
+    assert sanitized.column_types == {
+        "country_name": "string",
+        "value_percent": "string",
+    }
+
+
+def test_sanitize_infers_types_on_prescan_rows_only(monkeypatch):
+    monkeypatch.setattr(ExcelSanitizer, "CHUNK_ROWS", 2)
+    rows = [("a", 1, 0)] * 3 + [("b", "x", 0)] * 5
+    columns = ["k", "v", "n"]
+
+    streamed = ExcelSanitizer.sanitize_table(_table(columns, rows), prescan_rows=3)
+    full = ExcelSanitizer.sanitize_table(_table(columns, rows))
+
+    assert streamed.column_types == {"k": "string", "v": "numeric", "n": "numeric"}
+    assert full.column_types == {"k": "string", "v": "string", "n": "numeric"}
+    assert len(list(streamed.rows)) == len(full.rows.materialize()) == 8
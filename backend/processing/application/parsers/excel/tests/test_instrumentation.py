@@ -0,0 +1,57 @@
+import time
+
+from processing.application.parsers.excel.excel_parser import ExcelParser
+from processing.application.parsers.excel.instrumentation import PipelineMetrics
+
+
+def _slow(items, delay):
+    for item in items:
+        time.sleep(delay)
+        yield item
+
+
+def test_chained_stages_report_exclusive_time():
+    metrics = PipelineMetrics()
+
+    upstream = metrics.timed("load", _slow([[1, 2], [3]], 0.02))
+    downstream = metrics.timed("clean", _slow(upstream, 0.01))
+    assert list(downstream) == [[1, 2], [3]]
+
+    stages = metrics.report()["stages"]
+    assert stages["load"]["rows_out"] == 3
+    assert stages["clean"]["rows_in"] == 3
+    # le temps de "load" n'est pas recompté dans "clean"
+    assert stages["load"]["seconds"] >= 0.04
+    assert 0.02 <= stages["clean"]["seconds"] < 0.04
+
+
+def test_disabled_metrics_leave_streams_untouched():
+    metrics = PipelineMetrics(enabled=False)
+    items = iter([1, 2])
+
+    assert metrics.timed("load", items) is items
+    with metrics.measure("detect") as stats:
+        assert stats is None
+    assert metrics.report()["stages"] == {}
+
+
+def test_parser_reports_rows_per_stage(make_workbook, wdi_sheet):
+    content = make_workbook({"Data": wdi_sheet, "Empty": [["notes only"]]})
+    parser = ExcelParser("doc-1", content, "wdi.xlsx")
+
+    facts = parser.parse()
+    stages = parser.metrics.report()["stages"]
+
+    assert list(stages) == [
+        "load",
+        "detect",
+        "normalize",
+        "unpivot",
+        "sanitize",
+        "analyze",
+        "clean",
+        "facts",
+    ]
+    assert stages["facts"]["rows_out"] == len(facts) == 12
+    assert stages["clean"]["rows_out"] == 12
+    assert stages["detect"]["tables_in"] == 2
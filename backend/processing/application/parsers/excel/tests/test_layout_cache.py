@@ -0,0 +1,73 @@
+from processing.application.parsers.excel.contracts import RawSheet, RawWorkbook
+from processing.application.parsers.excel.excel_parser import ExcelParser
+from processing.application.parsers.excel.layout_cache import LayoutCache
+from processing.application.parsers.excel.structure_analyzer import (
+    ExcelStructureAnalyzer,
+)
+
+YEARS = ["2016", "2017", "2018", "2019", "2020"]
+
+
+def _template(title, offset=0.0):
+    """
+    Export type WDI : lignes de données majoritairement numériques.
+    """
+    rows = [[title], [], ["Country Name", "Country Code", "Indicator Name"] + YEARS]
+    countries = ["France", "Benin", "Senegal", "Mali", "Togo", "Niger"]
+    for i, country in enumerate(countries):
+        rows.append([country, country[:3].upper(), "GDP"] + [i + offset] * len(YEARS))
+    return rows
+
+
+def _raw(rows):
+    width = max(len(r) for r in rows)
+    matrix = [list(r) + [None] * (width - len(r)) for r in rows]
+    return RawWorkbook(sheets={"Data": RawSheet(name="Data", matrix=matrix)})
+
+
+def test_known_layout_skips_detection():
+    layouts = LayoutCache()
+
+    first = ExcelStructureAnalyzer.analyze(_raw(_template("WDI 2023")), layouts=layouts)
+    second = ExcelStructureAnalyzer.analyze(
+        _raw(_template("WDI 2024", offset=0.5)), layouts=layouts
+    )
+
+    assert second.tables == first.tables
+    assert second.tables[0].layout is not None
+    assert layouts.stats() == {"entries": 1, "hits": 1, "misses": 1, "rejected": 0}
+
+
+def test_confidence_check_falls_back_to_full_analysis():
+    layouts = LayoutCache()
+    ExcelStructureAnalyzer.analyze(_raw(_template("WDI 2023")), layouts=layouts)
+
+    # même en-tête, mais la ligne suivante ressemble elle aussi à un header
+    altered = _template("WDI 2024")
+    altered.insert(3, ["Region", "Code", "Label", "a", "b", "c", "d", "e"])
+    matrix = _raw(altered).sheets["Data"].matrix
+
+    (table,) = ExcelStructureAnalyzer.analyze(_raw(altered), layouts=layouts).tables
+
+    assert layouts.rejected == 1
+    assert (table.header_row, table.confidence) == (
+        ExcelStructureAnalyzer._detect_final_header(matrix)
+    )
+
+
+def test_parser_reuses_cached_roles(monkeypatch, make_workbook):
+    monkeypatch.setattr(ExcelParser, "LAYOUTS", LayoutCache())
+
+    first = ExcelParser("d", make_workbook({"Data": _template("A")}), "a.xlsx").parse()
+    second = ExcelParser("d", make_workbook({"Data": _template("A")}), "a.xlsx").parse()
+
+    assert second == first
+    assert ExcelParser.LAYOUTS.hits == 1
+    (entry,) = ExcelParser.LAYOUTS._entries.values()
+    assert [c.name for c in entry.roles] == [
+        "country_name",
+        "country_code",
+        "indicator_name",
+        "year",
+        "value",
+    ]
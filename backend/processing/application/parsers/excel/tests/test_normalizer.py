@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from processing.application.parsers.excel.contracts import NormalizedTable, TableRows
+from processing.application.parsers.excel.normalizer import TemporalUnpivotNormalizer
+
+
+def _table(columns, rows):
+    return NormalizedTable(
+        name="t",
+        columns=columns,
+        rows=TableRows(columns, [tuple(r) for r in rows]),
+        confidence=1.0,
+    )
+
+
+def test_table_rows_are_dict_like():
+    rows = TableRows(["country", "value"], [("France", 1.5)])
+
+    (row,) = rows
+    assert row["country"] == "France"
+    assert row.get("missing") is None
+    assert row == {"country": "France", "value": 1.5}
+    assert row.copy() == {"country": "France", "value": 1.5}
+    assert isinstance(row.copy(), dict)
+
+
+def test_streamed_table_rows_need_materialize_for_direct_access():
+    chunked = TableRows.from_chunks(
+        ["country", "value"],
+        (np.array(block, dtype=object) for block in [[["France", 1.5]], [["Mali", 2]]]),
+    )
+
+    with pytest.raises(TypeError, match="materialize"):
+        len(chunked)
+    with pytest.raises(TypeError, match="materialize"):
+        chunked[0]
+
+    chunked.materialize()
+    assert len(chunked) == 2
+    assert chunked[1] == {"country": "Mali", "value": 2}
+    # list() : len() appelé après iter(), aucune ligne perdue
+    streamed = TableRows(["country", "value"], (r for r in [("Togo", 3)]))
+    assert [row["country"] for row in list(streamed)] == ["Togo"]
+
+
+def test_unpivot_keeps_zero_and_drops_none():
+    table = _table(
+        ["country", "2019", "2020"],
+        [("France", 0, None), ("Spain", 2.5, 3)],
+    )
+
+    unpivoted = TemporalUnpivotNormalizer.normalize_table(table)
+
+    assert unpivoted.columns == ["country", "year", "value"]
+    assert [r.copy() for r in unpivoted.rows] == [
+        {"country": "France", "year": 2019, "value": 0},
+        {"country": "Spain", "year": 2019, "value": 2.5},
+        {"country": "Spain", "year": 2020, "value": 3},
+    ]
+
+
+def test_unpivot_static_value_column_is_overwritten():
+    table = _table(["value", "country", "2020"], [(9, "France", 1)])
+
+    (row,) = TemporalUnpivotNormalizer.normalize_table(table).rows
+
+    assert list(row.items()) == [("value", 1), ("country", "France"), ("year", 2020)]
+
+
+def test_unpivot_is_chunk_size_independent(monkeypatch):
+    rows = [
+        (f"c{i}", i % 3 or None, 0, None if i % 2 else "x") for i in range(25)
+    ]
+    expected = [
+        r.copy()
+        for r in TemporalUnpivotNormalizer.normalize_table(
+            _table(["country", "1990", "2000", "2010"], rows)
+        ).rows
+    ]
+
+    monkeypatch.setattr(TemporalUnpivotNormalizer, "CHUNK_ROWS", 4)
+    chunked = TemporalUnpivotNormalizer.normalize_table(
+        _table(["country", "1990", "2000", "2010"], rows)
+    )
+
+    assert [r.copy() for r in chunked.rows] == expected
+    assert len(expected) == 16 + 25 + 13
+
+
+def test_unpivot_accepts_columnar_chunks():
+    columns = ["country", "2019", "2020"]
+    block = np.empty((2, 3), dtype=object)
+    block[:] = [("France", 0, None), ("Spain", 2.5, 3)]
+    table = NormalizedTable(
+        name="t",
+        columns=columns,
+        rows=TableRows.from_chunks(columns, [block[:1], block[1:]]),
+        confidence=1.0,
+    )
+
+    rows = TemporalUnpivotNormalizer.normalize_table(table).rows.materialize()
+
+    assert len(rows) == 3
+    assert rows[0] == {"country": "France", "year": 2019, "value": 0}
+    assert rows[2] == {"country": "Spain", "year": 2020, "value": 3}
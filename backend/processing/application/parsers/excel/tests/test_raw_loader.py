@@ -0,0 +1,145 @@
+import pytest
+from processing.application.parsers.excel.introspector import ExcelIntrospector
+from processing.application.parsers.excel.raw_loader import ExcelRawLoader
+from processing.application.parsers.excel.reader_engines import (
+    OLE2_MAGIC,
+    CalamineEngine,
+    OpenpyxlEngine,
+    ReaderEngines,
+)
+
+
+def test_single_pass_matches_standalone_introspection(make_workbook, wdi_sheet):
+    content = make_workbook({"Data": wdi_sheet, "Other": [["a", "b"], ["c", 1]]})
+
+    introspection, _ = ExcelRawLoader.load_with_introspection(content)
+
+    assert introspection == ExcelIntrospector.inspect(content)
+    assert [s.name for s in introspection.sheets] == ["Data", "Other"]
+
+
+def test_ignored_and_non_tabular_sheets_are_not_read(make_workbook, wdi_sheet):
+    content = make_workbook(
+        {
+            "Notes": [["a", "b"], ["c", 1]],
+            "Data": wdi_sheet,
+            "Single column": [["x"], ["y"], ["z"]],
+        }
+    )
+
+    loaded = list(ExcelRawLoader.iter_sheets(content))
+
+    assert [(meta.name, sheet is not None) for meta, sheet in loaded] == [
+        ("Notes", False),
+        ("Data", True),
+        ("Single column", False),
+    ]
+    # statistiques inconnues : la feuille n'a jamais été parsée
+    assert loaded[0][0].non_empty_ratio == -1.0
+
+
+def test_raw_matrix_is_normalized_and_rectangular(make_workbook, wdi_sheet):
+    content = make_workbook({"Data": wdi_sheet, "Notes": [["a", "b"]]})
+
+    raw = ExcelRawLoader.load(content)
+
+    assert list(raw.sheets) == ["Data"]
+    matrix = raw.sheets["Data"].matrix
+    # ligne vide supprimée, largeur = largeur max des données
+    assert len(matrix) == 2 + 6
+    assert {len(row) for row in matrix} == {6}
+    # float entier → int, marqueur ".." → None, 0 conservé
+    assert matrix[2] == ["France", "FRA", "GDP", 1, None, 0]
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+@pytest.mark.parametrize("engine", ["openpyxl", "calamine"])
+def test_bool_cells_take_the_column_form_like_read_excel(
+    make_workbook, columnar, engine
+):
+    rows = [
+        ["Country", "Value", "Flag"],
+        ["France", 2, True],
+        ["Benin", True, 1],
+        ["Mali", False, 0.0],
+        ["Togo", 0, False],
+    ]
+    content = make_workbook({"Data": rows})
+
+    raw = ExcelRawLoader.load(content, columnar=columnar, engine=engine)
+    matrix = [list(row) for row in raw.sheets["Data"].matrix]
+
+    # pd.read_excel(dtype=object) : forme de la 1re occurrence par colonne
+    assert repr([row[1:] for row in matrix[1:]]) == repr(
+        [[2, True], [True, True], [False, 0], [False, 0]]
+    )
+
+def test_stats_sampling_only_counts_first_rows(make_workbook):
+    rows = [["a", "b"]] * 10 + [["x", None]] * 90
+    content = make_workbook({"Data": rows})
+
+    introspection, _ = ExcelRawLoader.load_with_introspection(
+        content, stats_sample_rows=10
+    )
+
+    assert introspection.sheets[0].non_empty_ratio == 1.0
+
+
+def test_columnar_sheet_matches_list_matrix(make_workbook, wdi_sheet):
+    rows = wdi_sheet + [[" Côte\xa0d'Ivoire ", "CIV", "n/a", 2.5, "   ", None]]
+    content = make_workbook({"Data": rows})
+
+    raw = ExcelRawLoader.load(content)
+    columnar = ExcelRawLoader.load(content, columnar=True)
+
+    values = columnar.sheets["Data"].values
+    assert values.shape == (9, 6)
+    assert values.tolist() == raw.sheets["Data"].matrix
+    assert values[-1].tolist() == ["Côte d'Ivoire", "CIV", None, 2.5, None, None]
+
+
+def test_auto_engine_selection(monkeypatch):
+    monkeypatch.setattr(ReaderEngines, "CALAMINE_MIN_BYTES", 100)
+    monkeypatch.setattr(CalamineEngine, "is_available", staticmethod(lambda: True))
+
+    assert ReaderEngines.select(b"PK" + b"\0" * 10) is OpenpyxlEngine
+    assert ReaderEngines.select(b"PK" + b"\0" * 200) is CalamineEngine
+    # .xls (OLE2) : openpyxl ne sait pas le lire
+    assert ReaderEngines.select(OLE2_MAGIC + b"\0" * 10) is CalamineEngine
+    assert ReaderEngines.select(b"PK" + b"\0" * 200, "openpyxl") is OpenpyxlEngine
+
+    with pytest.raises(ValueError):
+        ReaderEngines.select(b"PK", "xlrd")
+
+
+def test_calamine_engine_matches_openpyxl(make_workbook, wdi_sheet):
+    pytest.importorskip("python_calamine")
+    content = make_workbook({"Data": wdi_sheet, "Notes": [["a", "b"]]})
+
+    expected = ExcelRawLoader.load(content, columnar=True, engine="openpyxl")
+    loaded = ExcelRawLoader.load(content, columnar=True, engine="calamine")
+
+    assert list(loaded.sheets) == list(expected.sheets)
+    assert (
+        loaded.sheets["Data"].values.tolist()
+        == expected.sheets["Data"].values.tolist()
+    )
+
+
+def test_calamine_dimensions_match_openpyxl(make_workbook):
+    pytest.importorskip("python_calamine")
+    pairs = [["Country", "Value"]] + [[f"C{i}", i] for i in range(18)]
+    content = make_workbook({"Pairs": pairs, "Empty": []})
+
+    dimensions = {
+        engine.name: [(s.name, s.rows, s.columns) for s in engine.iter_sheets(content)]
+        for engine in (OpenpyxlEngine, CalamineEngine)
+    }
+    # feuille vide : 1 × 1 (openpyxl) / 0 × 0 (calamine), écartée dans les 2 cas
+    assert dimensions["calamine"][0] == dimensions["openpyxl"][0] == ("Pairs", 19, 2)
+
+    # feuille 2 colonnes conservée par la sélection, quel que soit le moteur
+    expected = ExcelRawLoader.load(content, columnar=True, engine="openpyxl")
+    loaded = ExcelRawLoader.load(content, columnar=True, engine="calamine")
+    assert list(loaded.sheets) == list(expected.sheets) == ["Pairs"]
+    assert loaded.sheets["Pairs"].values.shape == (19, 2)
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from processing.application.parsers.excel.contracts import TableRows
+from processing.application.parsers.excel.semantic_contracts import (
+    SemanticColumn,
+    SemanticTable,
+)
+from processing.application.parsers.excel.semantic_data_cleaner import (
+    SemanticDataCleaner,
+)
+
+MIXED_VALUES = [
+    None,
+    0,
+    3,
+    2.5,
+    True,
+    "",
+    "  france  ",
+    "fr a",
+    "1 234,5",
+    "12.5%",
+    "..",
+    " NA ",
+    "-",
+    "1-2",
+    "abc",
+    "multi   space\tlabel",
+]
+
+
+@pytest.mark.parametrize(
+    "role",
+    ["country", "indicator", "year_value", "country_code", "indicator_code", "unknown"],
+)
+def test_compiled_column_cleaner_matches_value_cleaner(role):
+    column = np.empty(len(MIXED_VALUES), dtype=object)
+    column[:] = MIXED_VALUES
+
+    clean = SemanticDataCleaner._compile_cleaner(SemanticColumn(name="c", role=role))
+
+    expected = [SemanticDataCleaner._clean_value(v, role) for v in MIXED_VALUES]
+    result = list(clean(column))
+    assert result == expected
+    assert [type(v) for v in result] == [type(v) for v in expected]
+
+
+def test_clean_table_drops_invalid_rows():
+    columns = [
+        SemanticColumn(name="country", role="country"),
+        SemanticColumn(name="indicator", role="indicator"),
+        SemanticColumn(name="value_2020", role="year_value", year=2020),
+    ]
+    rows = [("france", "GDP", 1)] * 5 + [(None, "GDP", 1), ("spain", "GDP", "..")]
+    table = SemanticTable(
+        name="t",
+        columns=columns,
+        rows=TableRows([c.name for c in columns], rows),
+        confidence=1.0,
+    )
+
+    cleaned = SemanticDataCleaner._clean_semantic_table(table)
+
+    assert len(cleaned.rows) == 5
+    assert cleaned.rows[0] == {
+        "country": "France",
+        "indicator": "GDP",
+        "value_2020": 1.0,
+    }
+
+
+def test_clean_table_rejects_tables_with_too_few_rows():
+    columns = [SemanticColumn(name="country", role="country")]
+    table = SemanticTable(
+        name="t",
+        columns=columns,
+        rows=TableRows(["country"], [("france",)] * 4),
+        confidence=1.0,
+    )
+
+    assert SemanticDataCleaner.clean_table(table) is None
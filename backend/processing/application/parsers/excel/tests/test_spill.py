@@ -0,0 +1,112 @@
+import datetime
+import glob
+import os
+import pickle
+
+import numpy as np
+from processing.application.parsers.excel import header_repair
+from processing.application.parsers.excel.excel_parser import ExcelParser
+from processing.application.parsers.excel.header_repair import ExcelSanitizer
+from processing.application.parsers.excel.normalizer import ExcelNormalizer
+from processing.application.parsers.excel.raw_loader import ExcelRawLoader
+from processing.application.parsers.excel.spill import (
+    SpilledMatrix,
+    SpillPolicy,
+    SpillWriter,
+)
+
+
+def _block(rows):
+    block = np.empty((len(rows), max(len(r) for r in rows)), dtype=object)
+    block[:] = rows
+    return block
+
+
+def test_spilled_matrix_round_trips_cell_types(tmp_path):
+    rows = [
+        ["France", 1.5, 2020, True, datetime.datetime(2020, 1, 2, 3, 4, 5, 6)],
+        [None, float("nan"), 10**30, False, datetime.time(12, 30)],
+        ["Bénin", -0.0, -(2**63), None, np.float64(0.25)],
+    ]
+    writer = SpillWriter(str(tmp_path / "sheet"))
+    writer.append(_block(rows[:2]))
+    # bloc plus étroit : colonnes manquantes = None
+    writer.append(_block([rows[2][:3]]))
+    matrix = pickle.loads(pickle.dumps(writer.close(width=4)))
+
+    expected = [r[:4] for r in rows[:2]] + [rows[2][:3] + [None]]
+    assert matrix.shape == (3, 4)
+    assert repr(matrix[0:3].tolist()) == repr(expected)
+    assert [type(v) for v in matrix[1]] == [type(v) for v in expected[1]]
+    assert matrix[:, 0].tolist() == ["France", None, "Bénin"]
+
+
+def test_spilled_parse_matches_in_memory_parse(make_workbook, wdi_sheet):
+    content = make_workbook({"Data": wdi_sheet})
+
+    expected = ExcelParser("doc-1", content, "wdi.xlsx").parse()
+    parser = ExcelParser("doc-1", content, "wdi.xlsx", spill_min_cells=1)
+
+    sheets = [
+        sheet
+        for _, sheet in ExcelRawLoader.iter_sheets(
+            content, columnar=True, spill=parser.spill
+        )
+        if sheet is not None
+    ]
+    assert isinstance(sheets[0].values, SpilledMatrix)
+
+    assert parser.parse() == expected
+    # répertoire temporaire supprimé en fin de parsing
+    assert parser.spill.root is None
+
+
+def test_policy_threshold_uses_declared_dimensions(tmp_path):
+    policy = SpillPolicy(min_cells=1_000, directory=str(tmp_path))
+
+    assert not policy.should_spill(rows=99, columns=10)
+    assert policy.should_spill(rows=100, columns=10)
+    assert not SpillPolicy(min_cells=0).should_spill(rows=10**7, columns=100)
+
+    policy.writer()
+    assert glob.glob(os.path.join(tmp_path, "excel-spill-*"))
+    policy.cleanup()
+    assert not glob.glob(os.path.join(tmp_path, "excel-spill-*"))
+
+
+def test_spilled_sheet_sanitizes_to_disk_without_streaming(
+    make_workbook, wdi_sheet, monkeypatch
+):
+    content = make_workbook({"Data": wdi_sheet})
+    expected = ExcelParser("doc-1", content, "wdi.xlsx").parse()
+
+    # blocs de 2 lignes de feuille dès la normalisation
+    monkeypatch.setattr(ExcelNormalizer, "CHUNK_ROWS", 2)
+    monkeypatch.setattr(ExcelSanitizer, "CHUNK_ROWS", 2)
+    counts = {"scanned": 0, "spilled": 0}
+    iter_blocks = ExcelSanitizer._iter_sanitized_blocks
+
+    def spy_blocks(rows, source):
+        for block in iter_blocks(rows, source):
+            # bloc précédent déjà sur disque avant le suivant
+            assert counts["spilled"] == counts["scanned"]
+            counts["scanned"] += 1
+            yield block
+
+    class SpyWriter(SpillWriter):
+        def append(self, block):
+            counts["spilled"] += 1
+            super().append(block)
+
+    monkeypatch.setattr(
+        ExcelSanitizer, "_iter_sanitized_blocks", staticmethod(spy_blocks)
+    )
+    monkeypatch.setattr(header_repair, "SpillWriter", SpyWriter)
+
+    parser = ExcelParser("doc-1", content, "wdi.xlsx", spill_min_cells=1)
+    assert not parser.streaming
+
+    assert parser.parse() == expected
+    # 6 pays en blocs de 2 : plusieurs blocs, tous déversés
+    assert counts["scanned"] > 1
+    assert counts["spilled"] == counts["scanned"]
@@ -0,0 +1,32 @@
+import numpy as np
+from processing.application.parsers.excel.contracts import RawSheet, RawWorkbook
+from processing.application.parsers.excel.structure_analyzer import (
+    ExcelStructureAnalyzer,
+)
+
+
+def test_header_and_data_range_detection(wdi_sheet):
+    matrix = [row + [None] * (6 - len(row)) for row in wdi_sheet if row]
+    raw = RawWorkbook(sheets={"Data": RawSheet(name="Data", matrix=matrix)})
+
+    (table,) = ExcelStructureAnalyzer.analyze(raw).tables
+
+    assert table.header_row == 1
+    assert table.data_start_row == 2
+    assert table.data_end_row == len(matrix) - 1
+    assert table.columns[:3] == ["Country Name", "Country Code", "Series Name"]
+
+
+def test_row_statistics_match_single_row_score():
+    rows = [
+        ["Country", "Code", 2020, None],
+        ["France", "FRA", 1.5, 2],
+        ["x" * 40, "y" * 40, "", None],
+        [None, 3, None, None],
+    ]
+
+    stats = ExcelStructureAnalyzer._row_statistics(rows)
+
+    expected = [ExcelStructureAnalyzer._header_likelihood_score(r) for r in rows]
+    assert np.allclose(stats.header_scores, expected)
+    assert stats.non_empty.tolist() == [3, 4, 2, 1]
@@ -0,0 +1,265 @@
+import hashlib
+import logging
+import os
+import pickle
+import time
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from django.conf import settings
+from django_redis import get_redis_connection
+from processing.application.parsers.excel.fact_builder import RawFact
+
+logger = logging.getLogger("etl.service")
+
+
+# =========================
+# FORMAT BINAIRE COMPACT
+# =========================
+
+
+def encode_facts(facts: Iterable[RawFact]) -> bytes:
+    """
+    Flux de RawFact -> bytes (pickle + zlib).
+
+    Les faits consécutifs d'une même table partagent source, provenance
+    et clés de payload : on ne stocke qu'une fois cet en-tête, puis un
+    tuple (entity_id, row, valeurs) par fait. Le document_id n'est pas
+    stocké (réinjecté au décodage : un contenu identique soumis sous un
+    autre document réutilise l'artefact).
+    """
+    groups = []
+    current_header = None
+
+    for fact in facts:
+        header = (
+            fact.entity_type,
+            tuple(fact.source),
+            tuple(
+                (k, v)
+                for k, v in fact.source.items()
+                if k not in ("document_id", "row")
+            ),
+            tuple(fact.provenance.items()),
+            tuple(fact.payload),
+        )
+
+        if header != current_header:
+            current_header = header
+            groups.append((header, []))
+
+        groups[-1][1].append(
+            (
+                _pack_id(fact.entity_id),
+                fact.source.get("row"),
+                tuple(fact.payload.values()),
+            )
+        )
+
+    return zlib.compress(pickle.dumps(groups, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _pack_id(entity_id: str):
+    """
+    Hash hexadécimal -> octets bruts (2× plus court) si l'aller-retour
+    est exact, sinon la chaîne telle quelle.
+    """
+    try:
+        raw = bytes.fromhex(entity_id)
+    except ValueError:
+        return entity_id
+    return raw if raw.hex() == entity_id else entity_id
+
+
+def decode_facts(blob: bytes, document_id: str) -> Iterator[RawFact]:
+    groups = pickle.loads(zlib.decompress(blob))
+
+    for header, facts in groups:
+        entity_type, source_keys, static_source, provenance, keys = header
+        static_source = dict(static_source, document_id=document_id)
+
+        for entity_id, row, values in facts:
+            yield RawFact(
+                entity_type=entity_type,
+                entity_id=(
+                    entity_id.hex() if isinstance(entity_id, bytes) else entity_id
+                ),
+                source={
+                    k: row if k == "row" else static_source[k] for k in source_keys
+                },
+                payload=dict(zip(keys, values)),
+                provenance=dict(provenance),
+            )
+
+
+def cache_key(checksum: str, parser_version: str) -> str:
+    return f"{checksum}:{parser_version}"
+
+
+# =========================
+# BACKENDS (LRU par taille)
+# =========================
+
+
+class DiskParseCache:
+    """
+    Un fichier par artefact ; la date de modification sert d'horodatage
+    LRU (rafraîchie à chaque lecture). Écriture atomique (os.replace).
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.bin"
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            blob = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return blob
+
+    def put(self, key: str, blob: bytes) -> None:
+        if len(blob) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(blob)
+        os.replace(tmp, path)
+
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob("*.bin"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+class RedisParseCache:
+    """
+    Artefacts dans Redis ; un sorted set (clé -> dernier accès) et un
+    hash (clé -> taille) permettent l'éviction LRU sous max_bytes, sans
+    dépendre de la politique maxmemory du serveur partagé.
+    """
+
+    PREFIX = "parse-cache:"
+
+    def __init__(self, client, max_bytes: int):
+        self.client = client
+        self.max_bytes = max_bytes
+        self.lru_key = f"{self.PREFIX}lru"
+        self.sizes_key = f"{self.PREFIX}sizes"
+
+    def get(self, key: str) -> Optional[bytes]:
+        blob = self.client.get(self.PREFIX + key)
+        if blob is None:
+            self.client.zrem(self.lru_key, key)
+            self.client.hdel(self.sizes_key, key)
+            return None
+
+        self.client.zadd(self.lru_key, {key: time.time()})
+        return blob
+
+    def put(self, key: str, blob: bytes) -> None:
+        if len(blob) > self.max_bytes:
+            return
+
+        pipe = self.client.pipeline()
+        pipe.set(self.PREFIX + key, blob)
+        pipe.zadd(self.lru_key, {key: time.time()})
+        pipe.hset(self.sizes_key, key, len(blob))
+        pipe.execute()
+
+        self._evict()
+
+    def _evict(self) -> None:
+        total = sum(int(size) for size in self.client.hvals(self.sizes_key))
+
+        while total > self.max_bytes:
+            oldest: List = self.client.zrange(self.lru_key, 0, 0)
+            if not oldest:
+                break
+
+            key = oldest[0].decode() if isinstance(oldest[0], bytes) else oldest[0]
+            size = int(self.client.hget(self.sizes_key, key) or 0)
+
+            pipe = self.client.pipeline()
+            pipe.delete(self.PREFIX + key)
+            pipe.zrem(self.lru_key, key)
+            pipe.hdel(self.sizes_key, key)
+            pipe.execute()
+
+            total -= size
+
+
+# =========================
+# FAÇADE
+# =========================
+
+
+class ParseCache:
+    """
+    Cache des artefacts de parsing, clé = (checksum du document,
+    version du parser).
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def load(
+        self, checksum: str, parser_version: str, document_id: str
+    ) -> Optional[List[RawFact]]:
+        blob = self.backend.get(cache_key(checksum, parser_version))
+        if blob is None:
+            return None
+
+        try:
+            return list(decode_facts(blob, document_id))
+        except Exception:
+            logger.exception("Artefact de parsing illisible, ignoré")
+            return None
+
+    def store(self, checksum: str, parser_version: str, facts: List[RawFact]) -> None:
+        try:
+            self.backend.put(cache_key(checksum, parser_version), encode_facts(facts))
+        except Exception:
+            # le cache ne doit jamais faire échouer une extraction
+            logger.exception("Écriture de l'artefact de parsing impossible")
+
+
+def build_parse_cache() -> Optional[ParseCache]:
+    """
+    Backend choisi par les settings PARSE_CACHE_* (None = désactivé).
+    """
+    backend = getattr(settings, "PARSE_CACHE_BACKEND", None)
+    max_bytes = getattr(settings, "PARSE_CACHE_MAX_BYTES", 2 * 1024**3)
+
+    if backend == "disk":
+        return ParseCache(DiskParseCache(settings.PARSE_CACHE_DIR, max_bytes))
+
+    if backend == "redis":
+        return ParseCache(RedisParseCache(get_redis_connection("default"), max_bytes))
+
+    return None
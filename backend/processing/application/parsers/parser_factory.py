@@ -1,15 +1,97 @@
 import os
+from typing import Type
 
+from django.conf import settings
 from processing.application.parsers.base import BaseDocumentParser
+from processing.application.parsers.csv.csv_parser import CsvParser
 from processing.application.parsers.excel.excel_parser import ExcelParser
+from processing.application.parsers.excel.fact_builder import DEFAULT_FACT_HASH
 
 
 class ParserFactory:
     @staticmethod
-    def from_document(document_id, content: bytes, filename: str) -> BaseDocumentParser:
+    def parser_class(filename: str) -> Type[BaseDocumentParser]:
         ext = os.path.splitext(filename.lower())[1]
 
         if ext in [".xlsx", ".xls"]:
-            return ExcelParser(document_id, content=content, filename=filename)
+            return ExcelParser
+
+        if ext in [".csv", ".tsv"]:
+            return CsvParser
+
+        if ext == ".pdf":
+            # import différé : Docling (et ses modèles) chargé seulement
+            # par les process qui parsent un PDF
+            from processing.application.parsers.pdf.pdf_parser import PdfParser
+
+            return PdfParser
 
         raise ValueError(f"Aucun parser disponible pour {ext}")
+
+    @staticmethod
+    def parser_version(filename: str) -> str:
+        """
+        Identifie la sortie du parser (clé du cache d'artefacts).
+        Le hash d'identité des faits en fait partie (ids différents).
+        """
+        parser_cls = ParserFactory.parser_class(filename)
+        version = f"{parser_cls.__name__}:{parser_cls.VERSION}"
+
+        fact_hash = getattr(settings, "FACT_ID_HASH", DEFAULT_FACT_HASH)
+        if fact_hash != DEFAULT_FACT_HASH:
+            version = f"{version}:{fact_hash}"
+
+        # streaming : types de colonnes inférés sur la tête de table
+        if parser_cls is ExcelParser and getattr(
+            settings, "EXCEL_PARSER_STREAMING", False
+        ):
+            version = f"{version}:stream"
+
+        # pré-scan de la couche texte : OCR / structure des tableaux
+        # sautés sur certaines pages
+        if parser_cls.__name__ == "PdfParser" and getattr(
+            settings, "PDF_TEXT_LAYER_PRESCAN", True
+        ):
+            version = f"{version}:textlayer"
+
+        return version
+
+    @staticmethod
+    def from_document(document_id, content: bytes, filename: str) -> BaseDocumentParser:
+        parser_cls = ParserFactory.parser_class(filename)
+        fact_hash = getattr(settings, "FACT_ID_HASH", DEFAULT_FACT_HASH)
+        metrics = getattr(settings, "PARSER_METRICS", True)
+
+        if parser_cls is ExcelParser:
+            return ExcelParser(
+                document_id,
+                content=content,
+                filename=filename,
+                streaming=getattr(settings, "EXCEL_PARSER_STREAMING", False),
+                workers=getattr(settings, "EXCEL_PARSER_WORKERS", 0),
+                reader_engine=getattr(settings, "EXCEL_READER_ENGINE", "auto"),
+                fact_hash=fact_hash,
+                metrics=metrics,
+                spill_min_cells=getattr(settings, "EXCEL_SPILL_MIN_CELLS", 0),
+                spill_dir=getattr(settings, "EXCEL_SPILL_DIR", None),
+            )
+
+        if parser_cls.__name__ == "PdfParser":
+            return parser_cls(
+                document_id,
+                content=content,
+                filename=filename,
+                workers=getattr(settings, "PDF_PARSER_WORKERS", 0),
+                pages_per_range=getattr(settings, "PDF_PAGES_PER_RANGE", None),
+                fact_hash=fact_hash,
+                metrics=metrics,
+                text_layer=getattr(settings, "PDF_TEXT_LAYER_PRESCAN", True),
+            )
+
+        return parser_cls(
+            document_id,
+            content=content,
+            filename=filename,
+            fact_hash=fact_hash,
+            metrics=metrics,
+        )
@@ -0,0 +1,135 @@
+import gc
+import logging
+import os
+import threading
+from typing import Callable, Dict, Optional
+
+import psutil
+from django.conf import settings
+from docling.datamodel.base_models import InputFormat
+from docling.datamodel.pipeline_options import PdfPipelineOptions
+from docling.document_converter import DocumentConverter, PdfFormatOption
+
+logger = logging.getLogger("etl.service")
+
+
+def default_pipeline_options() -> PdfPipelineOptions:
+    """
+    Options Docling du parser PDF (OCR + structure des tables).
+    """
+    options = PdfPipelineOptions()
+    options.do_ocr = True
+    options.do_table_structure = True
+    return options
+
+
+class ConverterPool:
+    """
+    Convertisseurs Docling "chauds", propres au process : modèles de
+    layout, de structure de table et d'OCR chargés UNE fois puis
+    réutilisés d'un document à l'autre (un convertisseur par jeu
+    d'options).
+
+    - créés à la première demande, ou dès le démarrage du process
+      enfant Celery (warm(), signal worker_process_init)
+    - process forké : convertisseurs hérités du parent jamais réutilisés
+    - max_rss_mb : au-delà de ce RSS après un document, convertisseurs
+      libérés (rechargés au document suivant) ; 0 = pas de plafond
+    """
+
+    def __init__(
+        self,
+        max_rss_mb: int = 0,
+        factory: Optional[Callable[[PdfPipelineOptions], DocumentConverter]] = None,
+    ):
+        self.max_rss_mb = max_rss_mb
+        self._factory = factory or self._create_converter
+        self._converters: Dict[str, DocumentConverter] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+        self.created = 0
+        self.reused = 0
+        self.recycled = 0
+
+    @staticmethod
+    def _create_converter(options: PdfPipelineOptions) -> DocumentConverter:
+        converter = DocumentConverter(
+            format_options={InputFormat.PDF: PdfFormatOption(pipeline_options=options)}
+        )
+        # modèles chargés maintenant plutôt qu'au premier convert()
+        converter.initialize_pipeline(InputFormat.PDF)
+        return converter
+
+    @staticmethod
+    def key(options: PdfPipelineOptions) -> str:
+        return options.model_dump_json()
+
+    def get(self, options: Optional[PdfPipelineOptions] = None) -> DocumentConverter:
+        options = options or default_pipeline_options()
+        key = self.key(options)
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._converters.clear()
+                self._pid = os.getpid()
+
+            converter = self._converters.get(key)
+            if converter is not None:
+                self.reused += 1
+                return converter
+
+            converter = self._factory(options)
+            self._converters[key] = converter
+            self.created += 1
+            return converter
+
+    def warm(self, options: Optional[PdfPipelineOptions] = None) -> None:
+        self.get(options)
+
+    def release_if_over_limit(self) -> bool:
+        """
+        À appeler après chaque document : libère les convertisseurs si
+        le RSS du process dépasse max_rss_mb.
+        """
+        if not self.max_rss_mb:
+            return False
+
+        rss_mb = psutil.Process().memory_info().rss / 1024**2
+        if rss_mb < self.max_rss_mb:
+            return False
+
+        with self._lock:
+            self._converters.clear()
+            self.recycled += 1
+        gc.collect()
+
+        logger.info(
+            "Convertisseurs Docling libérés (RSS %.0f Mo >= %s Mo)",
+            rss_mb,
+            self.max_rss_mb,
+        )
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._converters.clear()
+
+    def __len__(self) -> int:
+        return len(self._converters)
+
+
+_POOL: Optional[ConverterPool] = None
+
+
+def converter_pool() -> ConverterPool:
+    """
+    Pool du process courant, plafond mémoire lu dans les settings.
+    """
+    global _POOL
+
+    if _POOL is None:
+        _POOL = ConverterPool(
+            max_rss_mb=getattr(settings, "PDF_CONVERTER_MAX_RSS_MB", 0)
+        )
+    return _POOL
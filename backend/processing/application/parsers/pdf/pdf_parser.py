@@ -1,63 +1,371 @@
 import io
+import logging
 import os
+import tempfile
+from collections import deque
+from itertools import groupby
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-from docling.datamodel.base_models import InputFormat
+import pypdfium2 as pdfium
 from docling.datamodel.pipeline_options import PdfPipelineOptions
-from docling.document_converter import (
-    DocumentConverter,
-    DocumentStream,
-    PdfFormatOption,
-)
+from docling.document_converter import DocumentStream
 from processing.application.parsers.base import BaseDocumentParser
-from processing.application.parsers.excel.fact_builder import BlindFactBuilder, RawFact
+from processing.application.parsers.excel.fact_builder import (
+    DEFAULT_FACT_HASH,
+    BlindFactBuilder,
+    RawFact,
+)
+from processing.application.parsers.excel.instrumentation import PipelineMetrics
+from processing.application.parsers.pdf.converter_pool import (
+    converter_pool,
+    default_pipeline_options,
+)
+from processing.application.parsers.pdf.tables import (
+    PdfTableNormalizer,
+    TableGrid,
+    table_grid,
+)
+from processing.application.parsers.pdf.text_layer import PageScan, TextLayerScanner
+from processing.application.parsers.worker_pool import worker_pool
+
+logger = logging.getLogger("etl.service")
+
+# (numéro de page, texte) dans l'ordre du document
+PageText = Tuple[int, str]
+# (numéro de page, cellules) d'un tableau détecté par Docling
+PageTable = Tuple[int, TableGrid]
+# sortie d'une étape de conversion : textes hors tableaux, tableaux
+ConvertedRange = Tuple[List[PageText], List[PageTable]]
+# plage de pages (première, dernière, incluses ; None = document entier)
+# et options Docling à lui appliquer
+ConversionStep = Tuple[Optional[Tuple[int, int]], PdfPipelineOptions]
 
 
 class PdfParser(BaseDocumentParser):
-    def _create_converter(self):
-        """Cree et configure le convertisseur Docling"""
-        options = PdfPipelineOptions()
-        options.do_ocr = True
-        options.do_table_structure = True
-
-        return DocumentConverter(
-            format_options={InputFormat.PDF: PdfFormatOption(pipeline_options=options)}
-        )
-
-    def parse(self) -> list[RawFact]:
-        # Configuration Docling
-        converter = self._create_converter()
-
-        print(f"--- Processing: {self.filename} ---")
-
-        pdf_stream = io.BytesIO(self.content)
-        source = DocumentStream(name=self.filename, stream=pdf_stream)
-
-        result = converter.convert(source)
-        RawFactList = []
-        builder = BlindFactBuilder()
-
-        # compteur pour numéro de ligne dans une page
-        current_page = 1
-        line_index = 1
-        # parcours des textes extraits
-        for i, element in enumerate(result.document.texts):
-            text_content = element.text.strip()
-            page_number = 1
-            # gestion de la pagination
-            if element.prov and len(element.prov) > 0:
-                page_number = element.prov[0].page_no
-            # reset du compteur de ligne si nouvelle page
-            if page_number != current_page:
-                current_page = page_number
+    # 2 : tableaux passés au pipeline sémantique (un fait par ligne)
+    # 3 : faits ordonnés page par page (textes puis tableaux de la page),
+    #     source commune à tous les faits de tableaux
+    VERSION = "3"
+    # Pages converties par tâche en mode parallèle
+    PAGES_PER_RANGE = 20
+    # Textes plus courts ignorés (numéros, en-têtes de colonnes isolés)
+    MIN_TEXT_LENGTH = 10
+
+    def __init__(
+        self,
+        document_id: str,
+        content: bytes,
+        filename: str,
+        streaming: bool = False,
+        workers: Optional[int] = None,
+        pages_per_range: Optional[int] = None,
+        fact_hash: str = DEFAULT_FACT_HASH,
+        metrics: bool = True,
+        text_layer: bool = True,
+    ):
+        super().__init__(document_id, content, filename, fact_hash=fact_hash)
+        self.streaming = streaming
+        # > 1 : plages de pages converties en parallèle (opt-in)
+        self.workers = workers
+        self.pages_per_range = pages_per_range or self.PAGES_PER_RANGE
+        self.metrics = PipelineMetrics(enabled=metrics)
+        # pré-scan de la couche texte : OCR / structure des tables
+        # seulement sur les pages qui en ont besoin (TextLayerScanner)
+        self.text_layer = text_layer
+
+    def pipeline_options(self) -> PdfPipelineOptions:
+        """Options Docling (clé du convertisseur réutilisé, voir ConverterPool)"""
+        return default_pipeline_options()
+
+    def parse(self):
+        """
+        streaming=True : générateur de RawFact (faits d'une plage de pages
+        rendus dès sa conversion), sinon liste complète.
+        """
+        logger.info("Parsing PDF : %s", self.filename)
+
+        raw_facts = self.iter_facts()
+
+        if self.streaming:
+            return raw_facts
+
+        return list(raw_facts)
+
+    def iter_facts(self) -> Iterator[RawFact]:
+        metrics = self.metrics
+        steps = self.plan()
+
+        if self.workers and self.workers > 1:
+            converted = self._iter_parallel_ranges(steps)
+        else:
+            converted = self._iter_sequential_ranges(steps)
+
+        facts = self._build_facts(converted)
+        yield from metrics.timed("facts", facts, count=lambda _: 1)
+        metrics.log(self.filename)
+
+    def _build_facts(self, converted: Iterable[ConvertedRange]) -> Iterator[RawFact]:
+        """
+        Faits page par page (étapes alignées sur les pages => même sortie
+        quel que soit le découpage en plages) :
+        - textes : ligne remise à 1 à chaque page, seuls les textes
+          significatifs comptent
+        - puis tableaux de la page : faits de leurs tables sémantiques
+        """
+        builder = BlindFactBuilder(self.fact_hash)
+        # tables numérotées par page (page{n}_table{k})
+        tables_per_page: Dict[int, int] = {}
+
+        for texts, tables in converted:
+            for page_number, page_texts, page_tables in _by_page(texts, tables):
+                # compteur pour numéro de ligne dans une page
                 line_index = 1
 
-            if len(text_content) > 10:  # seuil pour eviter valeur noon significative
-                fact = builder.build(
-                    row={"text": text_content},
-                    source={"file": self.filename, "sheet": page_number},
-                    row_index=line_index,
+                for text_content in page_texts:
+                    # seuil pour eviter valeur non significative
+                    if len(text_content) > self.MIN_TEXT_LENGTH:
+                        yield builder.build(
+                            row={"text": text_content},
+                            source={"file": self.filename, "sheet": page_number},
+                            row_index=line_index,
+                        )
+                        line_index += 1
+
+                yield from self._table_facts(
+                    builder, page_number, page_tables, tables_per_page
                 )
-                RawFactList.append(fact)
-                line_index += 1
 
-        return RawFactList
+    def _table_facts(
+        self,
+        builder: BlindFactBuilder,
+        page_number: int,
+        grids: List[TableGrid],
+        tables_per_page: Dict[int, int],
+    ) -> Iterator[RawFact]:
+        """
+        Un fait par ligne de table sémantique (pipeline Excel). Tableau
+        sans header exploitable : un fait texte par rangée (cellules
+        jointes) plutôt qu'un par cellule.
+        """
+        for grid in grids:
+            tables_per_page[page_number] = tables_per_page.get(page_number, 0) + 1
+            name = f"page{page_number}_table{tables_per_page[page_number]}"
+
+            semantic_tables = PdfTableNormalizer.semantic_tables(
+                name, grid, self.metrics
+            )
+
+            for table in semantic_tables:
+                source = self._table_source(page_number, table.name)
+                for batch in builder.iter_batches(table.rows, source):
+                    yield from batch
+
+            if semantic_tables:
+                continue
+
+            source = self._table_source(page_number, name)
+            for row_index, row in enumerate(grid, 1):
+                text_content = " | ".join(cell for cell in row if cell)
+                if len(text_content) > self.MIN_TEXT_LENGTH:
+                    yield builder.build(
+                        row={"text": text_content}, source=source, row_index=row_index
+                    )
+
+    def _table_source(self, page_number: int, table_name: str) -> Dict[str, Any]:
+        # source commune aux faits de tableaux (sémantiques ou rangées)
+        return {
+            "document_id": self.document_id,
+            "file": self.filename,
+            "sheet": page_number,
+            "table": table_name,
+            "parser": "pdf",
+        }
+
+    # =========================
+    # CONVERSION
+    # =========================
+
+    def plan(self) -> List[ConversionStep]:
+        """
+        Étapes de conversion, dans l'ordre des pages :
+        - pré-scan actif : pages consécutives de même besoin (OCR,
+          structure des tables) regroupées, au plus pages_per_range
+        - sinon : document entier (séquentiel) ou plages fixes (parallèle)
+
+        Un jeu d'options = un convertisseur chaud (ConverterPool) : au
+        plus 3 par process (OCR implique tables), chacun avec ses propres
+        modèles. Mémoire bornée par PDF_CONVERTER_MAX_RSS_MB.
+        """
+        parallel = bool(self.workers and self.workers > 1)
+
+        if not self.text_layer:
+            if not parallel:
+                return [(None, self.pipeline_options())]
+            return [(r, self.pipeline_options()) for r in self.page_ranges()]
+
+        with self.metrics.measure("prescan"):
+            scans = TextLayerScanner.scan(self.content)
+        self._count_skipped(scans)
+
+        steps: List[ConversionStep] = []
+        size = self.pages_per_range
+        for (needs_ocr, needs_tables), group in groupby(
+            scans, key=lambda scan: (scan.needs_ocr, scan.needs_tables)
+        ):
+            options = self.pipeline_options()
+            options.do_ocr = options.do_ocr and needs_ocr
+            options.do_table_structure = options.do_table_structure and needs_tables
+
+            pages = [scan.page_no for scan in group]
+            for k in range(0, len(pages), size):
+                chunk = pages[k : k + size]
+                steps.append(((chunk[0], chunk[-1]), options))
+
+        return steps
+
+    def _count_skipped(self, scans: List[PageScan]) -> None:
+        pages = len(scans)
+        ocr_pages = sum(scan.needs_ocr for scan in scans)
+        table_pages = sum(scan.needs_tables for scan in scans)
+
+        self.metrics.count("pages", pages)
+        self.metrics.count("ocr_pages", ocr_pages)
+        self.metrics.count("table_pages", table_pages)
+        if pages:
+            self.metrics.count("ocr_skip_ratio", round(1 - ocr_pages / pages, 3))
+            self.metrics.count("table_skip_ratio", round(1 - table_pages / pages, 3))
+
+    def _iter_sequential_ranges(
+        self, steps: List[ConversionStep]
+    ) -> Iterator[ConvertedRange]:
+        # Convertisseur Docling chaud du process (modèles déjà chargés)
+        pool = converter_pool()
+
+        for page_range, options in steps:
+            converter = pool.get(options)
+
+            pdf_stream = io.BytesIO(self.content)
+            source = DocumentStream(name=self.filename, stream=pdf_stream)
+
+            with self.metrics.measure("convert"):
+                try:
+                    if page_range is None:
+                        result = converter.convert(source)
+                    else:
+                        result = converter.convert(source, page_range=page_range)
+                finally:
+                    pool.release_if_over_limit()
+
+            yield _document_items(result.document)
+
+    def page_ranges(self) -> List[Tuple[int, int]]:
+        """
+        Plages (première, dernière page, 1-indexées et incluses) de
+        pages_per_range pages.
+        """
+        pdf = pdfium.PdfDocument(self.content)
+        try:
+            page_count = len(pdf)
+        finally:
+            pdf.close()
+
+        size = self.pages_per_range
+        return [
+            (start, min(start + size - 1, page_count))
+            for start in range(1, page_count + 1, size)
+        ]
+
+    def _iter_parallel_ranges(
+        self, steps: List[ConversionStep]
+    ) -> Iterator[ConvertedRange]:
+        """
+        Plages de pages converties dans un pool billiard (utilisable
+        depuis un enfant prefork Celery), gardé d'un document à l'autre
+        (worker_pool) : chaque process garde ses convertisseurs chauds.
+        Au plus 2 × workers plages en vol ; résultats consommés dans
+        l'ordre des pages => mêmes faits, même numérotation qu'en
+        séquentiel.
+        PDF écrit une fois sur disque : seul son chemin est transmis.
+        """
+        pending = deque()
+        pool = worker_pool("pdf", self.workers)
+
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+            tmp.write(self.content)
+
+        try:
+            for page_range, options in steps:
+                pending.append(
+                    pool.apply_async(_convert_range, (tmp.name, page_range, options))
+                )
+
+                if len(pending) >= 2 * self.workers:
+                    yield self._wait(pending.popleft())
+
+            while pending:
+                yield self._wait(pending.popleft())
+        finally:
+            os.unlink(tmp.name)
+
+    def _wait(self, result) -> ConvertedRange:
+        # conversion exécutée dans le pool : seule l'attente est mesurée
+        with self.metrics.measure("pool"):
+            return result.get()
+
+
+# =========================
+# MODE PARALLÈLE (process pool)
+# =========================
+
+
+def _page_number(element) -> int:
+    # gestion de la pagination
+    if element.prov and len(element.prov) > 0:
+        return element.prov[0].page_no
+    return 1
+
+
+def _by_page(
+    texts: List[PageText], tables: List[PageTable]
+) -> Iterator[Tuple[int, List[str], List[TableGrid]]]:
+    """
+    (page, textes, grilles) dans l'ordre des pages d'une étape.
+    """
+    pages: Dict[int, Tuple[List[str], List[TableGrid]]] = {}
+    for page_number, text_content in texts:
+        pages.setdefault(page_number, ([], []))[0].append(text_content)
+    for page_number, grid in tables:
+        pages.setdefault(page_number, ([], []))[1].append(grid)
+
+    for page_number in sorted(pages):
+        page_texts, page_grids = pages[page_number]
+        yield page_number, page_texts, page_grids
+
+
+def _document_items(document) -> ConvertedRange:
+    """
+    Textes (hors cellules de tableaux) et tableaux d'un document Docling,
+    réduits à des types simples (transmis entre process).
+    """
+    texts = [(_page_number(e), e.text.strip()) for e in document.texts]
+    tables = [(_page_number(t), table_grid(t)) for t in document.tables]
+    return texts, tables
+
+
+def _convert_range(
+    path: str, page_range: Tuple[int, int], options: PdfPipelineOptions
+) -> ConvertedRange:
+    """
+    Exécuté dans un process du pool : une plage de pages convertie,
+    seuls textes et grilles de tableaux (types simples) remontent au
+    parent.
+    """
+    pool = converter_pool()
+    converter = pool.get(options)
+
+    try:
+        result = converter.convert(Path(path), page_range=page_range)
+        return _document_items(result.document)
+    finally:
+        pool.release_if_over_limit()
@@ -0,0 +1,70 @@
+from typing import List, Optional
+
+from processing.application.parsers.csv.csv_parser import (
+    restore_year_labels,
+    typed_block,
+)
+from processing.application.parsers.excel.contracts import ColumnarRawSheet, RawWorkbook
+from processing.application.parsers.excel.excel_parser import ExcelParser
+from processing.application.parsers.excel.instrumentation import PipelineMetrics
+from processing.application.parsers.excel.normalizer import ExcelNormalizer
+from processing.application.parsers.excel.semantic_contracts import SemanticTable
+from processing.application.parsers.excel.structure_analyzer import (
+    ExcelStructureAnalyzer,
+)
+
+# Texte des cellules d'un tableau Docling, ligne par ligne
+TableGrid = List[List[str]]
+
+
+def table_grid(table) -> TableGrid:
+    """
+    TableItem Docling → grille de textes (cellules fusionnées répétées
+    sur chaque position couverte, comme data.grid).
+    """
+    return [[cell.text.strip() for cell in row] for row in table.data.grid]
+
+
+class PdfTableNormalizer:
+    """
+    Tableau détecté par Docling → tables sémantiques du pipeline Excel :
+    grille typée comme un CSV (nombres, marqueurs vides), header détecté
+    par ExcelStructureAnalyzer, puis mêmes étages que le parser Excel
+    (unpivot des années, sanitize, rôles, nettoyage).
+    Une ligne de tableau = un fait, au lieu d'un fait par texte.
+    """
+
+    @staticmethod
+    def semantic_tables(
+        name: str, grid: TableGrid, metrics: Optional[PipelineMetrics] = None
+    ) -> List[SemanticTable]:
+        metrics = metrics or PipelineMetrics(enabled=False)
+
+        values = typed_block(grid) if grid else None
+        if values is None:
+            return []
+
+        values = restore_year_labels(values, ExcelStructureAnalyzer.MAX_SCAN_ROWS)
+        sheet = ColumnarRawSheet(name=name, values=values)
+
+        with metrics.measure("detect") as stats:
+            detected_tables = ExcelStructureAnalyzer.analyze(
+                RawWorkbook(sheets={name: sheet}), layouts=ExcelParser.LAYOUTS
+            ).tables
+            if stats is not None:
+                stats.tables_in += 1
+                stats.tables_out += len(detected_tables)
+
+        tables = []
+        for detected in detected_tables:
+            with metrics.measure("normalize"):
+                table = ExcelNormalizer.normalize_table(sheet, detected)
+            table.rows = metrics.timed_rows("normalize", table.rows)
+
+            table = ExcelParser.refine_table(
+                table, layout=detected.layout, metrics=metrics
+            )
+            if table is not None:
+                tables.append(table)
+
+        return tables
@@ -0,0 +1,52 @@
+from processing.application.parsers.pdf import converter_pool as module
+from processing.application.parsers.pdf.converter_pool import (
+    ConverterPool,
+    default_pipeline_options,
+)
+
+
+def _options(ocr=True):
+    options = default_pipeline_options()
+    options.do_ocr = ocr
+    return options
+
+
+def test_converters_are_reused_per_options():
+    pool = ConverterPool(factory=lambda options: object())
+
+    first = pool.get(_options())
+    assert pool.get(_options()) is first
+    assert pool.get(_options(ocr=False)) is not first
+
+    assert (pool.created, pool.reused, len(pool)) == (2, 1, 2)
+
+
+def test_forked_process_never_reuses_parent_converters(monkeypatch):
+    pool = ConverterPool(factory=lambda options: object())
+    inherited = pool.get(_options())
+
+    monkeypatch.setattr(module.os, "getpid", lambda: -1)
+
+    assert pool.get(_options()) is not inherited
+    assert (pool.created, len(pool)) == (2, 1)
+
+
+def test_converters_released_over_rss_limit(monkeypatch):
+    class Process:
+        def memory_info(self):
+            return type("MemoryInfo", (), {"rss": 512 * 1024**2})()
+
+    monkeypatch.setattr(module.psutil, "Process", Process)
+    pool = ConverterPool(max_rss_mb=1024, factory=lambda options: object())
+    pool.get(_options())
+
+    assert not pool.release_if_over_limit()
+    assert len(pool) == 1
+
+    pool.max_rss_mb = 512
+    assert pool.release_if_over_limit()
+    assert (len(pool), pool.recycled) == (0, 1)
+
+    pool.max_rss_mb = 0  # pas de plafond
+    pool.get(_options())
+    assert not pool.release_if_over_limit()
@@ -0,0 +1,94 @@
+from processing.application.parsers.parser_factory import ParserFactory
+from processing.application.parsers.pdf.pdf_parser import PdfParser
+from processing.application.parsers.pdf.text_layer import TextLayerScanner
+
+GDP_GRID = [["Country", "2019", "2020"]] + [
+    [c, "1.5", "-0.3"] for c in ["Benin", "Togo", "Mali", "Niger"]
+]
+NOTE_GRID = [["Source : INSAE, comptes nationaux"], ["Champ : ensemble du pays"]]
+TABLE_TEXT = (
+    "Tableau 2 : croissance par pays\n"
+    "Benin 12,5 13,1 14%\nTogo 8 9 10\nMali 1.234 -3,5 45%"
+)
+
+
+def _parser():
+    return PdfParser("doc-1", b"", "rapport.pdf", metrics=False, text_layer=False)
+
+
+def test_split_ranges_build_same_facts_as_whole_document():
+    pages = {
+        1: ["Rapport annuel sur l'économie", "12"],
+        2: ["Tableau 1 : croissance du PIB par pays"],
+        3: ["Commentaires et sources des données"],
+    }
+    tables = {2: [GDP_GRID, NOTE_GRID], 3: [GDP_GRID]}
+
+    def converted(page_numbers):
+        texts = [(p, text) for p in page_numbers for text in pages[p]]
+        grids = [(p, grid) for p in page_numbers for grid in tables.get(p, [])]
+        return texts, grids
+
+    whole = list(_parser()._build_facts([converted([1, 2, 3])]))
+    split = list(_parser()._build_facts([converted([1, 2]), converted([3])]))
+
+    assert split == whole
+    # "12" trop court : 3 textes, 2 × 8 faits de tables, 2 lignes de note
+    assert len(whole) == 3 + 16 + 2
+    # page par page : textes puis tables, numérotation des tables par page
+    blocks = [(f.source["sheet"], f.source.get("table")) for f in whole]
+    assert [b for k, b in enumerate(blocks) if k == 0 or b != blocks[k - 1]] == [
+        (1, None),
+        (2, None),
+        (2, "page2_table1_table"),
+        (2, "page2_table2"),
+        (3, None),
+        (3, "page3_table1_table"),
+    ]
+
+
+def test_table_facts_share_one_source_schema():
+    converted = [([], [(4, GDP_GRID), (4, NOTE_GRID)])]
+    facts = list(_parser()._build_facts(converted))
+
+    semantic, fallback = facts[0], facts[-1]
+    assert fallback.payload == {"text": "Champ : ensemble du pays"}
+    assert list(fallback.source) == list(semantic.source)
+    assert {k: fallback.source[k] for k in ("document_id", "parser", "table")} == {
+        "document_id": "doc-1",
+        "parser": "pdf",
+        "table": "page4_table2",
+    }
+
+
+def test_plan_groups_consecutive_pages_by_needs(monkeypatch):
+    prose = "Le PIB a progressé de 3,5 % en 2021 selon les comptes nationaux."
+    texts = [prose, prose, TABLE_TEXT, TABLE_TEXT, TABLE_TEXT, "", prose]
+    scans = [TextLayerScanner.scan_text(i, t) for i, t in enumerate(texts, 1)]
+    monkeypatch.setattr(TextLayerScanner, "scan", staticmethod(lambda _: scans))
+
+    parser = PdfParser("doc-1", b"", "rapport.pdf", pages_per_range=2)
+    steps = [
+        (pages, options.do_ocr, options.do_table_structure)
+        for pages, options in parser.plan()
+    ]
+
+    assert steps == [
+        ((1, 2), False, False),
+        ((3, 4), False, True),
+        ((5, 5), False, True),
+        ((6, 6), True, True),
+        ((7, 7), False, False),
+    ]
+    counters = parser.metrics.report()["counters"]
+    assert counters["ocr_pages"] == 1 and counters["table_pages"] == 4
+
+
+def test_text_layer_prescan_is_part_of_the_parser_version(settings):
+    settings.PDF_TEXT_LAYER_PRESCAN = True
+    with_prescan = ParserFactory.parser_version("rapport.pdf")
+    settings.PDF_TEXT_LAYER_PRESCAN = False
+    without_prescan = ParserFactory.parser_version("rapport.pdf")
+
+    assert with_prescan == f"PdfParser:{PdfParser.VERSION}:textlayer"
+    assert without_prescan == f"PdfParser:{PdfParser.VERSION}"
@@ -0,0 +1,19 @@
+from processing.application.parsers.pdf.tables import PdfTableNormalizer
+
+
+def test_pdf_table_grid_goes_through_excel_semantic_pipeline():
+    grid = [["Table 4 : croissance du PIB", "", "", ""]]
+    grid += [["Country", "2019", "2020", "2021"]]
+    grid += [[c, "1.5", "", "-0.3"] for c in ["Benin", "Togo", "Mali", "Niger"]]
+
+    (table,) = PdfTableNormalizer.semantic_tables("page3_table1", grid)
+
+    assert [(c.name, c.role) for c in table.columns][0] == ("country", "country")
+    rows = list(table.rows.tuples())
+    # années dépliées, cellules vides écartées : 2 faits par pays
+    assert len(rows) == 8
+    assert rows[:2] == [("Benin", 2019, 1.5), ("Benin", 2021, -0.3)]
+
+
+def test_grid_without_header_yields_no_table():
+    assert PdfTableNormalizer.semantic_tables("page1_table1", [["note"], []]) == []
@@ -0,0 +1,32 @@
+from processing.application.parsers.pdf.text_layer import TextLayerScanner
+
+TABLE_TEXT = """Tableau 2 : indicateurs
+Benin 12,5 13,1 14%
+Togo 8 9 10
+Mali 1.234 -3,5 45%
+Source : INSAE"""
+
+
+def test_numeric_lines_make_a_table_candidate():
+    scan = TextLayerScanner.scan_text(3, TABLE_TEXT)
+
+    assert scan.page_no == 3
+    assert scan.table_candidates == 1
+    assert not scan.needs_ocr and scan.needs_tables
+
+
+def test_prose_page_needs_neither_ocr_nor_tables():
+    text = "Le PIB a progressé en 2021 de 3,5 % selon les comptes.\n" * 3
+    scan = TextLayerScanner.scan_text(1, text)
+
+    # 2 nombres par ligne seulement : pas un tableau
+    assert scan.table_candidates == 0
+    assert not scan.needs_ocr and not scan.needs_tables
+
+
+def test_page_without_text_layer_needs_ocr():
+    scan = TextLayerScanner.scan_text(2, "  \n 12 \n")
+
+    assert scan.needs_ocr
+    # structure laissée à Docling sur les pages scannées
+    assert scan.needs_tables
@@ -0,0 +1,79 @@
+import re
+from dataclasses import dataclass
+from typing import Iterator, List, Tuple
+
+import pypdfium2 as pdfium
+
+# Nombre isolé : 12 / -3,5 / 1.234 / 45%
+NUMBER_RE = re.compile(r"(?<![\w.,])-?\d+(?:[.,]\d+)*%?(?![\w])")
+
+
+@dataclass
+class PageScan:
+    page_no: int  # 1-indexé, comme la provenance Docling
+    chars: int  # caractères non blancs de la couche texte
+    table_candidates: int  # blocs de lignes chiffrées consécutives
+
+    @property
+    def needs_ocr(self) -> bool:
+        return self.chars < TextLayerScanner.MIN_TEXT_CHARS
+
+    @property
+    def needs_tables(self) -> bool:
+        # sans couche texte, rien à compter : structure laissée à Docling
+        return self.needs_ocr or self.table_candidates > 0
+
+
+class TextLayerScanner:
+    """
+    Pré-scan de la couche texte (pypdfium2, sans modèle) page par page :
+    - page "née numérique" : texte extractible, OCR inutile
+    - candidats tableaux : au moins MIN_TABLE_LINES lignes consécutives
+      portant chacune MIN_NUMBERS nombres (tableaux statistiques)
+
+    Heuristique volontairement large : un faux positif coûte un passage
+    du modèle de structure, un faux négatif des cellules fusionnées.
+    """
+
+    # En deçà : page scannée (ou quasi vide), OCR nécessaire
+    MIN_TEXT_CHARS = 50
+    MIN_NUMBERS = 3
+    MIN_TABLE_LINES = 3
+
+    @staticmethod
+    def scan(content: bytes) -> List[PageScan]:
+        pdf = pdfium.PdfDocument(content)
+        try:
+            return [
+                TextLayerScanner.scan_text(page_no, text)
+                for page_no, text in TextLayerScanner._iter_texts(pdf)
+            ]
+        finally:
+            pdf.close()
+
+    @staticmethod
+    def _iter_texts(pdf) -> Iterator[Tuple[int, str]]:
+        for index in range(len(pdf)):
+            page = pdf[index]
+            textpage = page.get_textpage()
+            try:
+                yield index + 1, textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+
+    @staticmethod
+    def scan_text(page_no: int, text: str) -> PageScan:
+        chars = sum(1 for c in text if not c.isspace())
+
+        candidates = 0
+        run = 0
+        for line in text.splitlines():
+            if len(NUMBER_RE.findall(line)) >= TextLayerScanner.MIN_NUMBERS:
+                run += 1
+                if run == TextLayerScanner.MIN_TABLE_LINES:
+                    candidates += 1
+            else:
+                run = 0
+
+        return PageScan(page_no=page_no, chars=chars, table_candidates=candidates)
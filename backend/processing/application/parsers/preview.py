@@ -0,0 +1,210 @@
+import os
+import time
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, List, Optional, Union
+
+from processing.application.parsers.csv.csv_parser import CsvParser
+from processing.application.parsers.excel.contracts import (
+    ColumnarRawSheet,
+    DetectedTable,
+    NormalizedTable,
+    RawWorkbook,
+)
+from processing.application.parsers.excel.head_reader import open_head_reader
+from processing.application.parsers.excel.header_repair import ExcelSanitizer
+from processing.application.parsers.excel.normalizer import (
+    ExcelNormalizer,
+    TemporalUnpivotNormalizer,
+)
+from processing.application.parsers.excel.raw_loader import (
+    ExcelRawLoader,
+    RawSheetLike,
+    SheetSelector,
+)
+from processing.application.parsers.excel.semantic_analyzer import SemanticTableAnalyzer
+from processing.application.parsers.excel.semantic_data_cleaner import (
+    SemanticDataCleaner,
+)
+from processing.application.parsers.excel.structure_analyzer import (
+    ExcelStructureAnalyzer,
+)
+
+# =========================
+# CONTRATS
+# =========================
+
+
+@dataclass
+class ColumnPreview:
+    name: str
+    role: str
+    year: Optional[int] = None
+
+
+@dataclass
+class TablePreview:
+    name: str
+    header_row: int
+    data_start_row: int
+    orientation: str
+    confidence: float
+    # colonnes telles que détectées (avant dépliage des années)
+    columns: List[str]
+    year_columns: Dict[str, int]
+    # rôles après dépliage / sanitize (colonnes du parsing complet)
+    roles: List[ColumnPreview]
+    # lignes valides dans la tête lue (None : table écartée au nettoyage)
+    sample_rows: Optional[int]
+    sample: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class SheetPreview:
+    name: str
+    tables: List[TablePreview] = field(default_factory=list)
+    # raison de l'exclusion ("ignored", "not_tabular", "no_header")
+    skipped: Optional[str] = None
+
+
+@dataclass
+class DocumentPreview:
+    filename: str
+    head_rows: int
+    sheets: List[SheetPreview] = field(default_factory=list)
+    # budget dépassé : feuilles ou lignes non lues
+    truncated: bool = False
+    elapsed_ms: int = 0
+
+
+# =========================
+# APERÇU DE STRUCTURE
+# =========================
+
+
+class StructurePreview:
+    """
+    Aperçu rapide d'un document tabulaire : SEULES les `head_rows`
+    premières lignes de chaque feuille sont lues (XlsxHeadReader pour
+    .xlsx, octets de tête pour CSV), puis passées aux étages de
+    détection et d'analyse du parser complet (header, années, rôles).
+
+    Latence bornée par `budget` (secondes) : au-delà, lecture arrêtée
+    et aperçu rendu partiel (truncated=True).
+    """
+
+    # Lignes d'exemple par table
+    SAMPLE_ROWS = 5
+    # Octets lus en tête d'un CSV (bornés, quelle que soit la taille)
+    CSV_HEAD_BYTES = 1024 * 1024
+
+    def __init__(self, head_rows: int = 200, budget: Optional[float] = 2.0):
+        self.head_rows = head_rows
+        self.budget = budget
+
+    def preview(
+        self, source: Union[bytes, IO[bytes]], filename: str
+    ) -> DocumentPreview:
+        start = time.perf_counter()
+        deadline = start + self.budget if self.budget else None
+        result = DocumentPreview(filename=filename, head_rows=self.head_rows)
+
+        ext = os.path.splitext(filename.lower())[1]
+        if ext in [".csv", ".tsv"]:
+            result.sheets = [self._csv_sheet(source, filename)]
+        elif ext in [".xlsx", ".xls"]:
+            result.truncated = self._excel_sheets(source, deadline, result.sheets)
+        else:
+            raise ValueError(f"Aperçu indisponible pour {ext}")
+
+        result.elapsed_ms = round((time.perf_counter() - start) * 1000)
+        return result
+
+    # -------------------------------------------------
+    # LECTURE DES TÊTES
+    # -------------------------------------------------
+
+    def _excel_sheets(
+        self, source, deadline: Optional[float], sheets: List[SheetPreview]
+    ) -> bool:
+        reader = open_head_reader(source, self.head_rows, deadline)
+        heads = reader.iter_sheets()
+
+        for meta, sheet in ExcelRawLoader.read_sheets(heads, columnar=True):
+            if sheet is None:
+                ignored = SheetSelector.is_ignored(meta.name)
+                reason = "ignored" if ignored else "not_tabular"
+                sheets.append(SheetPreview(meta.name, skipped=reason))
+            else:
+                sheets.append(self._sheet(sheet))
+
+            if deadline is not None and time.perf_counter() > deadline:
+                return True
+
+        return reader.truncated
+
+    def _csv_sheet(self, source, filename: str) -> SheetPreview:
+        if isinstance(source, bytes):
+            content = source[: self.CSV_HEAD_BYTES + 1]
+        else:
+            source.seek(0)
+            content = source.read(self.CSV_HEAD_BYTES + 1)
+
+        # dernière ligne coupée par la limite d'octets : écartée
+        if len(content) > self.CSV_HEAD_BYTES:
+            content = content[: content.rfind(b"\n", 0, self.CSV_HEAD_BYTES) + 1]
+
+        name = os.path.splitext(os.path.basename(filename))[0] or "csv"
+        parser = CsvParser("preview", content, filename, metrics=False)
+        head = parser.head_block(self.head_rows)
+        if head is None:
+            return SheetPreview(name, skipped="not_tabular")
+
+        return self._sheet(ColumnarRawSheet(name=name, values=head))
+
+    # -------------------------------------------------
+    # ANALYSE D'UNE TÊTE DE FEUILLE
+    # -------------------------------------------------
+
+    def _sheet(self, sheet: RawSheetLike) -> SheetPreview:
+        raw = RawWorkbook(sheets={sheet.name: sheet})
+        detected_tables = ExcelStructureAnalyzer.analyze(raw).tables
+
+        if not detected_tables:
+            return SheetPreview(sheet.name, skipped="no_header")
+
+        return SheetPreview(
+            sheet.name,
+            tables=[self._table(sheet, detected) for detected in detected_tables],
+        )
+
+    def _table(self, sheet: RawSheetLike, detected: DetectedTable) -> TablePreview:
+        table: NormalizedTable = ExcelNormalizer.normalize_table(sheet, detected)
+        year_columns = TemporalUnpivotNormalizer.year_columns(table.columns)
+
+        table = TemporalUnpivotNormalizer.normalize_table(table)
+        table = ExcelSanitizer.sanitize_table(table, prescan_rows=self.head_rows)
+        table = SemanticTableAnalyzer.analyze_table(table)
+        roles = [ColumnPreview(c.name, c.role, c.year) for c in table.columns]
+
+        sample_rows, sample = None, []
+        cleaned = SemanticDataCleaner.clean_table(table)
+        if cleaned is not None:
+            blocks = list(cleaned.rows.chunks(SemanticDataCleaner.CHUNK_ROWS))
+            columns = cleaned.rows.columns
+            sample_rows = sum(len(block) for block in blocks)
+            if blocks:
+                head = blocks[0][: self.SAMPLE_ROWS].tolist()
+                sample = [dict(zip(columns, values)) for values in head]
+
+        return TablePreview(
+            name=table.name,
+            header_row=detected.header_row,
+            data_start_row=detected.data_start_row,
+            orientation=detected.orientation,
+            confidence=detected.confidence,
+            columns=detected.columns,
+            year_columns=year_columns,
+            roles=roles,
+            sample_rows=sample_rows,
+            sample=sample,
+        )
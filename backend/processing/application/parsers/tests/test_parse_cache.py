@@ -0,0 +1,48 @@
+import os
+
+from processing.application.parsers.excel.excel_parser import ExcelParser
+from processing.application.parsers.parse_cache import (
+    DiskParseCache,
+    ParseCache,
+    decode_facts,
+    encode_facts,
+)
+
+
+def test_encoded_facts_round_trip_with_new_document_id(make_workbook, wdi_sheet):
+    content = make_workbook({"Data": wdi_sheet, "Other": wdi_sheet})
+    facts = ExcelParser("doc-1", content, "wdi.xlsx").parse()
+
+    decoded = list(decode_facts(encode_facts(facts), "doc-1"))
+    resubmitted = list(decode_facts(encode_facts(facts), "doc-2"))
+
+    assert decoded == facts
+    assert [list(f.source) for f in decoded] == [list(f.source) for f in facts]
+    assert {f.source["document_id"] for f in resubmitted} == {"doc-2"}
+    assert [f.entity_id for f in resubmitted] == [f.entity_id for f in facts]
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskParseCache(tmp_path, max_bytes=250)
+
+    cache.put("a", b"x" * 100)
+    cache.put("b", b"y" * 100)
+    os.utime(cache._path("a"), (1, 1))
+    os.utime(cache._path("b"), (2, 2))
+    assert cache.get("a") == b"x" * 100  # "a" redevient le plus récent
+
+    cache.put("c", b"z" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_parse_cache_is_keyed_by_parser_version(tmp_path, make_workbook, wdi_sheet):
+    facts = ExcelParser("doc-1", make_workbook({"Data": wdi_sheet}), "w.xlsx").parse()
+    cache = ParseCache(DiskParseCache(tmp_path, max_bytes=10_000_000))
+
+    cache.store("abc", "ExcelParser:1", facts)
+
+    (first, *_) = cache.load("abc", "ExcelParser:1", "doc-9")
+    assert first.source["document_id"] == "doc-9"
+    assert cache.load("abc", "ExcelParser:2", "doc-9") is None
@@ -0,0 +1,45 @@
+import datetime
+import io
+
+from openpyxl import load_workbook
+from processing.application.parsers.excel.head_reader import open_head_reader
+from processing.application.parsers.preview import StructurePreview
+
+
+def test_head_reader_matches_openpyxl_values(make_workbook):
+    rows = [["Pays", "2019", "date", "flag"]]
+    rows += [
+        [f"P{i}", i * 1.5, datetime.datetime(2020, 1, 1 + i), i % 2 == 0]
+        for i in range(20)
+    ]
+    content = make_workbook({"Data": rows})
+
+    reader = open_head_reader(io.BytesIO(content), head_rows=5)
+    (sheet,) = list(reader.iter_sheets())
+    expected = load_workbook(io.BytesIO(content), read_only=True)["Data"]
+
+    assert sheet.name == "Data"
+    assert [list(r) for r in sheet.iter_rows()] == [
+        list(r) for r in expected.iter_rows(max_row=5, values_only=True)
+    ]
+    assert not reader.truncated
+
+
+def test_preview_reports_tables_roles_and_year_columns(make_workbook, wdi_sheet):
+    rows = wdi_sheet + [["Chad", "TCD", "GDP", i, i, i] for i in range(500)]
+    content = make_workbook({"Notes": [["source"]], "Data": rows})
+
+    result = StructurePreview(head_rows=20).preview(io.BytesIO(content), "wdi.xlsx")
+
+    notes, data = result.sheets
+    assert notes.skipped == "ignored"
+    (table,) = data.tables
+    # index dans la matrice lue (ligne vide sous le titre écartée)
+    assert table.header_row == 1
+    assert table.year_columns == {"2019": 2019, "2020": 2020, "2021": 2021}
+    roles = {c.name: c.role for c in table.roles}
+    assert roles["country_name"] == "country"
+    # seules les 20 premières lignes lues (17 lignes de données dépliées)
+    assert 0 < table.sample_rows <= 17 * 3
+    assert len(table.sample) == StructurePreview.SAMPLE_ROWS
+    assert not result.truncated
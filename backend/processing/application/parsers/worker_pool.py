@@ -0,0 +1,76 @@
+import atexit
+import os
+import threading
+from typing import Dict, Tuple
+
+import billiard
+from billiard.pool import Pool
+
+
+class WorkerPools:
+    """
+    Pools billiard des modes parallèles (Excel, PDF), propres au process
+    et réutilisés d'un document à l'autre :
+    - pas de démarrage de pool (~1 s) par document
+    - process du pool gardant leurs caches chauds (mises en page,
+      convertisseurs Docling)
+    - jamais de terminate() en cours de vie (peut bloquer dans
+      _terminate_pool) : fermeture close() + join() à la sortie du process
+
+    Un pool par (usage, nombre de process) ; process forké : pools hérités
+    du parent jamais réutilisés (leurs process appartiennent au parent).
+    """
+
+    def __init__(self):
+        self._pools: Dict[Tuple[str, int], Pool] = {}
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.created = 0
+
+    def get(self, name: str, processes: int) -> Pool:
+        key = (name, processes)
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pools.clear()
+                self._pid = os.getpid()
+
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = billiard.Pool(processes=processes)
+                self._pools[key] = pool
+                self.created += 1
+            return pool
+
+    def shutdown(self) -> None:
+        """
+        Fermeture propre : tâches en cours terminées, process joints.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pools.clear()
+                return
+            pools = list(self._pools.values())
+            self._pools.clear()
+
+        for pool in pools:
+            pool.close()
+            pool.join()
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+
+_POOLS = WorkerPools()
+atexit.register(_POOLS.shutdown)
+
+
+def worker_pool(name: str, processes: int) -> Pool:
+    """
+    Pool billiard du process courant pour cet usage ("excel", "pdf").
+    """
+    return _POOLS.get(name, processes)
+
+
+def worker_pools() -> WorkerPools:
+    return _POOLS
@@ -5,6 +5,7 @@ from uploader_and_downloader.dropbox_storage import DropboxStorage
 logger = logging.getLogger("etl.service")
 
 import os
+from typing import Tuple
 
 from processing.application.classification.classify_model import process_dataset_global
 from processing.application.indexing.embeder_model import load_embedding_model
@@ -15,6 +16,7 @@ from processing.application.indexing.vectore_store import (
     build_collection_name,
     create_vector_store_from_factchunks,
 )
+from processing.application.parsers.parse_cache import build_parse_cache
 from processing.application.parsers.parser_factory import ParserFactory
 from processing.application.retrieve.extract_indicator import direct_extraction
 from processing.application.retrieve.retrieve_all_documents import dump_all_facts
@@ -31,23 +33,22 @@ class DocumentETLService:
 
     def __init__(self):
         self.storage = DropboxStorage()
-
-    def process(self, document_id, document_url: str, filename) -> None:
-        # ---------- DOWNLOAD ----------
-        logger.info("⬇️ Téléchargement du document depuis Dropbox")
-        content = self.storage.download(document_url)
-        logger.info(f"📦 Fichier téléchargé ({len(content)} bytes)")
+        self.parse_cache = build_parse_cache()
+
+    def process(
+        self, document_id, document_url: str, filename, checksum: str | None = None
+    ) -> dict:
+        """
+        Rend le rapport du parsing (étages, temps, lignes), rattaché à
+        l'extraction par le pipeline.
+        """
         index_svu()
         # indexer = IndicatorIndexer()
         # indexer.index_all()
-        # ---------- PARSE  ----------
-        logger.info("🧩 Parsing du document")
 
-        parser = ParserFactory.from_document(
-            document_id=document_id, content=content, filename=filename
+        parsed_data, metrics = self._load_or_parse(
+            document_id, document_url, filename, checksum
         )
-
-        parsed_data = parser.parse()
         # ---------- NORMALIZE (SIMULÉ) ----------
         logger.info("🧹 Parsing terminé")
 
@@ -93,3 +94,47 @@ class DocumentETLService:
         logger.info(f"🎯 Exemple sortie finale : {classified[:1]}")
 
         logger.info("🏷️ Classification des indicateurs decision final model local")
+
+        return metrics
+
+    def _load_or_parse(
+        self, document_id, document_url: str, filename, checksum: str | None
+    ) -> Tuple[list, dict]:
+        """
+        Artefact en cache (retry Celery, contenu re-soumis) : ni
+        téléchargement ni parsing. Sinon DOWNLOAD + PARSE puis mise en cache.
+        Rend (faits, rapport du parsing).
+        """
+        version = ParserFactory.parser_version(filename)
+        use_cache = self.parse_cache is not None and bool(checksum)
+
+        if use_cache:
+            cached = self.parse_cache.load(checksum, version, document_id)
+            if cached is not None:
+                logger.info(
+                    f"♻️ Artefact de parsing en cache ({len(cached)} faits), "
+                    "téléchargement et parsing ignorés"
+                )
+                return cached, {"parse_cache": "hit"}
+
+        # ---------- DOWNLOAD ----------
+        logger.info("⬇️ Téléchargement du document depuis Dropbox")
+        content = self.storage.download(document_url)
+        logger.info(f"📦 Fichier téléchargé ({len(content)} bytes)")
+
+        # ---------- PARSE  ----------
+        logger.info("🧩 Parsing du document")
+
+        parser = ParserFactory.from_document(
+            document_id=document_id, content=content, filename=filename
+        )
+
+        # parser en flux (générateur) : faits collectés ici, seules les
+        # tables intermédiaires restent bornées
+        parsed_data = list(parser.parse())
+
+        if use_cache:
+            self.parse_cache.store(checksum, version, parsed_data)
+
+        metrics = getattr(parser, "metrics", None)
+        return parsed_data, metrics.report() if metrics is not None else {}
@@ -0,0 +1,348 @@
+import multiprocessing
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import psutil
+from processing.application.parsers.excel.contracts import TableRows
+from processing.application.parsers.excel.excel_parser import ExcelParser
+from processing.application.parsers.excel.fact_builder import BlindFactBuilder
+from processing.application.parsers.excel.header_repair import ExcelSanitizer
+from processing.application.parsers.excel.instrumentation import STAGES, peak_rss
+from processing.application.parsers.excel.normalizer import (
+    ExcelNormalizer,
+    TemporalUnpivotNormalizer,
+)
+from processing.application.parsers.excel.raw_loader import ExcelRawLoader
+from processing.application.parsers.excel.semantic_analyzer import SemanticTableAnalyzer
+from processing.application.parsers.excel.semantic_data_cleaner import (
+    SemanticDataCleaner,
+)
+from processing.application.parsers.excel.structure_analyzer import (
+    ExcelStructureAnalyzer,
+)
+from processing.benchmarks.workbooks import SCENARIOS
+
+# Mesures comparées d'un run à l'autre (plus haut = moins bien)
+REGRESSION_METRICS = ["seconds", "peak_rss_mb", "alloc_peak_mb"]
+
+
+# =========================
+# MESURES (process neuf)
+# =========================
+
+
+class _StageProbe:
+    """
+    Étages exécutés un à un : chaque sortie est matérialisée DANS la
+    mesure de son étage, l'étage suivant ne paie donc que son travail.
+    """
+
+    def __init__(self, allocations: bool):
+        self.allocations = allocations
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    def run(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        rows_out: Optional[Callable[[Any], int]] = None,
+    ) -> Any:
+        if self.allocations:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+
+        stats = self.stages.setdefault(name, {"seconds": 0.0, "rows_out": None})
+        stats["seconds"] += elapsed
+        if rows_out is not None:
+            stats["rows_out"] = (stats["rows_out"] or 0) + rows_out(result)
+        if self.allocations:
+            peak = tracemalloc.get_traced_memory()[1] - before
+            stats["alloc_peak_mb"] = max(
+                stats.get("alloc_peak_mb", 0.0), round(peak / 1024**2, 1)
+            )
+
+        return result
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        stages = {}
+        for name in STAGES:
+            stats = self.stages.get(name)
+            if stats is None:
+                continue
+            seconds = stats["seconds"]
+            rows = stats["rows_out"]
+            stages[name] = dict(
+                stats,
+                seconds=round(seconds, 3),
+                rows_per_sec=round(rows / seconds) if rows and seconds else None,
+            )
+        return stages
+
+
+def _settle(table):
+    """
+    Lignes d'une table lues jusqu'au bout (blocs gardés en liste).
+    """
+    if table is None:
+        return None
+
+    rows = table.rows
+    table.rows = TableRows.from_chunks(
+        rows.columns, list(rows.chunks(SemanticDataCleaner.CHUNK_ROWS))
+    )
+    return table
+
+
+def _row_count(table) -> int:
+    if table is None:
+        return 0
+    blocks = table.rows.chunks(SemanticDataCleaner.CHUNK_ROWS)
+    return sum(len(block) for block in blocks)
+
+
+def _profile_stages(content: bytes, allocations: bool) -> Dict[str, Dict]:
+    probe = _StageProbe(allocations)
+
+    raw = probe.run(
+        "load",
+        lambda: ExcelRawLoader.load(content, columnar=ExcelParser.COLUMNAR),
+        rows_out=lambda wb: sum(len(s.matrix) for s in wb.sheets.values()),
+    )
+    structured = probe.run("detect", lambda: ExcelStructureAnalyzer.analyze(raw))
+
+    builder = BlindFactBuilder()
+    for detected in structured.tables:
+        sheet = raw.sheets[detected.sheet]
+
+        # variables de boucle liées en argument par défaut (lambda exécutée
+        # tout de suite, mais jamais de liaison tardive)
+        table = probe.run(
+            "normalize",
+            lambda sheet=sheet, detected=detected: _settle(
+                ExcelNormalizer.normalize_table(sheet, detected)
+            ),
+            _row_count,
+        )
+        table = probe.run(
+            "unpivot",
+            lambda table=table: _settle(
+                TemporalUnpivotNormalizer.normalize_table(table)
+            ),
+            _row_count,
+        )
+        table = probe.run(
+            "sanitize",
+            lambda table=table: _settle(
+                ExcelSanitizer.sanitize_table(
+                    table, prescan_rows=ExcelParser.TYPE_PRESCAN_ROWS
+                )
+            ),
+            _row_count,
+        )
+        table = probe.run(
+            "analyze", lambda table=table: SemanticTableAnalyzer.analyze_table(table)
+        )
+        table = probe.run(
+            "clean",
+            lambda table=table: _settle(SemanticDataCleaner.clean_table(table)),
+            _row_count,
+        )
+        if table is None:
+            continue
+
+        probe.run(
+            "facts",
+            lambda table=table: sum(
+                1 for _ in builder.build_rows(table.rows, {"sheet": "bench"})
+            ),
+            rows_out=lambda count: count,
+        )
+
+    return probe.report()
+
+
+def _measure(path: str, mode: str, allocations: bool) -> Dict[str, Any]:
+    """
+    Exécuté dans un process neuf (spawn) : pic de RSS propre à la mesure.
+    mode "parser" : ExcelParser complet (streaming, rapport par étage) ;
+    mode "stages" : chaque étage isolément.
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+
+    if allocations:
+        tracemalloc.start()
+
+    rss_before = psutil.Process().memory_info().rss
+    start = time.perf_counter()
+
+    if mode == "parser":
+        parser = ExcelParser("bench", content, os.path.basename(path), streaming=True)
+        facts = sum(1 for _ in parser.parse())
+        result = {"facts": facts, "stages": parser.metrics.report()["stages"]}
+    else:
+        result = {"stages": _profile_stages(content, allocations)}
+
+    elapsed = time.perf_counter() - start
+    result.update(
+        seconds=round(elapsed, 3),
+        peak_rss_mb=round(peak_rss() / 1024**2, 1),
+        rss_delta_mb=round((peak_rss() - rss_before) / 1024**2, 1),
+    )
+
+    if allocations:
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        result["alloc_peak_mb"] = round(traced_peak / 1024**2, 1)
+        tracemalloc.stop()
+
+    return result
+
+
+def _in_fresh_process(path: str, mode: str, allocations: bool) -> Dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1) as pool:
+        return pool.apply(_measure, (path, mode, allocations))
+
+
+def _merge_allocations(timed: Dict[str, Any], traced: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    tracemalloc ralentit fortement l'exécution : les allocations viennent
+    d'un run tracé distinct, les temps du run non tracé.
+    """
+    timed["alloc_peak_mb"] = traced["alloc_peak_mb"]
+    for name, stats in traced.get("stages", {}).items():
+        if "alloc_peak_mb" in stats and name in timed["stages"]:
+            timed["stages"][name]["alloc_peak_mb"] = stats["alloc_peak_mb"]
+    return timed
+
+
+# =========================
+# RUN
+# =========================
+
+
+def run(
+    sizes: Sequence[int],
+    scenarios: Sequence[str] = tuple(SCENARIOS),
+    allocations: bool = False,
+) -> Dict[str, Any]:
+    """
+    Banc d'essai du pipeline Excel : un classeur généré par scénario et
+    par taille, puis le parser complet et les étages isolés, chacun
+    dans un process neuf. Rend un document JSON (meta + résultats).
+    """
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for scenario in scenarios:
+            for size in sizes:
+                path = os.path.join(tmp, f"{scenario}_{size}.xlsx")
+                with open(path, "wb") as f:
+                    f.write(SCENARIOS[scenario](size))
+
+                entry = {
+                    "scenario": scenario,
+                    "size": size,
+                    "file_mb": round(os.path.getsize(path) / 1024**2, 1),
+                }
+
+                for mode in ["parser", "stages"]:
+                    measured = _in_fresh_process(path, mode, False)
+                    if allocations:
+                        traced = _in_fresh_process(path, mode, True)
+                        measured = _merge_allocations(measured, traced)
+                    entry[mode] = measured
+
+                parser = entry["parser"]
+                if parser["seconds"]:
+                    parser["rows_per_sec"] = round(size / parser["seconds"])
+                    parser["facts_per_sec"] = round(parser["facts"] / parser["seconds"])
+
+                results.append(entry)
+
+    return {"meta": environment(), "results": results}
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# =========================
+# COMPARAISON
+# =========================
+
+
+def compare(
+    baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.10
+) -> List[Dict[str, Any]]:
+    """
+    Régressions entre deux documents run() : mesure (totale ou par
+    étage) en hausse de plus de `tolerance` pour un même scénario et
+    une même taille.
+    """
+    before = {(r["scenario"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+
+    for result in current["results"]:
+        reference = before.get((result["scenario"], result["size"]))
+        if reference is None:
+            continue
+
+        for mode in ["parser", "stages"]:
+            pairs = [(mode, reference[mode], result[mode])]
+            pairs += [
+                (f"{mode}.{name}", reference[mode]["stages"].get(name), stats)
+                for name, stats in result[mode]["stages"].items()
+            ]
+
+            for where, old, new in pairs:
+                for metric in REGRESSION_METRICS:
+                    old_value = (old or {}).get(metric)
+                    new_value = new.get(metric)
+                    # mesures trop petites pour être comparées
+                    if not old_value or new_value is None or old_value < 0.01:
+                        continue
+
+                    change = (new_value - old_value) / old_value
+                    if change > tolerance:
+                        regressions.append(
+                            {
+                                "scenario": result["scenario"],
+                                "size": result["size"],
+                                "where": where,
+                                "metric": metric,
+                                "before": old_value,
+                                "after": new_value,
+                                "change": round(change, 3),
+                            }
+                        )
+
+    return regressions
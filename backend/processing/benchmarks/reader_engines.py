@@ -0,0 +1,75 @@
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from typing import Dict, List, Sequence
+
+import psutil
+from processing.application.parsers.excel.raw_loader import ExcelRawLoader
+from processing.application.parsers.excel.reader_engines import ReaderEngines
+from processing.benchmarks.workbooks import wdi_workbook
+
+
+def _measure(path: str, engine: str, columnar: bool) -> Dict:
+    """
+    Exécuté dans un process neuf (spawn) : le pic de RSS mesuré
+    n'inclut que la lecture de CE classeur par CE moteur.
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+
+    rss_before = psutil.Process().memory_info().rss
+
+    start = time.perf_counter()
+    raw = ExcelRawLoader.load(content, columnar=columnar, engine=engine)
+    elapsed = time.perf_counter() - start
+
+    rows = sum(len(sheet.matrix) for sheet in raw.sheets.values())
+    # ru_maxrss : Kio sous Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    return {
+        "engine": engine,
+        "columnar": columnar,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(rows / elapsed) if elapsed else None,
+        "peak_rss_mb": round(peak_rss / 1024**2, 1),
+        "rss_delta_mb": round((peak_rss - rss_before) / 1024**2, 1),
+    }
+
+
+def run(
+    sizes: Sequence[int],
+    engines: Sequence[str] = tuple(ReaderEngines.ENGINES),
+    columnar: bool = True,
+) -> List[Dict]:
+    """
+    Compare les moteurs de lecture sur des classeurs générés
+    (un classeur par taille, un process par mesure).
+    Les moteurs non installés sont signalés et ignorés.
+    """
+    results = []
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            path = os.path.join(tmp, f"wdi_{size}.xlsx")
+            with open(path, "wb") as f:
+                f.write(wdi_workbook(size))
+            file_mb = round(os.path.getsize(path) / 1024**2, 1)
+
+            for engine in engines:
+                if not ReaderEngines.ENGINES[engine].is_available():
+                    results.append(
+                        {"engine": engine, "size": size, "skipped": "not installed"}
+                    )
+                    continue
+
+                with context.Pool(1) as pool:
+                    result = pool.apply(_measure, (path, engine, columnar))
+
+                results.append(dict(result, size=size, file_mb=file_mb))
+
+    return results
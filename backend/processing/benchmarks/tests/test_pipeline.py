@@ -0,0 +1,29 @@
+from processing.benchmarks import pipeline
+from processing.benchmarks.workbooks import SCENARIOS
+
+
+def _report(seconds, load_seconds):
+    stages = {"stages": {"load": {"seconds": load_seconds}}, "seconds": seconds}
+    return {
+        "results": [
+            {"scenario": "wdi", "size": 10, "parser": stages, "stages": stages}
+        ]
+    }
+
+
+def test_compare_flags_only_changes_above_tolerance():
+    regressions = pipeline.compare(_report(1.0, 0.5), _report(1.05, 0.8), 0.10)
+
+    assert {(r["where"], r["metric"]) for r in regressions} == {
+        ("parser.load", "seconds"),
+        ("stages.load", "seconds"),
+    }
+
+
+def test_stage_profile_counts_rows_of_every_scenario():
+    for name, generate in SCENARIOS.items():
+        stages = pipeline._profile_stages(generate(50), allocations=False)
+
+        assert stages["facts"]["rows_out"] == stages["clean"]["rows_out"] > 0, name
+        # notes de bas de tableau comprises (écartées au nettoyage)
+        assert stages["normalize"]["rows_out"] >= 50, name
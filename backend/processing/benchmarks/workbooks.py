@@ -0,0 +1,134 @@
+import io
+import random
+from typing import Any, Callable, Dict, List, Sequence
+
+from openpyxl import Workbook
+
+COUNTRIES = ["France", " Benin ", "Côte\xa0d'Ivoire", "Senegal", "Mali", "Togo"]
+
+
+def _values(rnd: random.Random, count: int) -> List[Any]:
+    """
+    Valeurs annuelles : marqueurs vides ("..", None), entiers et réels.
+    """
+    values = []
+    for _ in range(count):
+        r = rnd.random()
+        if r < 0.1:
+            values.append("..")
+        elif r < 0.15:
+            values.append(None)
+        elif r < 0.2:
+            values.append(float(rnd.randint(0, 100)))
+        else:
+            values.append(rnd.random() * 1000)
+    return values
+
+
+def _identity(i: int) -> List[Any]:
+    country = COUNTRIES[i % len(COUNTRIES)]
+    code = country.strip()[:3].upper()
+    return [country, code, f"Indicator {i % 97}", f"IND.{i % 97}"]
+
+
+def _save(wb: Workbook) -> bytes:
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def wdi_workbook(
+    rows: int, years: Sequence[int] = range(1990, 2024), seed: int = 0
+) -> bytes:
+    """
+    Classeur type export WDI : titre, header, colonnes années,
+    marqueurs vides ("..", "n/a") et feuille de notes.
+    Écrit en mode write_only (génération de 1M lignes en mémoire bornée).
+    """
+    rnd = random.Random(seed)
+    wb = Workbook(write_only=True)
+
+    ws = wb.create_sheet("Data")
+    ws.append(["World Development Indicators"])
+    ws.append([])
+    ws.append(
+        ["Country Name", "Country Code", "Series Name", "Series Code"]
+        + [f"{y} [YR{y}]" for y in years]
+    )
+
+    for i in range(rows):
+        ws.append(_identity(i) + _values(rnd, len(years)))
+
+    notes = wb.create_sheet("Notes")
+    notes.append(["Source", "World Bank"])
+    notes.append(["Licence", "CC BY 4.0"])
+
+    return _save(wb)
+
+
+def multi_header_workbook(
+    rows: int, years: Sequence[int] = range(2000, 2024), seed: int = 0
+) -> bytes:
+    """
+    Header sur deux lignes : ligne de regroupement (libellé de
+    l'indicateur au-dessus de ses années, cellules fusionnées à
+    l'affichage donc vides ici) puis ligne des années.
+    """
+    rnd = random.Random(seed)
+    wb = Workbook(write_only=True)
+    groups = ["Population", "GDP (current US$)"]
+
+    ws = wb.create_sheet("Indicators")
+    ws.append(["Regional statistics", None, None, "Edition 2024"])
+    ws.append([])
+    ws.append(
+        [None, None]
+        + [cell for g in groups for cell in [g] + [None] * (len(years) - 1)]
+    )
+    ws.append(
+        ["Country", "Code"]
+        + [f"{g.split()[0]} {y}" for g in groups for y in years]
+    )
+
+    for i in range(rows):
+        ws.append(_identity(i)[:2] + _values(rnd, len(groups) * len(years)))
+
+    return _save(wb)
+
+
+def notes_workbook(
+    rows: int, years: Sequence[int] = range(1990, 2024), seed: int = 0
+) -> bytes:
+    """
+    Données WDI suivies de notes de bas de tableau, plus des feuilles
+    de notes (texte libre, aucune table) à écarter.
+    """
+    rnd = random.Random(seed)
+    wb = Workbook(write_only=True)
+
+    for title in ["About", "Definitions"]:
+        sheet = wb.create_sheet(title)
+        for i in range(200):
+            sheet.append([f"Note {i}: " + "lorem ipsum dolor sit amet " * 4])
+
+    ws = wb.create_sheet("Data")
+    ws.append(
+        ["Country Name", "Country Code", "Series Name", "Series Code"]
+        + [str(y) for y in years]
+    )
+    for i in range(rows):
+        ws.append(_identity(i) + _values(rnd, len(years)))
+
+    ws.append([])
+    ws.append(["Source: World Development Indicators."])
+    ws.append(["Note: '..' means data not available."])
+
+    return _save(wb)
+
+
+# Scénarios du banc d'essai du pipeline (nom -> générateur(rows))
+SCENARIOS: Dict[str, Callable[[int], bytes]] = {
+    "wdi": wdi_workbook,
+    "multi_header": multi_header_workbook,
+    "notes": notes_workbook,
+}
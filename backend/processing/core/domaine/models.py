@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from processing.core.domaine.events import (
     DomainEvent,
@@ -25,6 +25,7 @@ class Extraction:
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
     error: Optional[str] = None
+    metrics: Dict[str, Any] = field(default_factory=dict)
 
     _events: List[DomainEvent] = field(default_factory=list, init=False, repr=False, compare=False,)
 
@@ -79,6 +80,9 @@ class Extraction:
             )
         )
 
+    def attach_metrics(self, metrics: Dict[str, Any]) -> None:
+        self.metrics = dict(metrics or {})
+
     def fail(self, error: str) -> None:
         if not self.status.can_fail():
             raise InvalidOperation(
@@ -21,6 +21,7 @@ class DjangoExtractionRepository(ExtractionRepository):
                 "started_at": extraction.started_at,
                 "finished_at": extraction.finished_at,
                 "error": extraction.error,
+                "metrics": extraction.metrics,
             },
         )
 
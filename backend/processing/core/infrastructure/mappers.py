@@ -14,6 +14,7 @@ class ExtractionMapper:
             started_at=db.started_at,
             finished_at=db.finished_at,
             error=db.error,
+            metrics=db.metrics or {},
         )
         return extraction
 
@@ -26,4 +27,5 @@ class ExtractionMapper:
             started_at=extraction.started_at,
             finished_at=extraction.finished_at,
             error=extraction.error,
+            metrics=extraction.metrics,
         )
@@ -2,6 +2,7 @@ from django.urls import path
 from processing.interfaces.views import (
     IndicatorCategoryListAPIView,
     IndicatorListAPIView,
+    StructurePreviewView,
 )
 
 urlpatterns = [
@@ -11,4 +12,5 @@ urlpatterns = [
         IndicatorCategoryListAPIView.as_view(),
         name="indicator-category-list",
     ),
+    path("preview/", StructurePreviewView.as_view(), name="structure-preview"),
 ]
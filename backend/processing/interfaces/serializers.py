@@ -2,6 +2,7 @@ from processing.core.infrastructure.model_category_indicator import (
     Indicator,
     IndicatorCategory,
 )
+from django.conf import settings
 from rest_framework import serializers
 
 
@@ -32,3 +33,10 @@ class IndicatorSerializer(serializers.ModelSerializer):
             "keywords",
             "is_active",
         ]
+
+
+class StructurePreviewRequestSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    rows = serializers.IntegerField(
+        required=False, min_value=1, max_value=settings.PREVIEW_MAX_ROWS
+    )
@@ -8,6 +8,7 @@ from processing.interfaces.filters import IndicatorFilter
 from processing.interfaces.serializers import (
     IndicatorCategorySerializer,
     IndicatorSerializer,
+    StructurePreviewRequestSerializer,
 )
 from rest_framework import generics
 from rest_framework.filters import OrderingFilter
@@ -54,3 +55,40 @@ class IndicatorCategoryListAPIView(generics.ListAPIView):
                 "indicators", filter=models.Q(indicators__is_active=True)
             )
         ).order_by("label")
+
+
+from dataclasses import asdict
+
+from django.conf import settings
+from processing.application.parsers.preview import StructurePreview
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class StructurePreviewView(APIView):
+    """
+    Aperçu de structure d'un classeur / CSV (tables, header, colonnes
+    années, rôles) à partir de la seule tête de chaque feuille, en
+    latence bornée quelle que soit la taille du fichier.
+    """
+
+    def post(self, request):
+        serializer = StructurePreviewRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        file = serializer.validated_data["file"]
+        rows = serializer.validated_data.get("rows", settings.PREVIEW_HEAD_ROWS)
+
+        preview = StructurePreview(
+            head_rows=rows, budget=settings.PREVIEW_BUDGET_SECONDS
+        )
+        try:
+            # fichier uploadé passé tel quel : seules les parties utiles
+            # de l'archive sont lues
+            result = preview.preview(file, file.name)
+        except ValueError as exc:
+            raise ValidationError({"file": str(exc)}) from exc
+        except RuntimeError as exc:
+            raise ValidationError({"file": f"Fichier illisible : {exc}"}) from exc
+
+        return Response(asdict(result))
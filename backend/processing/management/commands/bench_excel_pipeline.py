@@ -0,0 +1,83 @@
+import json
+
+from django.core.management.base import BaseCommand
+from processing.benchmarks import pipeline
+from processing.benchmarks.workbooks import SCENARIOS
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the Excel parsing pipeline on generated workbooks "
+        "(rows/sec, peak RSS, allocations per stage)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, nargs="+", default=[10_000, 100_000]
+        )
+        parser.add_argument(
+            "--scenarios",
+            nargs="+",
+            choices=list(SCENARIOS),
+            default=list(SCENARIOS),
+        )
+        parser.add_argument(
+            "--allocations",
+            action="store_true",
+            help="Extra tracemalloc run per measure (allocation peaks)",
+        )
+        parser.add_argument("--output", type=str, default=None)
+        parser.add_argument(
+            "--baseline",
+            type=str,
+            default=None,
+            help="JSON from a previous run: report regressions against it",
+        )
+        parser.add_argument("--tolerance", type=float, default=0.10)
+
+    def handle(self, *args, **options):
+        report = pipeline.run(
+            sizes=options["rows"],
+            scenarios=options["scenarios"],
+            allocations=options["allocations"],
+        )
+
+        for result in report["results"]:
+            parser = result["parser"]
+            self.stdout.write(
+                f"{result['scenario']:<13} {result['size']:>9} rows  "
+                f"{parser['seconds']:>8.2f}s  "
+                f"{parser.get('rows_per_sec')} rows/s  "
+                f"peak {parser['peak_rss_mb']} MB"
+            )
+            for name, stats in result["stages"]["stages"].items():
+                self.stdout.write(
+                    f"    {name:<10} {stats['seconds']:>8.3f}s  "
+                    f"{stats['rows_per_sec']} rows/s"
+                    + (
+                        f"  alloc {stats['alloc_peak_mb']} MB"
+                        if "alloc_peak_mb" in stats
+                        else ""
+                    )
+                )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✔ {options['output']}"))
+
+        if options["baseline"]:
+            with open(options["baseline"], encoding="utf-8") as f:
+                baseline = json.load(f)
+
+            regressions = pipeline.compare(baseline, report, options["tolerance"])
+            for r in regressions:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"⚠ {r['scenario']} {r['size']} {r['where']} "
+                        f"{r['metric']}: {r['before']} → {r['after']} "
+                        f"(+{r['change']:.0%})"
+                    )
+                )
+            if not regressions:
+                self.stdout.write(self.style.SUCCESS("✔ Aucune régression"))
@@ -0,0 +1,49 @@
+import json
+
+from django.core.management.base import BaseCommand
+from processing.application.parsers.excel.reader_engines import ReaderEngines
+from processing.benchmarks import reader_engines
+
+
+class Command(BaseCommand):
+    help = "Benchmark Excel reader engines (rows/sec, peak RSS)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, nargs="+", default=[10_000, 100_000]
+        )
+        parser.add_argument(
+            "--engines",
+            nargs="+",
+            choices=list(ReaderEngines.ENGINES),
+            default=list(ReaderEngines.ENGINES),
+        )
+        parser.add_argument("--rows-matrix", action="store_true")
+        parser.add_argument("--output", type=str, default=None)
+
+    def handle(self, *args, **options):
+        results = reader_engines.run(
+            sizes=options["rows"],
+            engines=options["engines"],
+            columnar=not options["rows_matrix"],
+        )
+
+        for result in results:
+            if "skipped" in result:
+                self.stdout.write(
+                    f"{result['engine']:<10} {result['size']:>9} rows  "
+                    f"skipped ({result['skipped']})"
+                )
+                continue
+
+            self.stdout.write(
+                f"{result['engine']:<10} {result['size']:>9} rows  "
+                f"{result['rows_per_sec']:>9} rows/s  "
+                f"peak {result['peak_rss_mb']:>7} MB  "
+                f"(+{result['rss_delta_mb']} MB)"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"✔ {options['output']}"))
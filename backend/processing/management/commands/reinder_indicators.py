@@ -5,7 +5,16 @@ from processing.application.indexing.indicator_indexer import IndicatorIndexer
 class Command(BaseCommand):
     help = "Rebuild Qdrant index from SVU indicators"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--delta",
+            action="store_true",
+            help="Only sync indicators updated since the last run (beat mode)",
+        )
+
     def handle(self, *args, **options):
         indexer = IndicatorIndexer()
-        indexer.index_all()
-        self.stdout.write(self.style.SUCCESS("✔ Indicator semantic index rebuilt"))
+        report = indexer.sync(full=not options["delta"])
+        self.stdout.write(
+            self.style.SUCCESS(f"✔ Indicator semantic index synced: {report}")
+        )
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("processing", "0002_indicatorcategory_indicator"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="extractiondb",
+            name="metrics",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
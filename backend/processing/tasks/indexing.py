@@ -10,8 +10,7 @@ from processing.application.indexing.indicator_indexer import IndicatorIndexer
 )
 def reindex_indicators_task(self):
     """
-    Rebuild / sync SVU indicators into Qdrant
+    Sync SVU indicators into Qdrant (delta since the last run)
     """
     indexer = IndicatorIndexer()
-    indexer.index_all()
-    return "SVU indicators indexed"
+    return indexer.sync()